@@ -3,14 +3,35 @@ FastAPI Backend for The Elemental League
 Serves fantasy football data from SQLite database
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Dict, Callable, Set, Tuple
+from collections import OrderedDict
+import asyncio
+import json
 import sqlite3
+import hashlib
+import os
+import sys
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 from pydantic import BaseModel
 
+# Shared data-pipeline modules live in ../scripts
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.rescoring import SCORING_PRESETS, rescore, what_if_standings
+from scripts.draft_value import best_draft_slots
+from scripts.ratings import ratings_series
+from scripts.migrations import ensure_schema
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None  # Arrow IPC output for /api/weekly-scores is optional
+
 # Database path
 DB_PATH = Path(__file__).parent.parent / "data" / "espn_fantasy.db"
 
@@ -43,10 +64,197 @@ def get_db():
     finally:
         conn.close()
 
+@app.on_event("startup")
+def upgrade_schema():
+    """Apply pending schema migrations (a single user_version read when current)"""
+    if DB_PATH.exists():
+        ensure_schema(str(DB_PATH))
+
 def rows_to_dicts(rows) -> List[dict]:
     """Convert sqlite3.Row objects to dictionaries"""
     return [dict(row) for row in rows]
 
+# ============================================
+# Response cache
+# ============================================
+
+RESPONSE_CACHE_SIZE = 256
+_response_cache = OrderedDict()
+# Sync endpoints run on the threadpool; the lock covers lookup, insert and eviction only
+_response_cache_lock = threading.Lock()
+
+def db_version() -> str:
+    """Stamp that changes whenever the database (or its WAL) is written"""
+    stamps = []
+    for path in (str(DB_PATH), f"{DB_PATH}-wal"):
+        try:
+            stat = os.stat(path)
+            stamps.append(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+        except FileNotFoundError:
+            stamps.append("0")
+    return ".".join(stamps)
+
+def cached_response(key: str, build: Callable[[], dict]) -> tuple:
+    """
+    Return (payload, etag) for a cache key, rebuilding only when the database changed.
+    Payloads are shared between requests, so callers must not mutate them.
+    """
+    version = db_version()
+    with _response_cache_lock:
+        hit = _response_cache.get(key)
+        if hit and hit[0] == version:
+            _response_cache.move_to_end(key)
+            return hit[1], hit[2]
+    
+    payload = build()
+    etag = 'W/"%s"' % hashlib.md5(f"{key}|{version}".encode()).hexdigest()[:16]
+    with _response_cache_lock:
+        _response_cache[key] = (version, payload, etag)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return payload, etag
+
+# ============================================
+# Live score stream
+# ============================================
+
+STREAM_POLL_INTERVAL = 1.0   # seconds between PRAGMA data_version checks
+STREAM_KEEPALIVE = 15.0      # seconds of silence before a comment line keeps proxies open
+STREAM_QUEUE_SIZE = 8        # events buffered per viewer before it is resynced
+
+STREAM_MATCHUPS_SQL = """
+    SELECT league_id, matchup_id, week, home_team, home_score, home_projected,
+           away_team, away_score, away_projected, bracket_type
+    FROM matchups
+    WHERE season_year = ? AND week = ?
+    ORDER BY matchup_id
+"""
+
+STREAM_STANDINGS_SQL = """
+    SELECT league_id, team_name, wins, losses, ties, points_for, points_against
+    FROM teams
+    WHERE season_year = ?
+    ORDER BY wins DESC, points_for DESC
+"""
+
+class ScoreStream:
+    """
+    One watcher for every /api/stream/scores viewer.
+
+    A single task polls PRAGMA data_version on one shared connection (it
+    changes only when another connection commits). On a change, each watched
+    (year, week) is queried once and only the matchups / standings rows that
+    differ from the last snapshot are fanned out to the viewers' queues.
+    The task starts with the first viewer and stops after the last one leaves.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[Tuple[int, int], Set[asyncio.Queue]] = {}
+        self.snapshots: Dict[Tuple[int, int], Tuple[dict, dict]] = {}
+        self.conn = None
+        self.lock = asyncio.Lock()  # one query at a time on the shared connection
+        self.task = None
+
+    def _read(self, year: int, week: int) -> Tuple[dict, dict]:
+        matchups = {
+            (row["league_id"], row["matchup_id"]): dict(row)
+            for row in self.conn.execute(STREAM_MATCHUPS_SQL, (year, week))
+        }
+        standings = {
+            (row["league_id"], row["team_name"]): dict(row)
+            for row in self.conn.execute(STREAM_STANDINGS_SQL, (year,))
+        }
+        return matchups, standings
+
+    def _data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    async def _query(self, read: Callable, *args):
+        async with self.lock:
+            return await asyncio.to_thread(read, *args)
+
+    async def subscribe(self, year: int, week: int) -> Tuple[asyncio.Queue, dict]:
+        """Register a viewer; returns its queue and the current snapshot"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+        key = (year, week)
+        if key not in self.snapshots:
+            self.snapshots[key] = await self._query(self._read, year, week)
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self.subscribers.setdefault(key, set()).add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._watch())
+        return queue, self.snapshot_event(key)
+
+    def unsubscribe(self, year: int, week: int, queue: asyncio.Queue):
+        key = (year, week)
+        viewers = self.subscribers.get(key)
+        if viewers is not None:
+            viewers.discard(queue)
+            if not viewers:
+                del self.subscribers[key]
+                self.snapshots.pop(key, None)
+
+    def snapshot_event(self, key: Tuple[int, int]) -> dict:
+        matchups, standings = self.snapshots[key]
+        return {"event": "snapshot", "data": {
+            "year": key[0], "week": key[1],
+            "matchups": list(matchups.values()), "standings": list(standings.values())
+        }}
+
+    def _publish(self, key: Tuple[int, int], event: dict):
+        for queue in self.subscribers.get(key, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow to keep up: drop its backlog and send the full state instead
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.snapshot_event(key))
+
+    async def _watch(self):
+        version = await self._query(self._data_version)
+        while self.subscribers:
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+            current = await self._query(self._data_version)
+            if current == version:
+                continue
+            version = current
+            for key in list(self.subscribers):
+                if key not in self.snapshots:
+                    continue
+                matchups, standings = await self._query(self._read, *key)
+                if key not in self.subscribers:
+                    continue  # last viewer left during the query
+                old_matchups, old_standings = self.snapshots[key]
+                self.snapshots[key] = (matchups, standings)
+                changed = [row for k, row in matchups.items() if old_matchups.get(k) != row]
+                if changed:
+                    self._publish(key, {"event": "scores", "data": {"year": key[0], "week": key[1],
+                                                                    "matchups": changed}})
+                changed = [row for k, row in standings.items() if old_standings.get(k) != row]
+                if changed:
+                    self._publish(key, {"event": "standings", "data": {"year": key[0], "standings": changed}})
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+score_stream = ScoreStream()
+
+@app.on_event("shutdown")
+async def close_score_stream():
+    await score_stream.close()
+
+def sse_event(event: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
 # ============================================
 # Pydantic Models
 # ============================================
@@ -101,6 +309,11 @@ class Record(BaseModel):
     holder: str
     year: int
 
+class ScoringRuleset(BaseModel):
+    preset: Optional[str] = None
+    rules: Dict[str, float] = {}
+    year: Optional[int] = None
+
 # ============================================
 # API Endpoints
 # ============================================
@@ -186,6 +399,34 @@ def get_matchups(
     
     return {"year": year, "week": week, "max_week": max_week, "matchups": matchups}
 
+@app.get("/api/stream/scores")
+async def stream_scores(
+    request: Request,
+    year: int = Query(..., description="Season year"),
+    week: int = Query(..., description="Week number")
+):
+    """
+    Server-Sent Events: a snapshot of the week, then only the matchups
+    ("scores") and standings rows that change
+    """
+    queue, snapshot = await score_stream.subscribe(year, week)
+
+    async def events():
+        try:
+            yield sse_event(snapshot)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_event(event)
+        finally:
+            score_stream.unsubscribe(year, week, queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/api/managers")
 def get_managers():
     """Get all manager profiles with aggregate stats"""
@@ -274,6 +515,50 @@ def get_draft(year: int = Query(..., description="Season year")):
         picks = rows_to_dicts(cursor.fetchall())
     return {"year": year, "picks": picks}
 
+@app.get("/api/draft-value")
+def get_draft_value(year: int = Query(..., description="Season year"),
+                    league_id: Optional[str] = Query(None, description="League ID (default: every league)")):
+    """Get precomputed draft value (points, VOR, VOR over the slot average) for a season"""
+    with get_db() as conn:
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='draft_value'")
+        if not cursor.fetchone():
+            raise HTTPException(status_code=404, detail="Draft value table not built yet (run populate_database.py)")
+        
+        cursor = conn.execute("""
+            SELECT league_id, round, pick, overall_pick, team, player_name, position,
+                   points, points_source, games, position_rank,
+                   replacement_points, vor, expected_vor, vor_over_slot
+            FROM draft_value
+            WHERE season_year = ? AND (? IS NULL OR league_id = ?)
+            ORDER BY league_id, overall_pick
+        """, (year, league_id, league_id))
+        picks = rows_to_dicts(cursor.fetchall())
+    
+    # Per-team draft grades
+    teams = {}
+    for p in picks:
+        team = teams.setdefault((p["league_id"], p["team"]), {
+            "league_id": p["league_id"], "team": p["team"], "total_vor": 0, "total_vor_over_slot": 0, "picks": 0
+        })
+        team["total_vor"] += p["vor"] or 0
+        team["total_vor_over_slot"] += p["vor_over_slot"] or 0
+        team["picks"] += 1
+    team_grades = sorted(teams.values(), key=lambda t: t["total_vor"], reverse=True)
+    for t in team_grades:
+        t["total_vor"] = round(t["total_vor"], 1)
+        t["total_vor_over_slot"] = round(t["total_vor_over_slot"], 1)
+    
+    return {"year": year, "picks": picks, "teams": team_grades}
+
+@app.get("/api/draft-value/best-slots")
+def get_best_draft_slots():
+    """Get all-time draft value aggregated by draft slot and round"""
+    with get_db() as conn:
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='draft_value'")
+        if not cursor.fetchone():
+            raise HTTPException(status_code=404, detail="Draft value table not built yet (run populate_database.py)")
+        return best_draft_slots(conn)
+
 @app.get("/api/records")
 def get_records():
     """Get all-time records"""
@@ -804,6 +1089,177 @@ def get_weekly_results(manager_name: str):
     
     return {"manager": manager_name, "weekly_results": results}
 
+def _percent_rank(value: float, values: List[float]) -> float:
+    """Percent of other values at or below `value` (0-100)"""
+    if len(values) <= 1:
+        return 100.0
+    below = sum(1 for v in values if v <= value) - 1
+    return round(below / (len(values) - 1) * 100, 1)
+
+def build_manager_dashboard(conn, name: str) -> dict:
+    """Derive everything on the manager page from one read of the owner's games"""
+    # Every team-season (the owner's rows drive season history, the rest drive percentiles)
+    cursor = conn.execute("""
+        SELECT season_year, team_name, owner, rank, wins, losses, points_for, points_against
+        FROM teams
+    """)
+    all_teams = cursor.fetchall()
+    
+    seasons = [
+        {k: row[k] for k in ("season_year", "team_name", "rank", "wins", "losses", "points_for", "points_against")}
+        for row in all_teams if row["owner"] == name
+    ]
+    if not seasons:
+        raise HTTPException(status_code=404, detail=f"Manager '{name}' not found")
+    seasons.sort(key=lambda s: s["season_year"], reverse=True)
+    
+    # The owner's games, read once in chronological order
+    cursor = conn.execute("""
+        SELECT 
+            m.season_year, m.week, m.home_score, m.away_score,
+            t1.owner as home_owner, t2.owner as away_owner
+        FROM matchups m
+        JOIN teams t1 ON m.home_team = t1.team_name AND m.season_year = t1.season_year
+        JOIN teams t2 ON m.away_team = t2.team_name AND m.season_year = t2.season_year
+        WHERE t1.owner = ? OR t2.owner = ?
+        ORDER BY m.season_year ASC, m.week ASC
+    """, (name, name))
+    
+    opponents = {}
+    weekly_results = []
+    longest_win = {"length": 0}
+    longest_loss = {"length": 0}
+    run_result, run_length, run_start = None, 0, None
+    
+    for m in cursor:
+        if m["home_owner"] == name:
+            opponent = m["away_owner"]
+            score, opponent_score = m["home_score"], m["away_score"]
+        else:
+            opponent = m["home_owner"]
+            score, opponent_score = m["away_score"], m["home_score"]
+        won = score > opponent_score
+        result = "W" if won else "L"
+        
+        # Rivalries
+        record = opponents.setdefault(opponent, {"wins": 0, "losses": 0})
+        record["wins" if won else "losses"] += 1
+        
+        # Weekly results
+        weekly_results.append({
+            "season_year": m["season_year"],
+            "week": m["week"],
+            "result": result,
+            "score": score,
+            "opponent_score": opponent_score
+        })
+        
+        # Streaks (carried across seasons)
+        if result == run_result:
+            run_length += 1
+        else:
+            run_result, run_length = result, 1
+            run_start = {"season_year": m["season_year"], "week": m["week"]}
+        best = longest_win if won else longest_loss
+        if run_length > best["length"]:
+            best.update({
+                "length": run_length,
+                "start": run_start,
+                "end": {"season_year": m["season_year"], "week": m["week"]}
+            })
+    
+    rivalries = []
+    for opp, record in opponents.items():
+        total = record["wins"] + record["losses"]
+        rivalries.append({
+            "opponent": opp,
+            "wins": record["wins"],
+            "losses": record["losses"],
+            "total_games": total,
+            "win_pct": round(record["wins"] / total * 100, 1) if total > 0 else 0
+        })
+    rivalries.sort(key=lambda x: x["total_games"], reverse=True)
+    
+    # Match /api/weekly-results ordering (newest season first, weeks ascending)
+    weekly_results.sort(key=lambda r: -r["season_year"])
+    
+    # Per-season PF/PA percentiles against the rest of the league
+    league_pf, league_pa = {}, {}
+    for row in all_teams:
+        league_pf.setdefault(row["season_year"], []).append(row["points_for"] or 0)
+        league_pa.setdefault(row["season_year"], []).append(row["points_against"] or 0)
+    percentiles = [
+        {
+            "season_year": s["season_year"],
+            "points_for": s["points_for"],
+            "points_for_percentile": _percent_rank(s["points_for"] or 0, league_pf[s["season_year"]]),
+            "points_against": s["points_against"],
+            "points_against_percentile": _percent_rank(s["points_against"] or 0, league_pa[s["season_year"]])
+        }
+        for s in seasons
+    ]
+    
+    # Aggregate stats (playoff cutoff: 4 teams in 2019, 6 teams 2020+)
+    total_wins = sum(s["wins"] for s in seasons)
+    total_losses = sum(s["losses"] for s in seasons)
+    championships = sum(1 for s in seasons if s["rank"] == 1)
+    playoffs = sum(1 for s in seasons if (s["season_year"] == 2019 and s["rank"] <= 4) or (s["season_year"] > 2019 and s["rank"] <= 6))
+    avg_pf = sum(s["points_for"] for s in seasons) / len(seasons)
+    
+    return {
+        "manager": {
+            "name": name,
+            "all_time_record": f"{total_wins}-{total_losses}",
+            "total_wins": total_wins,
+            "total_losses": total_losses,
+            "championships": championships,
+            "playoff_appearances": playoffs,
+            "avg_points_for": round(avg_pf, 1),
+            "seasons_played": len(seasons),
+            "season_history": seasons
+        },
+        "rivalries": rivalries,
+        "weekly_results": weekly_results,
+        "streaks": {
+            "current": f"{run_result}{run_length}" if run_result else None,
+            "longest_win": longest_win,
+            "longest_loss": longest_loss
+        },
+        "percentiles": percentiles
+    }
+
+@app.get("/api/manager/{name}/dashboard")
+def get_manager_dashboard(name: str, request: Request, response: Response):
+    """Get everything the manager page needs in one cacheable response"""
+    def build():
+        with get_db() as conn:
+            return build_manager_dashboard(conn, name)
+    
+    payload, etag = cached_response(f"dashboard:{name}", build)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return payload
+
+@app.get("/api/ratings")
+def get_ratings(request: Request, response: Response,
+                league_id: Optional[str] = Query(None, description="League ID (default: the latest rated league)")):
+    """Get weekly Elo power ratings for every manager as chart-ready arrays"""
+    def build():
+        with get_db() as conn:
+            cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='ratings'")
+            if not cursor.fetchone():
+                raise HTTPException(status_code=404, detail="Ratings not built yet (run populate_database.py)")
+            return ratings_series(conn, league_id)
+    
+    payload, etag = cached_response(f"ratings:{league_id}", build)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return payload
+
 @app.get("/api/luck")
 def get_luck_rankings():
     """Get luck factor for all managers (expected wins vs actual wins)"""
@@ -885,71 +1341,173 @@ def get_luck_rankings():
     
     return {"luck_rankings": luck_rankings}
 
+def weekly_scores_columnar(scores: List[dict]) -> dict:
+    """
+    Pivot team-week score rows into weeks[], owners[] and a dense weeks x owners matrix.
+    Raises ValueError when an owner has more than one score in a week (e.g. two leagues).
+    """
+    weeks = sorted({s["week"] for s in scores})
+    owners = sorted({s["owner"] for s in scores if s["owner"]})
+    week_index = {w: i for i, w in enumerate(weeks)}
+    owner_index = {o: i for i, o in enumerate(owners)}
+    
+    matrix = [[None] * len(owners) for _ in weeks]
+    filled = set()
+    for s in scores:
+        if s["owner"] in owner_index:
+            cell = (week_index[s["week"]], owner_index[s["owner"]])
+            if cell in filled:
+                raise ValueError(f"{s['owner']} has more than one score in week {s['week']}; "
+                                 "pass league_id to pick a league")
+            filled.add(cell)
+            matrix[cell[0]][cell[1]] = s["score"]
+    
+    return {"weeks": weeks, "owners": owners, "scores": matrix}
+
+def weekly_scores_arrow(columnar: dict) -> bytes:
+    """
+    Encode a columnar weekly-scores payload as an Arrow IPC stream: a `week` column
+    plus one float32 column per owner, named `owner:<name>` so no owner can shadow `week`
+    """
+    columns = {"week": pa.array(columnar["weeks"], type=pa.int16())}
+    for i, owner in enumerate(columnar["owners"]):
+        columns[f"owner:{owner}"] = pa.array([row[i] for row in columnar["scores"]], type=pa.float32())
+    table = pa.table(columns)
+    
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
 @app.get("/api/weekly-scores")
-def get_weekly_scores(year: int = Query(...), manager: Optional[str] = Query(None)):
-    """Get weekly scores for a season, optionally filtered by manager"""
+def get_weekly_scores(
+    year: int = Query(...),
+    manager: Optional[str] = Query(None),
+    league_id: Optional[str] = Query(None, description="League ID (default: every league that season)"),
+    format: str = Query("rows", pattern="^(rows|columnar|arrow)$",
+                        description="rows (default), columnar (weeks x owners matrix) or arrow (IPC stream)")
+):
+    """Get weekly scores for a season, optionally filtered by manager and league"""
+    if format == "arrow" and pa is None:
+        raise HTTPException(status_code=501, detail="Arrow output requires pyarrow (pip install pyarrow)")
+    
+    conditions, params = ["m.season_year = ?"], [year]
+    if manager:
+        conditions.append("t.owner = ?")
+        params.append(manager)
+    if league_id:
+        conditions.append("m.league_id = ?")
+        params.append(league_id)
+    where = " AND ".join(conditions)
+    
     with get_db() as conn:
-        if manager:
-            cursor = conn.execute("""
-                SELECT m.week, m.home_score as score, m.home_team as team, t.owner
-                FROM matchups m
-                JOIN teams t ON m.home_team = t.team_name AND m.season_year = t.season_year
-                WHERE m.season_year = ? AND t.owner = ?
-                UNION ALL
-                SELECT m.week, m.away_score, m.away_team, t.owner
-                FROM matchups m
-                JOIN teams t ON m.away_team = t.team_name AND m.season_year = t.season_year
-                WHERE m.season_year = ? AND t.owner = ?
-                ORDER BY week
-            """, (year, manager, year, manager))
-        else:
-            cursor = conn.execute("""
-                SELECT m.week, m.home_score as score, m.home_team as team, t.owner
-                FROM matchups m
-                JOIN teams t ON m.home_team = t.team_name AND m.season_year = t.season_year
-                WHERE m.season_year = ?
-                UNION ALL
-                SELECT m.week, m.away_score, m.away_team, t.owner
-                FROM matchups m
-                JOIN teams t ON m.away_team = t.team_name AND m.season_year = t.season_year
-                WHERE m.season_year = ?
-                ORDER BY week, owner
-            """, (year, year))
+        cursor = conn.execute(f"""
+            SELECT m.league_id, m.week, m.home_score as score, m.home_team as team, t.owner
+            FROM matchups m
+            JOIN teams t ON t.league_id = m.league_id AND m.home_team = t.team_name
+                        AND m.season_year = t.season_year
+            WHERE {where}
+            UNION ALL
+            SELECT m.league_id, m.week, m.away_score, m.away_team, t.owner
+            FROM matchups m
+            JOIN teams t ON t.league_id = m.league_id AND m.away_team = t.team_name
+                        AND m.season_year = t.season_year
+            WHERE {where}
+            ORDER BY week, owner
+        """, params * 2)
         scores = rows_to_dicts(cursor.fetchall())
     
-    return {"year": year, "manager": manager, "scores": scores}
+    if format == "rows":
+        return {"year": year, "manager": manager, "league_id": league_id, "scores": scores}
+    
+    try:
+        columnar = weekly_scores_columnar(scores)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "arrow":
+        return Response(content=weekly_scores_arrow(columnar), media_type="application/vnd.apache.arrow.stream")
+    return {"year": year, "manager": manager, "league_id": league_id, **columnar}
 
 @app.get("/api/transactions")
-def get_transactions(year: Optional[int] = Query(None), team: Optional[str] = Query(None)):
-    """Get transactions, optionally filtered by year and/or team"""
+def get_transactions(
+    year: Optional[int] = Query(None),
+    team: Optional[str] = Query(None),
+    txn_type: Optional[str] = Query(None, alias="type", description="trade, waiver, free_agent, ..."),
+    player_id: Optional[str] = Query(None, description="Sleeper player ID (transactions that moved them)")
+):
+    """
+    Get transactions, optionally filtered by year, team, type and/or player.
+    Sleeper transactions include the assets (players, picks, FAAB) they moved.
+    """
+    conditions, params = [], []
+    if year:
+        conditions.append("season_year = ?")
+        params.append(year)
+    if team:
+        conditions.append("team LIKE ?")
+        params.append(f"%{team}%")
+    if txn_type:
+        conditions.append("type = ?")
+        params.append(txn_type)
+    if player_id:
+        conditions.append("transaction_id IN (SELECT transaction_id FROM transaction_assets WHERE player_id = ?)")
+        params.append(player_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    limit = "" if conditions else "LIMIT 100"
+    
     with get_db() as conn:
-        if year and team:
-            cursor = conn.execute("""
-                SELECT * FROM transactions 
-                WHERE season_year = ? AND team LIKE ?
-                ORDER BY date DESC
-            """, (year, f"%{team}%"))
-        elif year:
-            cursor = conn.execute("""
-                SELECT * FROM transactions 
-                WHERE season_year = ?
-                ORDER BY date DESC
-            """, (year,))
-        elif team:
-            cursor = conn.execute("""
-                SELECT * FROM transactions 
-                WHERE team LIKE ?
-                ORDER BY date DESC
-            """, (f"%{team}%",))
-        else:
-            cursor = conn.execute("""
-                SELECT * FROM transactions 
-                ORDER BY date DESC LIMIT 100
-            """)
+        cursor = conn.execute(f"""
+            SELECT * FROM transactions 
+            {where}
+            ORDER BY date DESC {limit}
+        """, params)
         transactions = rows_to_dicts(cursor.fetchall())
+        
+        # Assets for every returned Sleeper transaction in one indexed query
+        ids = [txn["transaction_id"] for txn in transactions if txn.get("transaction_id")]
+        assets = {}
+        if ids:
+            cursor = conn.execute("""
+                SELECT league_id, transaction_id, asset_type, player_id, player_name, position,
+                       from_team, to_team, pick_season, pick_round, pick_original_team, amount
+                FROM transaction_assets
+                WHERE transaction_id IN (SELECT value FROM json_each(?))
+                ORDER BY id
+            """, (json.dumps(ids),))
+            for row in cursor.fetchall():
+                asset = dict(row)
+                key = (str(asset.pop("league_id")), asset.pop("transaction_id"))
+                assets.setdefault(key, []).append(asset)
+    
+    for txn in transactions:
+        if txn.get("transaction_id"):
+            txn["assets"] = assets.get((str(txn["league_id"]), txn["transaction_id"]), [])
     
     return {"transactions": transactions}
 
+@app.get("/api/traded-picks")
+def get_traded_picks(year: Optional[int] = Query(None), team: Optional[str] = Query(None)):
+    """Get current owners of traded future draft picks (Sleeper), optionally by league season and/or owner"""
+    conditions, params = [], []
+    if year:
+        conditions.append("season_year = ?")
+        params.append(year)
+    if team:
+        conditions.append("owner_team = ?")
+        params.append(team)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    with get_db() as conn:
+        cursor = conn.execute(f"""
+            SELECT season_year, pick_season, round, original_team, owner_team, previous_owner_team
+            FROM traded_picks
+            {where}
+            ORDER BY pick_season, round, original_team
+        """, params)
+        picks = rows_to_dicts(cursor.fetchall())
+    
+    return {"traded_picks": picks}
+
 
 @app.get("/api/matchup-roster")
 def get_matchup_roster(
@@ -1331,6 +1889,39 @@ def get_dst_stats(team_identifier: str, year: Optional[int] = Query(None)):
         }
 
 
+@app.get("/api/what-if/presets")
+def get_scoring_presets():
+    """Get the built-in alternate scoring rulesets"""
+    return {"presets": SCORING_PRESETS}
+
+
+@app.post("/api/what-if")
+def get_what_if(ruleset: ScoringRuleset):
+    """
+    Rescore league history under an alternate ruleset and return the standings.
+    `rules` are applied on top of `preset` (if given); results are cached by ruleset hash.
+    """
+    if ruleset.preset and ruleset.preset not in SCORING_PRESETS:
+        raise HTTPException(status_code=404, detail=f"Unknown scoring preset: {ruleset.preset}")
+    
+    rules = dict(SCORING_PRESETS.get(ruleset.preset, {}))
+    rules.update(ruleset.rules)
+    
+    with get_db() as conn:
+        try:
+            result = rescore(conn, rules)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        standings = what_if_standings(conn, result["ruleset_hash"], ruleset.year)
+    
+    return {
+        "ruleset_hash": result["ruleset_hash"],
+        "rules": result["rules"],
+        "year": ruleset.year,
+        "standings": standings
+    }
+
+
 # Run with: uvicorn main:app --reload --port 8000
 if __name__ == "__main__":
     import uvicorn
@@ -4,23 +4,25 @@ const API_BASE = 'http://localhost:8000/api';
 
 export const load: PageLoad = async ({ fetch, params }) => {
     try {
-        const [managerRes, rivalriesRes, weeklyRes] = await Promise.all([
-            fetch(`${API_BASE}/manager/${encodeURIComponent(params.name)}`),
-            fetch(`${API_BASE}/rivalries/${encodeURIComponent(params.name)}`),
-            fetch(`${API_BASE}/weekly-results/${encodeURIComponent(params.name)}`)
-        ]);
+        // One request: season history, rivalries, weekly results, streaks and percentiles
+        const res = await fetch(`${API_BASE}/manager/${encodeURIComponent(params.name)}/dashboard`);
 
-        if (!managerRes.ok) {
-            return { manager: null, rivalries: [], weeklyResults: [], error: 'Manager not found' };
+        if (!res.ok) {
+            return { manager: null, rivalries: [], weeklyResults: [], streaks: null, percentiles: [], error: 'Manager not found' };
         }
 
-        const manager = await managerRes.json();
-        const rivalries = rivalriesRes.ok ? (await rivalriesRes.json()).rivalries : [];
-        const weeklyResults = weeklyRes.ok ? (await weeklyRes.json()).weekly_results : [];
+        const dashboard = await res.json();
 
-        return { manager, rivalries, weeklyResults, error: null };
+        return {
+            manager: dashboard.manager,
+            rivalries: dashboard.rivalries,
+            weeklyResults: dashboard.weekly_results,
+            streaks: dashboard.streaks,
+            percentiles: dashboard.percentiles,
+            error: null
+        };
     } catch (error) {
         console.error('Failed to load manager:', error);
-        return { manager: null, rivalries: [], weeklyResults: [], error: 'Failed to load manager data' };
+        return { manager: null, rivalries: [], weeklyResults: [], streaks: null, percentiles: [], error: 'Failed to load manager data' };
     }
 };
@@ -13,6 +13,8 @@ import glob
 from datetime import datetime
 import config
 from scripts.data_manager import DataManager
+from scripts.normalization import normalize_data
+from scripts.player_directory import open_player_directory
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'espn-fantasy-scraper-secret-key'
@@ -210,7 +212,7 @@ def load_json_data(season=None, source=None):
             with open(files[0], 'r') as f:
                 data = json.load(f)
                 data['_source'] = source  # Add source info
-                return normalize_data(data, source)
+                return normalize_data(data, source, load_sleeper_players() if source == 'sleeper' else None)
     
     # Load most recent if no season specified
     all_files = (
@@ -227,315 +229,23 @@ def load_json_data(season=None, source=None):
         # Determine source from filename
         if 'sleeper_' in os.path.basename(latest):
             data['_source'] = 'sleeper'
-            return normalize_data(data, 'sleeper')
+            return normalize_data(data, 'sleeper', load_sleeper_players())
         else:
             data['_source'] = 'espn'
             return normalize_data(data, 'espn')
 
 
-def clean_sleeper_player_name(name):
-    """Remove (TEAM POS) suffix from Sleeper player names"""
-    if name and '(' in name and ')' in name:
-        return name.split('(')[0].strip()
-    return name
+_sleeper_players = None
 
 
 def load_sleeper_players():
-    """Load Sleeper player data for position/team lookups"""
-    players_file = os.path.join(config.DATA_DIR, 'sleeper_players.json')
-    if os.path.exists(players_file):
-        with open(players_file, 'r') as f:
-            return json.load(f)
-    return {}
-
-
-def sort_roster_by_position(roster):
-    """
-    Sort roster with starters first (in position order), then bench.
-    Position order: QB, RB, WR, TE, FLEX, D/ST, K
-    """
-    # Define position order
-    position_order = {
-        'QB': 1,
-        'RB': 2,
-        'WR': 3,
-        'TE': 4,
-        'FLEX': 5,
-        'D/ST': 6,
-        'DEF': 6,  # Defense alias
-        'K': 7
-    }
-    
-    # Separate starters and bench
-    starters = [p for p in roster if p.get('started')]
-    bench = [p for p in roster if not p.get('started')]
-    
-    # Sort starters by position order
-    def get_sort_key(player):
-        pos = player.get('position', 'ZZ')
-        return position_order.get(pos, 99)
-    
-    starters.sort(key=get_sort_key)
-    bench.sort(key=get_sort_key)
-    
-    # Combine: starters first, then bench
-    return starters + bench
-
-
-def normalize_espn_roster(roster, is_bench=False):
-    """Convert old ESPN roster format (2019) to new format"""
-    normalized = []
-    for player in roster:
-        # Handle old format (2019) - has 'player' instead of 'player_name'
-        if 'player' in player and 'player_name' not in player:
-            # Parse team_pos like "Ten QB" to get team and position
-            team_pos = player.get('team_pos') or ''
-            parts = team_pos.split() if team_pos else []
-            nfl_team = parts[0] if parts else ''
-            position = parts[1] if len(parts) > 1 else player.get('slot', 'N/A')
-            
-            normalized_player = {
-                'player_name': player.get('player'),
-                'position': position,
-                'nfl_team': nfl_team,
-                'points': player.get('fpts', 0),
-                'projected': player.get('proj', 0),
-                'started': not is_bench and player.get('slot', '').lower() != 'bench'
-            }
-            normalized.append(normalized_player)
-        else:
-            # Already in new format
-            normalized.append(player)
-    
-    return normalized
-
-
-def normalize_espn_data(data):
-    """Normalize ESPN data to handle different field name formats (2019 vs later years)"""
-    matchups = data.get('matchups', {})
-    
-    for week, week_matchups in matchups.items():
-        for matchup in week_matchups:
-            # Normalize home_roster
-            if matchup.get('home_roster'):
-                matchup['home_roster'] = normalize_espn_roster(matchup['home_roster'])
-            
-            # Normalize away_roster  
-            if matchup.get('away_roster'):
-                matchup['away_roster'] = normalize_espn_roster(matchup['away_roster'])
-            
-            # Normalize home_bench (if exists as separate field)
-            if matchup.get('home_bench'):
-                bench_normalized = normalize_espn_roster(matchup['home_bench'], is_bench=True)
-                matchup['home_roster'].extend(bench_normalized)
-                del matchup['home_bench']
-            
-            # Normalize away_bench (if exists as separate field)
-            if matchup.get('away_bench'):
-                bench_normalized = normalize_espn_roster(matchup['away_bench'], is_bench=True)
-                matchup['away_roster'].extend(bench_normalized)
-                del matchup['away_bench']
-    
-    return data
-
-
-def normalize_data(data, source):
-    """Normalize data structure between ESPN and Sleeper formats"""
-    if source == 'sleeper':
-        # Convert Sleeper format to match ESPN structure for display
-        # Load player data for position/team lookups
-        sleeper_players = load_sleeper_players()
-        
-        # Get draft info
-        drafts = data.get('drafts', [])
-        draft_info = drafts[0] if drafts else {}
-        draft_type = draft_info.get('type', 'snake')
-        draft_start_time = draft_info.get('start_time')
-        
-        # Format draft date
-        if draft_start_time:
-            from datetime import datetime
-            draft_date = datetime.fromtimestamp(draft_start_time / 1000).strftime('%B %d, %Y')
-        else:
-            draft_date = 'Unknown'
-        
-        normalized = {
-            '_source': 'sleeper',
-            'scraped_at': data.get('scraped_at', ''),
-            'season_year': int(data.get('season', 2025)),
-            'league_id': data.get('league', {}).get('league_id', ''),
-            'standings': [],
-            'matchups': {},
-            'draft': {
-                'picks': [],
-                'draft_type': draft_type.capitalize(),
-                'draft_date': draft_date
-            },
-            'transactions': [],
-            '_raw_sleeper': data  # Keep raw data for advanced views
-        }
-        
-        # Convert rosters to standings
-        rosters = data.get('rosters', [])
-        users = {u['user_id']: u for u in data.get('users', [])}
-        
-        for roster in rosters:
-            settings = roster.get('settings', {})
-            owner_id = roster.get('owner_id')
-            user = users.get(owner_id, {})
-            
-            normalized['standings'].append({
-                'rank': settings.get('final_rank', 0),  # Use final_rank if available
-                'team_name': user.get('metadata', {}).get('team_name') or user.get('display_name', 'Unknown'),
-                'owner': user.get('display_name', 'Unknown'),
-                'wins': settings.get('wins', 0),
-                'losses': settings.get('losses', 0),
-                'ties': settings.get('ties', 0),
-                'points_for': settings.get('fpts', 0) + settings.get('fpts_decimal', 0) / 100,
-                'points_against': settings.get('fpts_against', 0) + settings.get('fpts_against_decimal', 0) / 100,
-                'roster_id': roster.get('roster_id'),
-                'final_rank': settings.get('final_rank')  # Keep final_rank for sorting
-            })
-        
-        # Sort standings by final_rank if available, otherwise by wins then points
-        has_final_ranks = any(team.get('final_rank') for team in normalized['standings'])
-        
-        if has_final_ranks:
-            # Sort by final_rank (ascending - 1st place first)
-            normalized['standings'] = sorted(
-                normalized['standings'],
-                key=lambda x: x.get('final_rank', 999)
-            )
-        else:
-            # Sort by wins then points (descending)
-            normalized['standings'] = sorted(
-                normalized['standings'],
-                key=lambda x: (x['wins'], x['points_for']),
-                reverse=True
-            )
-            # Add ranks if no final_rank
-            for i, team in enumerate(normalized['standings'], 1):
-                team['rank'] = i
-        
-        # Convert matchups to ESPN-like format
-        roster_to_team = {s['roster_id']: s['team_name'] for s in normalized['standings']}
-        
-        for week, week_matchups in data.get('matchups', {}).items():
-            # Group matchups by matchup_id
-            matchup_groups = {}
-            for m in week_matchups:
-                mid = m.get('matchup_id')
-                if mid not in matchup_groups:
-                    matchup_groups[mid] = []
-                matchup_groups[mid].append(m)
-            
-            # Convert to ESPN format
-            normalized_week_matchups = []
-            for matchup_id, teams in matchup_groups.items():
-                if len(teams) == 2:
-                    team1, team2 = teams
-                    
-                    # Build rosters in ESPN format (combine starters and bench with 'started' flag)
-                    home_roster = []
-                    away_roster = []
-                    
-                    # Process all players for home team
-                    for p in team1.get('players_with_names', []):
-                        player_id = p.get('player_id')
-                        player_info = sleeper_players.get(player_id, {})
-                        
-                        home_roster.append({
-                            'player_name': clean_sleeper_player_name(p.get('player_name', 'Unknown')),
-                            'position': player_info.get('position', 'N/A'),
-                            'nfl_team': player_info.get('team', ''),
-                            'points': p.get('points', 0),
-                            'projected': p.get('projected', 0),
-                            'started': p.get('is_starter', False)
-                        })
-                    
-                    # Process all players for away team
-                    for p in team2.get('players_with_names', []):
-                        player_id = p.get('player_id')
-                        player_info = sleeper_players.get(player_id, {})
-                        
-                        away_roster.append({
-                            'player_name': clean_sleeper_player_name(p.get('player_name', 'Unknown')),
-                            'position': player_info.get('position', 'N/A'),
-                            'nfl_team': player_info.get('team', ''),
-                            'points': p.get('points', 0),
-                            'projected': p.get('projected', 0),
-                            'started': p.get('is_starter', False)
-                        })
-                    
-                    # Sort rosters: starters first (by position order), then bench
-                    home_roster = sort_roster_by_position(home_roster)
-                    away_roster = sort_roster_by_position(away_roster)
-                    
-                    # Calculate projected totals (sum of started players only)
-                    home_projected = sum(p['projected'] for p in home_roster if p.get('started'))
-                    away_projected = sum(p['projected'] for p in away_roster if p.get('started'))
-                    
-                    # Get bracket type (if any) from either team's matchup data
-                    bracket_type = team1.get('bracket_type') or team2.get('bracket_type')
-                    
-                    normalized_matchup = {
-                        'week': int(week),
-                        'season': normalized['season_year'],
-                        'matchup_id': matchup_id,
-                        'home_team': roster_to_team.get(team1.get('roster_id'), f"Team {team1.get('roster_id')}"),
-                        'away_team': roster_to_team.get(team2.get('roster_id'), f"Team {team2.get('roster_id')}"),
-                        'home_score': team1.get('points', 0),
-                        'away_score': team2.get('points', 0),
-                        'home_projected': home_projected,
-                        'away_projected': away_projected,
-                        'home_roster': home_roster,
-                        'away_roster': away_roster
-                    }
-                    
-                    # Add bracket_type if it exists
-                    if bracket_type:
-                        normalized_matchup['bracket_type'] = bracket_type
-                    
-                    normalized_week_matchups.append(normalized_matchup)
-            
-            normalized['matchups'][week] = normalized_week_matchups
-        
-        # Convert draft picks
-        roster_to_team = {s['roster_id']: s['team_name'] for s in normalized['standings']}
-        
-        for draft in data.get('drafts', []):
-            for idx, pick in enumerate(draft.get('picks', []), 1):
-                # Extract player info
-                player_info = pick.get('player_info', {})
-                metadata = pick.get('metadata', {})
-                
-                # Get the team that made the pick (use roster_id from the pick)
-                roster_id = pick.get('roster_id')
-                team_name = roster_to_team.get(roster_id, f"Team {roster_id}")
-                
-                # Clean player name - remove "(TEAM POS)" suffix from Sleeper format
-                player_name = clean_sleeper_player_name(pick.get('player_name', 'Unknown'))
-                
-                normalized['draft']['picks'].append({
-                    'round': pick.get('round'),
-                    'pick': pick.get('pick_no'),
-                    'overall_pick': idx,
-                    'team': team_name,
-                    'player_name': player_name,
-                    'position': player_info.get('position') or metadata.get('position', 'N/A'),
-                    'nfl_team': player_info.get('team') or metadata.get('team', ''),
-                    'player_id': pick.get('player_id'),
-                    'picked_by': pick.get('picked_by'),
-                    'roster_id': roster_id,
-                    'metadata': metadata,
-                    'player_info': player_info
-                })
-        
-        return normalized
-    else:
-        # ESPN data - normalize field names (handles 2019 format)
-        data['_source'] = 'espn'
-        return normalize_espn_data(data)
+    """Sleeper player directory for position/team lookups (opened once, read lazily)"""
+    global _sleeper_players
+    if _sleeper_players is None:
+        if not os.path.exists(config.DB_FILE):
+            return {}
+        _sleeper_players = open_player_directory(config.DB_FILE)
+    return _sleeper_players
 
 
 @app.route('/')
@@ -0,0 +1,128 @@
+"""
+NFL Data Cache
+Local Parquet cache for nflreadpy downloads, one file per dataset and season.
+A file written after its season ended (March 1 of the next year) never
+changes upstream, so it is read from disk forever; anything written earlier,
+including the in-progress season, is refreshed after a TTL. Offline mode never touches
+the network and only serves what is on disk.
+"""
+import os
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+import config
+
+
+DEFAULT_CACHE_DIR = os.path.join(config.DATA_DIR, "nflverse_cache")
+CURRENT_SEASON_TTL_HOURS = 6
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a dataset/season is not cached"""
+
+
+def current_nfl_season(today: Optional[datetime] = None) -> int:
+    """The season still receiving data (a season ends with February's Super Bowl)"""
+    today = today or datetime.now()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def season_end(season: int) -> datetime:
+    """When a season's data is final (the first day current_nfl_season moves past it)"""
+    return datetime(season + 1, 3, 1)
+
+
+class NFLDataCache:
+    """
+    Parquet cache in front of nflreadpy loaders, keyed by dataset and season
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 current_ttl_hours: float = CURRENT_SEASON_TTL_HOURS,
+                 offline: Optional[bool] = None):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory for Parquet files (default: DATA_DIR/nflverse_cache)
+            current_ttl_hours: Max age of the current season's files before re-download
+            offline: Serve only cached files (default: NFL_OFFLINE=1 in the environment)
+        """
+        if pl is None:
+            raise ImportError("polars is not installed")
+
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.current_ttl = current_ttl_hours * 3600
+        self.offline = os.environ.get('NFL_OFFLINE') == '1' if offline is None else offline
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, dataset: str, season: int) -> str:
+        """Cache file for one dataset/season"""
+        return os.path.join(self.cache_dir, dataset, f"{season}.parquet")
+
+    def is_fresh(self, dataset: str, season: int) -> bool:
+        """Cached and either written after the season ended or younger than the TTL"""
+        path = self.path(dataset, season)
+        if not os.path.exists(path):
+            return False
+        written = os.path.getmtime(path)
+        # A file from mid-season stays stale after the season ends until it is re-downloaded
+        if written >= season_end(season).timestamp():
+            return True
+        return time.time() - written < self.current_ttl
+
+    def load(self, dataset: str, season: int, loader: Callable[..., object]):
+        """
+        Load one season of a dataset, downloading only when the cache is stale
+
+        Args:
+            dataset: Cache key, e.g. 'player_stats'
+            season: Season year
+            loader: nflreadpy function taking seasons=[...]
+
+        Returns:
+            Polars DataFrame
+
+        Raises:
+            CacheMiss: Offline and nothing cached for this dataset/season
+        """
+        path = self.path(dataset, season)
+
+        if self.is_fresh(dataset, season) or (self.offline and os.path.exists(path)):
+            self.hits += 1
+            return pl.read_parquet(path)
+
+        if self.offline:
+            raise CacheMiss(f"{dataset} {season} is not cached ({path})")
+
+        try:
+            frame = loader(seasons=[season])
+        except Exception as e:
+            if os.path.exists(path):
+                print(f"   ⚠ Download of {dataset} {season} failed ({e}); using stale cache")
+                self.hits += 1
+                return pl.read_parquet(path)
+            raise
+
+        self.misses += 1
+        if frame is not None and len(frame) > 0:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            frame.write_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        return frame
+
+    def load_seasons(self, dataset: str, seasons: List[int], loader: Callable[..., object]):
+        """Load several seasons through the cache and stack them"""
+        frames = [self.load(dataset, season, loader) for season in seasons]
+        frames = [frame for frame in frames if frame is not None and len(frame) > 0]
+        if not frames:
+            return None
+        return frames[0] if len(frames) == 1 else pl.concat(frames, how="diagonal_relaxed")
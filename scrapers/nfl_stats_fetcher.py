@@ -10,13 +10,18 @@ import re
 
 try:
     import nflreadpy as nfl
-    import polars as pl
 except ImportError:
     print("⚠ nflreadpy not installed. Run: pip install nflreadpy polars")
     nfl = None
+
+try:
+    import polars as pl
+except ImportError:
     pl = None
 
 import config
+from scrapers.nfl_data_cache import NFLDataCache
+from scrapers.player_matcher import PlayerMatcher
 
 
 # Team name mapping for D/ST (Defense/Special Teams)
@@ -133,23 +138,179 @@ TEAM_ABBR_TO_NAME = {
 }
 
 
+# Columnar write specs: (db column, source columns, type[, default]).
+# The first source with a non-empty value wins and missing values fall back to
+# the type's default, matching the old per-row `str(row.get(a) or row.get(b) or '')`
+WEEKLY_STATS_COLUMNS = (
+    ('player_id', ('player_id',), 'str'),
+    ('player_name', ('player_name',), 'str'),
+    ('player_display_name', ('player_display_name',), 'str'),
+    ('position', ('position',), 'str'),
+    ('position_group', ('position_group',), 'str'),
+    ('headshot_url', ('headshot_url',), 'str'),
+    ('recent_team', ('team',), 'str'),
+    ('season', ('season',), 'int'),
+    ('week', ('week',), 'int'),
+    ('season_type', ('season_type',), 'str', 'REG'),
+    ('opponent_team', ('opponent_team',), 'str'),
+    ('completions', ('completions',), 'int'),
+    ('attempts', ('attempts',), 'int'),
+    ('passing_yards', ('passing_yards',), 'float'),
+    ('passing_tds', ('passing_tds',), 'int'),
+    ('interceptions', ('passing_interceptions',), 'int'),
+    ('sacks', ('sacks_suffered',), 'int'),
+    ('sack_yards', ('sack_yards_lost',), 'float'),
+    ('sack_fumbles', ('sack_fumbles',), 'int'),
+    ('sack_fumbles_lost', ('sack_fumbles_lost',), 'int'),
+    ('passing_air_yards', ('passing_air_yards',), 'float'),
+    ('passing_yards_after_catch', ('passing_yards_after_catch',), 'float'),
+    ('passing_first_downs', ('passing_first_downs',), 'int'),
+    ('passing_epa', ('passing_epa',), 'float'),
+    ('passing_2pt_conversions', ('passing_2pt_conversions',), 'int'),
+    ('carries', ('carries',), 'int'),
+    ('rushing_yards', ('rushing_yards',), 'float'),
+    ('rushing_tds', ('rushing_tds',), 'int'),
+    ('rushing_fumbles', ('rushing_fumbles',), 'int'),
+    ('rushing_fumbles_lost', ('rushing_fumbles_lost',), 'int'),
+    ('rushing_first_downs', ('rushing_first_downs',), 'int'),
+    ('rushing_epa', ('rushing_epa',), 'float'),
+    ('rushing_2pt_conversions', ('rushing_2pt_conversions',), 'int'),
+    ('receptions', ('receptions',), 'int'),
+    ('targets', ('targets',), 'int'),
+    ('receiving_yards', ('receiving_yards',), 'float'),
+    ('receiving_tds', ('receiving_tds',), 'int'),
+    ('receiving_fumbles', ('receiving_fumbles',), 'int'),
+    ('receiving_fumbles_lost', ('receiving_fumbles_lost',), 'int'),
+    ('receiving_air_yards', ('receiving_air_yards',), 'float'),
+    ('receiving_yards_after_catch', ('receiving_yards_after_catch',), 'float'),
+    ('receiving_first_downs', ('receiving_first_downs',), 'int'),
+    ('receiving_epa', ('receiving_epa',), 'float'),
+    ('receiving_2pt_conversions', ('receiving_2pt_conversions',), 'int'),
+    ('racr', ('racr',), 'float'),
+    ('target_share', ('target_share',), 'float'),
+    ('air_yards_share', ('air_yards_share',), 'float'),
+    ('wopr', ('wopr',), 'float'),
+    ('special_teams_tds', ('special_teams_tds',), 'int'),
+    ('fg_made', ('fg_made',), 'int'),
+    ('fg_att', ('fg_att',), 'int'),
+    ('fg_missed', ('fg_missed',), 'int'),
+    ('fg_blocked', ('fg_blocked',), 'int'),
+    ('fg_long', ('fg_long',), 'int'),
+    ('fg_pct', ('fg_pct',), 'float'),
+    ('fg_made_0_19', ('fg_made_0_19',), 'int'),
+    ('fg_made_20_29', ('fg_made_20_29',), 'int'),
+    ('fg_made_30_39', ('fg_made_30_39',), 'int'),
+    ('fg_made_40_49', ('fg_made_40_49',), 'int'),
+    ('fg_made_50_59', ('fg_made_50_59',), 'int'),
+    ('fg_made_60_', ('fg_made_60_',), 'int'),
+    ('fg_missed_0_19', ('fg_missed_0_19',), 'int'),
+    ('fg_missed_20_29', ('fg_missed_20_29',), 'int'),
+    ('fg_missed_30_39', ('fg_missed_30_39',), 'int'),
+    ('fg_missed_40_49', ('fg_missed_40_49',), 'int'),
+    ('fg_missed_50_59', ('fg_missed_50_59',), 'int'),
+    ('fg_missed_60_', ('fg_missed_60_',), 'int'),
+    ('pat_made', ('pat_made',), 'int'),
+    ('pat_att', ('pat_att',), 'int'),
+    ('pat_missed', ('pat_missed',), 'int'),
+    ('pat_blocked', ('pat_blocked',), 'int'),
+    ('pat_pct', ('pat_pct',), 'float'),
+    ('gwfg_att', ('gwfg_att',), 'int'),
+    ('gwfg_made', ('gwfg_made',), 'int'),
+    ('fantasy_points', ('fantasy_points',), 'float'),
+    ('fantasy_points_ppr', ('fantasy_points_ppr',), 'float'),
+)
+
+TEAM_DEFENSE_COLUMNS = (
+    ('team', ('team',), 'str'),
+    ('team_abbr', ('team_abbr', 'team'), 'str'),
+    ('season', ('season',), 'int'),
+    ('week', ('week',), 'int'),
+    ('season_type', ('season_type',), 'str', 'REG'),
+    ('opponent_team', ('opponent_team',), 'str'),
+    ('def_sacks', ('def_sacks', 'sacks'), 'int'),
+    ('def_sack_yards', ('def_sack_yards', 'sack_yards'), 'float'),
+    ('def_qb_hits', ('def_qb_hits', 'qb_hits'), 'int'),
+    ('def_tackles_for_loss', ('def_tackles_for_loss', 'tackles_for_loss'), 'int'),
+    ('def_tackles_for_loss_yards', ('def_tackles_for_loss_yards', 'tackles_for_loss_yards'), 'float'),
+    ('def_interceptions', ('def_interceptions', 'interceptions'), 'int'),
+    ('def_interception_yards', ('def_interception_yards', 'interception_yards'), 'float'),
+    ('def_passes_defended', ('def_passes_defended', 'passes_defended', 'def_pass_defended'), 'int'),
+    ('def_fumbles_forced', ('def_fumbles_forced', 'fumbles_forced'), 'int'),
+    ('def_fumbles_recovered', ('def_fumbles_recovered', 'fumbles_recovered', 'fumble_recovery_opp'), 'int'),
+    ('def_fumble_recovery_yards', ('def_fumble_recovery_yards', 'fumble_recovery_yards', 'fumble_recovery_yards_opp'), 'float'),
+    ('def_touchdowns', ('def_touchdowns', 'defensive_touchdowns', 'def_tds'), 'int'),
+    ('def_safeties', ('def_safeties', 'safeties'), 'int'),
+    ('special_teams_tds', ('special_teams_tds',), 'int'),
+    ('def_penalties', ('def_penalties', 'penalties'), 'int'),
+    ('def_penalty_yards', ('def_penalty_yards', 'penalty_yards'), 'int'),
+    ('fantasy_points', ('fantasy_points',), 'float'),
+    ('fantasy_points_ppr', ('fantasy_points_ppr',), 'float'),
+)
+
+_COLUMN_TYPES = {'str': ('Utf8', ''), 'int': ('Int64', 0), 'float': ('Float64', 0.0)}
+
+
+def columnar_frame(frame, spec):
+    """
+    Cast and null-fill a stats frame into insert order with Polars expressions
+
+    Args:
+        frame: Polars DataFrame from nflreadpy
+        spec: Column spec (see WEEKLY_STATS_COLUMNS)
+
+    Returns:
+        DataFrame with exactly the spec's db columns, no nulls
+    """
+    exprs = []
+    for column, sources, kind, *default in spec:
+        dtype_name, fallback = _COLUMN_TYPES[kind]
+        dtype = getattr(pl, dtype_name)
+        fallback = default[0] if default else fallback
+        candidates = [
+            # Falsy values (0, '') defer to the next source, like Python's `or`
+            pl.when(pl.col(src).cast(dtype, strict=False) != pl.lit('' if kind == 'str' else 0, dtype))
+              .then(pl.col(src).cast(dtype, strict=False))
+            for src in sources if src in frame.columns
+        ]
+        expr = pl.coalesce(candidates) if candidates else pl.lit(None, dtype)
+        exprs.append(expr.fill_null(pl.lit(fallback, dtype)).alias(column))
+    return frame.select(exprs)
+
+
+def insert_sql(table: str, columns) -> str:
+    """INSERT OR REPLACE statement for the given column order"""
+    return (f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})")
+
 
 class NFLStatsFetcher:
     """
     Fetches NFL player statistics and stores them in the database
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, cache: Optional[NFLDataCache] = None):
         """
         Initialize NFL stats fetcher
         
         Args:
             db_path: Path to SQLite database
+            cache: Parquet cache for nflreadpy downloads (default: NFLDataCache())
         """
         self.db_path = db_path or config.DB_FILE
         
-        if nfl is None or pl is None:
+        if pl is None:
             raise ImportError("nflreadpy and polars are not installed")
+        
+        self.cache = cache or NFLDataCache()
+        
+        # Offline runs only read the Parquet cache, so nflreadpy is optional there
+        if nfl is None and not self.cache.offline:
+            raise ImportError("nflreadpy and polars are not installed")
+    
+    def _load(self, dataset: str, seasons: List[int], loader_name: str):
+        """Load seasons of an nflreadpy dataset through the Parquet cache"""
+        loader = getattr(nfl, loader_name, None)
+        return self.cache.load_seasons(dataset, seasons, loader)
     
     def fetch_weekly_stats(self, seasons: List[int]) -> Optional[object]:
         """
@@ -171,7 +332,10 @@ class NFLStatsFetcher:
             print(f"📊 Fetching NFL player stats for seasons: {seasons}")
             # nflreadpy uses load_player_stats() instead of import_weekly_data()
             # This returns game-level stats in a Polars DataFrame
-            player_stats = nfl.load_player_stats(seasons=seasons)
+            player_stats = self._load('player_stats', seasons, 'load_player_stats')
+            if player_stats is None:
+                print(f"⚠ No player stats for seasons: {seasons}")
+                return None
             print(f"✓ Fetched {len(player_stats)} player-game records")
             return player_stats
         except Exception as e:
@@ -216,64 +380,22 @@ class NFLStatsFetcher:
         if weekly_stats is None or fantasy_name is None or len(weekly_stats) == 0:
             return None
         
-        normalized_fantasy = self.normalize_player_name(fantasy_name)
-        
-        # Try exact match on player_display_name (case-insensitive)
-        exact_match = weekly_stats.filter(
-            pl.col('player_display_name').str.to_lowercase() == fantasy_name.lower()
-        )
-        
-        if len(exact_match) > 0:
-            player_row = exact_match[0].to_dicts()[0]
-            return {
-                'player_id': player_row['player_id'],
-                'player_name': player_row['player_name'],
-                'player_display_name': player_row['player_display_name'],
-                'position': player_row['position'],
-                'team': player_row.get('team') or player_row.get('recent_team') or '',
-                'confidence': 1.0
-            }
-        
-        # Try normalized match (without suffixes)
-        for row in weekly_stats.to_dicts():
-            if self.normalize_player_name(str(row['player_display_name'])).lower() == normalized_fantasy.lower():
-                return {
-                    'player_id': row['player_id'],
-                    'player_name': row['player_name'],
-                    'player_display_name': row['player_display_name'],
-                    'position': row['position'],
-                    'team': row.get('team') or row.get('recent_team') or '',
-                    'confidence': 0.9
-                }
-        
-        # Try partial match (for cases like "D. Smith" vs "DeVonta Smith")
-        if ' ' in fantasy_name:
-            parts = fantasy_name.split()
-            last_name = parts[-1]
-            
-            # Look for players with same last name
-            last_name_match = weekly_stats.filter(
-                pl.col('player_display_name').str.to_lowercase().str.contains(last_name.lower())
-            )
-            
-            if len(last_name_match) == 1:
-                # Only one player with this last name - likely a match
-                player_row = last_name_match[0].to_dicts()[0]
-                return {
-                    'player_id': player_row['player_id'],
-                    'player_name': player_row['player_name'],
-                    'player_display_name': player_row['player_display_name'],
-                    'position': player_row['position'],
-                    'team': player_row.get('team') or player_row.get('recent_team') or '',
-                    'confidence': 0.7
-                }
-        
-        return None
+        return self.get_matcher(weekly_stats).match(fantasy_name)
+    
+    def get_matcher(self, weekly_stats) -> PlayerMatcher:
+        """PlayerMatcher for a stats frame, built once and reused for the same frame"""
+        cached = getattr(self, '_matcher', None)
+        if cached is None or cached[0] is not weekly_stats:
+            self._matcher = (weekly_stats, PlayerMatcher.from_frame(weekly_stats))
+        return self._matcher[1]
     
     def store_weekly_stats(self, weekly_stats) -> int:
         """
         Store weekly stats in database
         
+        Cached rescorings (scripts/rescoring.py) of the stored weeks are
+        dropped in the same transaction and recomputed on the next request.
+        
         Args:
             weekly_stats: Polars DataFrame with weekly stats
             
@@ -284,142 +406,46 @@ class NFLStatsFetcher:
             print("⚠ No weekly stats to store")
             return 0
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Casting and null handling happen column-wise in Polars; SQLite only
+        # sees plain tuples via executemany (no per-row dicts)
+        frame = columnar_frame(weekly_stats, WEEKLY_STATS_COLUMNS)
+        columns = [spec[0] for spec in WEEKLY_STATS_COLUMNS]
         
-        stored_count = 0
-        
-        # Convert Polars DataFrame to list of dicts for iteration
-        for row in weekly_stats.to_dicts():
-            try:
-                # Build the values tuple
-                values_tuple = (
-                    str(row.get('player_id') or ''),
-                    str(row.get('player_name') or ''),
-                    str(row.get('player_display_name') or ''),
-                    str(row.get('position') or ''),
-                    str(row.get('position_group') or ''),
-                    str(row.get('headshot_url') or ''),
-                    str(row.get('team') or ''),
-                    int(row.get('season') or 0),
-                    int(row.get('week') or 0),
-                    str(row.get('season_type') or 'REG'),
-                    str(row.get('opponent_team') or ''),
-                    int(row.get('completions') or 0),
-                    int(row.get('attempts') or 0),
-                    float(row.get('passing_yards') or 0.0),
-                    int(row.get('passing_tds') or 0),
-                    int(row.get('passing_interceptions') or 0),
-                    int(row.get('sacks_suffered') or 0),
-                    float(row.get('sack_yards_lost') or 0.0),
-                    int(row.get('sack_fumbles') or 0),
-                    int(row.get('sack_fumbles_lost') or 0),
-                    float(row.get('passing_air_yards') or 0.0),
-                    float(row.get('passing_yards_after_catch') or 0.0),
-                    int(row.get('passing_first_downs') or 0),
-                    float(row.get('passing_epa') or 0.0),
-                    int(row.get('passing_2pt_conversions') or 0),
-                    int(row.get('carries') or 0),
-                    float(row.get('rushing_yards') or 0.0),
-                    int(row.get('rushing_tds') or 0),
-                    int(row.get('rushing_fumbles') or 0),
-                    int(row.get('rushing_fumbles_lost') or 0),
-                    int(row.get('rushing_first_downs') or 0),
-                    float(row.get('rushing_epa') or 0.0),
-                    int(row.get('rushing_2pt_conversions') or 0),
-                    int(row.get('receptions') or 0),
-                    int(row.get('targets') or 0),
-                    float(row.get('receiving_yards') or 0.0),
-                    int(row.get('receiving_tds') or 0),
-                    int(row.get('receiving_fumbles') or 0),
-                    int(row.get('receiving_fumbles_lost') or 0),
-                    float(row.get('receiving_air_yards') or 0.0),
-                    float(row.get('receiving_yards_after_catch') or 0.0),
-                    int(row.get('receiving_first_downs') or 0),
-                    float(row.get('receiving_epa') or 0.0),
-                    int(row.get('receiving_2pt_conversions') or 0),
-                    float(row.get('racr') or 0.0),
-                    float(row.get('target_share') or 0.0),
-                    float(row.get('air_yards_share') or 0.0),
-                    float(row.get('wopr') or 0.0),
-                    int(row.get('special_teams_tds') or 0),
-                    # Kicking stats
-                    int(row.get('fg_made') or 0),
-                    int(row.get('fg_att') or 0),
-                    int(row.get('fg_missed') or 0),
-                    int(row.get('fg_blocked') or 0),
-                    int(row.get('fg_long') or 0),
-                    float(row.get('fg_pct') or 0.0),
-                    int(row.get('fg_made_0_19') or 0),
-                    int(row.get('fg_made_20_29') or 0),
-                    int(row.get('fg_made_30_39') or 0),
-                    int(row.get('fg_made_40_49') or 0),
-                    int(row.get('fg_made_50_59') or 0),
-                    int(row.get('fg_made_60_') or 0),
-                    int(row.get('fg_missed_0_19') or 0),
-                    int(row.get('fg_missed_20_29') or 0),
-                    int(row.get('fg_missed_30_39') or 0),
-                    int(row.get('fg_missed_40_49') or 0),
-                    int(row.get('fg_missed_50_59') or 0),
-                    int(row.get('fg_missed_60_') or 0),
-                    int(row.get('pat_made') or 0),
-                    int(row.get('pat_att') or 0),
-                    int(row.get('pat_missed') or 0),
-                    int(row.get('pat_blocked') or 0),
-                    float(row.get('pat_pct') or 0.0),
-                    int(row.get('gwfg_att') or 0),
-                    int(row.get('gwfg_made') or 0),
-                    float(row.get('fantasy_points') or 0.0),
-                    float(row.get('fantasy_points_ppr') or 0.0)
-                )
-                
-                # Debug: check tuple length - DISABLED FOR DEBUGGING
-                # if len(values_tuple) != 76:
-                #     print(f"⚠ DEBUG: Tuple length is {len(values_tuple)}, expected 76")
-                #     print(f"   Player: {row.get('player_display_name')}")
-                #     continue
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO nfl_weekly_stats (
-                        player_id, player_name, player_display_name, position, position_group,
-                        headshot_url, recent_team, season, week, season_type, opponent_team,
-                        completions, attempts, passing_yards, passing_tds, interceptions,
-                        sacks, sack_yards, sack_fumbles, sack_fumbles_lost,
-                        passing_air_yards, passing_yards_after_catch, passing_first_downs,
-                        passing_epa, passing_2pt_conversions,
-                        carries, rushing_yards, rushing_tds, rushing_fumbles, rushing_fumbles_lost,
-                        rushing_first_downs, rushing_epa, rushing_2pt_conversions,
-                        receptions, targets, receiving_yards, receiving_tds,
-                        receiving_fumbles, receiving_fumbles_lost, receiving_air_yards,
-                        receiving_yards_after_catch, receiving_first_downs, receiving_epa,
-                        receiving_2pt_conversions, racr, target_share, air_yards_share, wopr,
-                        special_teams_tds,
-                        fg_made, fg_att, fg_missed, fg_blocked, fg_long, fg_pct,
-                        fg_made_0_19, fg_made_20_29, fg_made_30_39, fg_made_40_49, fg_made_50_59, fg_made_60_,
-                        fg_missed_0_19, fg_missed_20_29, fg_missed_30_39, fg_missed_40_49, fg_missed_50_59, fg_missed_60_,
-                        pat_made, pat_att, pat_missed, pat_blocked, pat_pct,
-                        gwfg_att, gwfg_made,
-                        fantasy_points, fantasy_points_ppr
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, values_tuple)
-                stored_count += 1
-            except Exception as e:
-                print(f"⚠ Error storing row for {row.get('player_display_name') or 'Unknown'}: {e}")
-                continue
+        weeks = frame.select(['season', 'week']).unique().rows()
         
-        conn.commit()
-        conn.close()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.executemany(insert_sql('nfl_weekly_stats', columns), frame.iter_rows())
+            conn.executemany("DELETE FROM rescored_player_weeks WHERE season = ? AND week = ?", weeks)
+            conn.executemany("DELETE FROM rescored_lineups WHERE season_year = ? AND week = ?", weeks)
+            conn.commit()
+            stored_count = len(frame)
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"✗ Error storing weekly stats: {e}")
+            stored_count = 0
+        finally:
+            conn.close()
         
         print(f"✓ Stored {stored_count} weekly stat records")
         return stored_count
     
-    def create_player_mappings(self, fantasy_players: List[str], weekly_stats) -> int:
+    def create_player_mappings(self, fantasy_players: List[str], weekly_stats,
+                               crosswalk: Optional[Dict[str, Tuple]] = None) -> int:
         """
         Create mappings between fantasy player names and NFL player IDs
         
+        Names whose Sleeper IDs are in the crosswalk are mapped by ID; only the
+        rest fall back to name matching. A name carried by several different
+        players (two Sleeper IDs, two GSIS IDs) gets no name mapping at all -
+        Sleeper rows resolve those through the crosswalk by ID instead. Cached
+        rescored lineups are dropped when the mappings change.
+        
         Args:
             fantasy_players: List of player names from fantasy leagues
             weekly_stats: Polars DataFrame with NFL weekly stats
+            crosswalk: Optional Sleeper ID -> (gsis_id, full_name, position,
+                team, names) (see scripts/player_crosswalk.py)
             
         Returns:
             Number of mappings created
@@ -427,86 +453,83 @@ class NFLStatsFetcher:
         if not fantasy_players or weekly_stats is None or len(weekly_stats) == 0:
             return 0
         
-        print(f"   Building player lookup table from {len(weekly_stats)} records...")
-        
-        # Create a unique players lookup for faster matching
-        # Get unique players from the stats
-        unique_players = weekly_stats.select([
-            'player_id', 'player_name', 'player_display_name', 
-            'position', 'team'
-        ]).unique(subset=['player_id'])
-        
-        # Convert to dict for fast lookup
-        player_lookup = {}
-        for player in unique_players.to_dicts():
-            name = player['player_display_name']
-            if not name:  # Skip None/empty names
-                continue
-            name_lower = name.lower()
-            player_lookup[name_lower] = player
-            # Also add normalized version (without suffixes)
-            normalized = self.normalize_player_name(name).lower()
-            if normalized != name_lower and normalized not in player_lookup:
-                player_lookup[normalized] = player
-        
-        print(f"   Lookup table created with {len(unique_players)} unique players")
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        print(f"   Building player index from {len(weekly_stats)} records...")
+        matcher = self.get_matcher(weekly_stats)
+        print(f"   Index created with {len(matcher)} unique players")
         
-        mapping_count = 0
         unique_fantasy_players = set(fantasy_players)
-        
         print(f"   Mapping {len(unique_fantasy_players)} fantasy player names...")
         
-        for i, fantasy_name in enumerate(unique_fantasy_players, 1):
-            if i % 100 == 0:
-                print(f"   Progress: {i}/{len(unique_fantasy_players)}...")
-            
-            if not fantasy_name or fantasy_name.lower() in ['unknown', 'n/a', '']:
+        # ID crosswalk first: exact by construction, no name matching needed
+        players_by_name = {}
+        for gsis_id, full_name, position, team, names in (crosswalk or {}).values():
+            for fantasy_name in names:
+                if fantasy_name in unique_fantasy_players:
+                    players_by_name.setdefault(fantasy_name, {})[gsis_id] = (full_name, position, team)
+        
+        by_id = {}
+        shared_names = set()
+        for fantasy_name, players in players_by_name.items():
+            if len(players) > 1:
+                shared_names.add(fantasy_name)
                 continue
-            
-            # Try exact match first
-            match = None
-            fantasy_lower = fantasy_name.lower()
-            
-            if fantasy_lower in player_lookup:
-                match = player_lookup[fantasy_lower]
-                confidence = 1.0
-            else:
-                # Try normalized match
-                normalized = self.normalize_player_name(fantasy_name).lower()
-                if normalized in player_lookup:
-                    match = player_lookup[normalized]
-                    confidence = 0.9
-            
-            if match:
-                try:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO nfl_player_mapping (
-                            fantasy_player_name, nfl_player_id, nfl_player_name,
-                            nfl_player_display_name, position, team,
-                            confidence_score, created_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        fantasy_name,
-                        match['player_id'],
-                        match['player_name'],
-                        match['player_display_name'],
-                        match['position'],
-                        match.get('team') or '',
-                        confidence,
-                        datetime.now().isoformat()
-                    ))
-                    mapping_count += 1
-                except Exception as e:
-                    print(f"⚠ Error mapping {fantasy_name}: {e}")
+            gsis_id, (full_name, position, team) = next(iter(players.items()))
+            by_id[fantasy_name] = matcher.get(gsis_id, 1.0, 'crosswalk') or {
+                'player_id': gsis_id,
+                'player_name': full_name,
+                'player_display_name': full_name,
+                'position': position,
+                'team': team or '',
+                'confidence': 1.0,
+                'method': 'crosswalk',
+            }
+        if shared_names:
+            print(f"   {len(shared_names)} names shared by different players, resolved by ID only")
         
+        matches = matcher.match_many(unique_fantasy_players - set(by_id) - shared_names)
+        matches.update(by_id)
+        
+        created_at = datetime.now().isoformat()
+        conn = sqlite3.connect(self.db_path)
+        mapping_sql = "SELECT fantasy_player_name, nfl_player_id, confidence_score FROM nfl_player_mapping"
+        before = set(conn.execute(mapping_sql))
+        # Drop earlier name-based guesses that the crosswalk contradicts
+        conn.executemany("""
+            DELETE FROM nfl_player_mapping
+            WHERE fantasy_player_name = ? AND nfl_player_id != ?
+        """, [(name, match['player_id']) for name, match in by_id.items()])
+        conn.executemany("DELETE FROM nfl_player_mapping WHERE fantasy_player_name = ?",
+                         [(name,) for name in shared_names])
+        conn.executemany("""
+            INSERT OR REPLACE INTO nfl_player_mapping (
+                fantasy_player_name, nfl_player_id, nfl_player_name,
+                nfl_player_display_name, position, team,
+                confidence_score, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                fantasy_name,
+                match['player_id'],
+                match['player_name'],
+                match['player_display_name'],
+                match['position'],
+                match['team'],
+                match['confidence'],
+                created_at
+            )
+            for fantasy_name, match in matches.items()
+        ])
+        if set(conn.execute(mapping_sql)) != before:
+            conn.execute("DELETE FROM rescored_lineups")
         conn.commit()
         conn.close()
         
-        print(f"✓ Created {mapping_count} player mappings")
-        return mapping_count
+        by_method = {}
+        for match in matches.values():
+            by_method[match['method']] = by_method.get(match['method'], 0) + 1
+        summary = ', '.join(f"{count} {method}" for method, count in sorted(by_method.items()))
+        print(f"✓ Created {len(matches)} player mappings ({summary or 'none'})")
+        return len(matches)
     
     def get_player_stats(self, player_name: str, season: Optional[int] = None) -> Dict:
         """
@@ -643,7 +666,10 @@ class NFLStatsFetcher:
         """
         try:
             print(f"🛡️  Fetching NFL team defense stats for seasons: {seasons}")
-            team_stats = nfl.load_team_stats(seasons=seasons)
+            team_stats = self._load('team_stats', seasons, 'load_team_stats')
+            if team_stats is None:
+                print(f"⚠ No team stats for seasons: {seasons}")
+                return None
             print(f"✓ Fetched {len(team_stats)} team-game records")
             return team_stats
         except Exception as e:
@@ -652,6 +678,22 @@ class NFLStatsFetcher:
                 print(f"   (Data for {seasons} may not be published yet)")
             return None
     
+    def fetch_schedules(self, seasons: List[int]) -> Optional[object]:
+        """
+        Fetch game schedules/scores (used for D/ST points allowed)
+        
+        Args:
+            seasons: List of seasons (years) to fetch
+            
+        Returns:
+            Polars DataFrame with one row per game or None if error
+        """
+        try:
+            return self._load('schedules', seasons, 'load_schedules')
+        except Exception as e:
+            print(f"✗ Error fetching schedules: {e}")
+            return None
+    
     def store_team_defense_stats(self, team_stats, schedules=None) -> int:
         """
         Store team defense stats in database
@@ -667,101 +709,53 @@ class NFLStatsFetcher:
             print("⚠ No team defense stats to store")
             return 0
         
-        # Build a lookup for points allowed from schedule data
-        points_allowed_lookup = {}
+        frame = columnar_frame(team_stats, TEAM_DEFENSE_COLUMNS)
+        
+        # Points allowed: join each defense to its opponent's score from the schedule
+        keys = ['team', 'season', 'week', 'season_type']
         if schedules is not None and len(schedules) > 0:
-            for game in schedules.to_dicts():
-                season = game.get('season')
-                week = game.get('week')
-                game_type = game.get('game_type', 'REG')
-                home_team = game.get('home_team')
-                away_team = game.get('away_team')
-                home_score = game.get('home_score') or 0
-                away_score = game.get('away_score') or 0
-                
-                # For home team defense, points allowed = away team's score
-                if home_team and season and week:
-                    key = (home_team, season, week, game_type)
-                    points_allowed_lookup[key] = away_score
-                
-                # For away team defense, points allowed = home team's score  
-                if away_team and season and week:
-                    key = (away_team, season, week, game_type)
-                    points_allowed_lookup[key] = home_score
+            games = columnar_frame(schedules, (
+                ('home_team', ('home_team',), 'str'),
+                ('away_team', ('away_team',), 'str'),
+                ('season', ('season',), 'int'),
+                ('week', ('week',), 'int'),
+                ('season_type', ('game_type',), 'str', 'REG'),
+                ('home_score', ('home_score',), 'int'),
+                ('away_score', ('away_score',), 'int'),
+            )).filter((pl.col('season') != 0) & (pl.col('week') != 0))
+            points_allowed = pl.concat([
+                games.select(pl.col('home_team').alias('team'), 'season', 'week', 'season_type',
+                             pl.col('away_score').alias('points_allowed')),
+                games.select(pl.col('away_team').alias('team'), 'season', 'week', 'season_type',
+                             pl.col('home_score').alias('points_allowed')),
+            ]).filter(pl.col('team') != '').unique(subset=keys, keep='last', maintain_order=True)
+            frame = frame.join(points_allowed, on=keys, how='left')
+        else:
+            frame = frame.with_columns(pl.lit(None, pl.Int64).alias('points_allowed'))
+        frame = frame.with_columns(pl.col('points_allowed').fill_null(0))
+        
+        columns = [
+            'team', 'team_abbr', 'season', 'week', 'season_type', 'opponent_team',
+            'def_sacks', 'def_sack_yards', 'def_qb_hits', 'def_tackles_for_loss',
+            'def_tackles_for_loss_yards', 'def_interceptions', 'def_interception_yards',
+            'def_passes_defended', 'def_fumbles_forced', 'def_fumbles_recovered',
+            'def_fumble_recovery_yards', 'def_touchdowns', 'def_safeties',
+            'special_teams_tds', 'points_allowed', 'def_penalties', 'def_penalty_yards',
+            'fantasy_points', 'fantasy_points_ppr'
+        ]
         
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        stored_count = 0
-        
-        # Convert Polars DataFrame to list of dicts for iteration
-        for row in team_stats.to_dicts():
-            try:
-                # Extract team abbreviation
-                team = str(row.get('team') or '')
-                team_abbr = str(row.get('team_abbr') or team)
-                season = int(row.get('season') or 0)
-                week = int(row.get('week') or 0)
-                season_type = str(row.get('season_type') or 'REG')
-                
-                # Look up points allowed from schedule
-                points_allowed = 0
-                lookup_key = (team, season, week, season_type)
-                if lookup_key in points_allowed_lookup:
-                    points_allowed = points_allowed_lookup[lookup_key]
-                
-                # Build the values tuple with defensive stats
-                values_tuple = (
-                    team,
-                    team_abbr,
-                    season,
-                    week,
-                    season_type,
-                    str(row.get('opponent_team') or ''),
-                    # Defensive stats
-                    int(row.get('def_sacks') or row.get('sacks') or 0),
-                    float(row.get('def_sack_yards') or row.get('sack_yards') or 0.0),
-                    int(row.get('def_qb_hits') or row.get('qb_hits') or 0),
-                    int(row.get('def_tackles_for_loss') or row.get('tackles_for_loss') or 0),
-                    float(row.get('def_tackles_for_loss_yards') or row.get('tackles_for_loss_yards') or 0.0),
-                    int(row.get('def_interceptions') or row.get('interceptions') or 0),
-                    float(row.get('def_interception_yards') or row.get('interception_yards') or 0.0),
-                    int(row.get('def_passes_defended') or row.get('passes_defended') or row.get('def_pass_defended') or 0),
-                    int(row.get('def_fumbles_forced') or row.get('fumbles_forced') or 0),
-                    int(row.get('def_fumbles_recovered') or row.get('fumbles_recovered') or row.get('fumble_recovery_opp') or 0),
-                    float(row.get('def_fumble_recovery_yards') or row.get('fumble_recovery_yards') or row.get('fumble_recovery_yards_opp') or 0.0),
-                    # Scoring stats
-                    int(row.get('def_touchdowns') or row.get('defensive_touchdowns') or row.get('def_tds') or 0),
-                    int(row.get('def_safeties') or row.get('safeties') or 0),
-                    int(row.get('special_teams_tds') or 0),
-                    # Points allowed (from schedule lookup)
-                    int(points_allowed),
-                    # Additional stats
-                    int(row.get('def_penalties') or row.get('penalties') or 0),
-                    int(row.get('def_penalty_yards') or row.get('penalty_yards') or 0),
-                    # Fantasy points (if available)
-                    float(row.get('fantasy_points') or 0.0),
-                    float(row.get('fantasy_points_ppr') or 0.0)
-                )
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO nfl_team_defense_stats (
-                        team, team_abbr, season, week, season_type, opponent_team,
-                        def_sacks, def_sack_yards, def_qb_hits, def_tackles_for_loss,
-                        def_tackles_for_loss_yards, def_interceptions, def_interception_yards,
-                        def_passes_defended, def_fumbles_forced, def_fumbles_recovered,
-                        def_fumble_recovery_yards, def_touchdowns, def_safeties,
-                        special_teams_tds, points_allowed, def_penalties, def_penalty_yards,
-                        fantasy_points, fantasy_points_ppr
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, values_tuple)
-                stored_count += 1
-            except Exception as e:
-                print(f"⚠ Error storing team defense row for {row.get('team') or 'Unknown'}: {e}")
-                continue
-        
-        conn.commit()
-        conn.close()
+        try:
+            conn.executemany(insert_sql('nfl_team_defense_stats', columns),
+                             frame.select(columns).iter_rows())
+            conn.commit()
+            stored_count = len(frame)
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"✗ Error storing team defense stats: {e}")
+            stored_count = 0
+        finally:
+            conn.close()
         
         print(f"✓ Stored {stored_count} team defense stat records")
         return stored_count
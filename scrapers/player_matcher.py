@@ -0,0 +1,214 @@
+"""
+Player Matcher
+Resolves fantasy player names to nflverse players. Unique NFL players are
+indexed once (exact name, normalized name, last-name blocks, character
+trigrams); each lookup only scores a handful of candidates, with rapidfuzz
+when installed and difflib otherwise.
+"""
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from rapidfuzz import fuzz
+    from rapidfuzz import process as fuzz_process
+except ImportError:
+    fuzz = None
+    fuzz_process = None
+
+
+SUFFIX_PATTERN = re.compile(r'\s+(jr|sr|iii|ii|iv|v)$')
+PUNCTUATION_PATTERN = re.compile(r"[.'’`-]")
+
+# Confidence recorded for each way a name can match
+CONFIDENCE = {
+    'exact': 1.0,
+    'normalized': 0.9,
+    'initial': 0.75,
+}
+
+# Minimum fuzzy similarity (0-1) to accept a candidate; confidence is scaled
+# below the normalized tier so exact/normalized matches always win
+MIN_FUZZY_SCORE = 0.88
+FUZZY_CONFIDENCE_SCALE = 0.85
+MAX_CANDIDATES = 25
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, drop punctuation and generational suffixes ("A.J. Brown Jr." -> "aj brown")"""
+    if not name:
+        return ""
+    name = PUNCTUATION_PATTERN.sub('', name.lower())
+    name = ' '.join(name.split())
+    return SUFFIX_PATTERN.sub('', name).strip()
+
+
+def trigrams(name: str) -> set:
+    """Character trigrams of a normalized name (padded so short names still index)"""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _similarity(a: str, b: str) -> float:
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class PlayerMatcher:
+    """
+    Index of NFL players for fast fantasy-name resolution
+    """
+
+    def __init__(self, players: Iterable[Dict]):
+        """
+        Build the indexes
+
+        Args:
+            players: Player dicts with player_id, player_display_name and
+                optionally player_name, position, team. Earlier entries win
+                when two players share a name (pass most recent first).
+        """
+        self.players: List[Dict] = []
+        self.by_id: Dict[str, int] = {}
+        self.by_exact: Dict[str, int] = {}
+        self.by_normalized: Dict[str, int] = {}
+        self.by_last_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_trigram: Dict[str, List[int]] = defaultdict(list)
+        self.normalized_names: List[str] = []
+
+        seen_ids = set()
+        for player in players:
+            display_name = player.get('player_display_name')
+            if not display_name or player.get('player_id') in seen_ids:
+                continue
+            seen_ids.add(player.get('player_id'))
+
+            idx = len(self.players)
+            self.players.append(player)
+            self.by_id[player.get('player_id')] = idx
+            normalized = normalize_name(display_name)
+            self.normalized_names.append(normalized)
+
+            self.by_exact.setdefault(display_name.lower(), idx)
+            self.by_normalized.setdefault(normalized, idx)
+            if normalized:
+                self.by_last_name[normalized.split()[-1]].append(idx)
+            for gram in trigrams(normalized):
+                self.by_trigram[gram].append(idx)
+
+    @classmethod
+    def from_frame(cls, frame) -> 'PlayerMatcher':
+        """
+        Build from a Polars frame of nflverse rows (one entry per player_id,
+        most recent season first)
+        """
+        team_column = 'team' if 'team' in frame.columns else 'recent_team'
+        columns = [c for c in ('player_id', 'player_name', 'player_display_name', 'position',
+                               team_column, 'season', 'week') if c in frame.columns]
+        frame = frame.select(columns)
+        sort_by = [c for c in ('season', 'week') if c in frame.columns]
+        if sort_by:
+            frame = frame.sort(sort_by, descending=True)
+        frame = frame.unique(subset=['player_id'], keep='first', maintain_order=True)
+
+        players = []
+        for row in frame.iter_rows(named=True):
+            row['team'] = row.pop(team_column, None) or ''
+            players.append(row)
+        return cls(players)
+
+    def __len__(self):
+        return len(self.players)
+
+    def _result(self, idx: int, confidence: float, method: str) -> Dict:
+        player = self.players[idx]
+        return {
+            'player_id': player.get('player_id'),
+            'player_name': player.get('player_name') or player.get('player_display_name'),
+            'player_display_name': player.get('player_display_name'),
+            'position': player.get('position'),
+            'team': player.get('team') or '',
+            'confidence': confidence,
+            'method': method,
+        }
+
+    def get(self, player_id: str, confidence: float = 1.0, method: str = 'id') -> Optional[Dict]:
+        """Look a player up by nflverse player_id"""
+        idx = self.by_id.get(player_id)
+        return None if idx is None else self._result(idx, confidence, method)
+
+    def _candidates(self, normalized: str) -> List[int]:
+        """Same-last-name players plus those sharing the most trigrams"""
+        candidates = set(self.by_last_name.get(normalized.split()[-1], ()))
+
+        overlap = defaultdict(int)
+        for gram in trigrams(normalized):
+            for idx in self.by_trigram.get(gram, ()):
+                overlap[idx] += 1
+        best = sorted(overlap, key=overlap.get, reverse=True)[:MAX_CANDIDATES]
+        candidates.update(best)
+        return list(candidates)
+
+    def match(self, fantasy_name: str) -> Optional[Dict]:
+        """
+        Resolve one fantasy name
+
+        Returns:
+            Player dict with 'confidence' and 'method', or None
+        """
+        if not fantasy_name:
+            return None
+
+        idx = self.by_exact.get(fantasy_name.lower())
+        if idx is not None:
+            return self._result(idx, CONFIDENCE['exact'], 'exact')
+
+        normalized = normalize_name(fantasy_name)
+        if not normalized:
+            return None
+        idx = self.by_normalized.get(normalized)
+        if idx is not None:
+            return self._result(idx, CONFIDENCE['normalized'], 'normalized')
+
+        parts = normalized.split()
+
+        # Abbreviated first name ("D Smith"): unique player with that initial and last name
+        if len(parts) >= 2 and len(parts[0]) == 1:
+            block = [i for i in self.by_last_name.get(parts[-1], ())
+                     if self.normalized_names[i].startswith(parts[0])]
+            if len(block) == 1:
+                return self._result(block[0], CONFIDENCE['initial'], 'initial')
+
+        candidates = self._candidates(normalized)
+        if not candidates:
+            return None
+
+        if fuzz_process is not None:
+            choices = {i: self.normalized_names[i] for i in candidates}
+            best = fuzz_process.extractOne(normalized, choices, scorer=fuzz.ratio)
+            best_idx, score = best[2], best[1] / 100
+        else:
+            best_idx = max(candidates, key=lambda i: _similarity(normalized, self.normalized_names[i]))
+            score = _similarity(normalized, self.normalized_names[best_idx])
+
+        if score < MIN_FUZZY_SCORE:
+            return None
+        return self._result(best_idx, round(score * FUZZY_CONFIDENCE_SCALE, 3), 'fuzzy')
+
+    def match_many(self, fantasy_names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Resolve a batch of names (duplicates and placeholders skipped)
+
+        Returns:
+            Dict of fantasy name -> match for every name that resolved
+        """
+        matches = {}
+        for name in set(fantasy_names):
+            if not name or name.lower() in ('unknown', 'n/a'):
+                continue
+            match = self.match(name)
+            if match:
+                matches[name] = match
+        return matches
@@ -0,0 +1,203 @@
+"""
+Async Sleeper API client
+Same endpoints as SleeperAPIClient, on one pooled httpx.AsyncClient. A token
+bucket keeps the request rate under Sleeper's published limit (stay under
+1000 calls per minute) and a semaphore bounds how many requests are in
+flight, so per-week calls can be gathered instead of sent one by one.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+try:
+    import httpx
+    HAVE_HTTPX = True
+except ImportError:
+    HAVE_HTTPX = False
+
+
+# Defaults leave headroom under the 1000 requests/minute limit
+DEFAULT_RATE_PER_MINUTE = 600
+DEFAULT_BURST = 20
+DEFAULT_MAX_CONCURRENCY = 8
+MAX_RETRIES = 3
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second refill up to `capacity`
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncSleeperAPIClient:
+    """Async client for the Sleeper Fantasy Football API (use as `async with`)"""
+
+    BASE_URL = "https://api.sleeper.app/v1"
+    PROJECTIONS_URL = "https://api.sleeper.com"
+
+    def __init__(self, rate_per_minute: float = DEFAULT_RATE_PER_MINUTE, burst: int = DEFAULT_BURST,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, timeout: float = 30.0,
+                 transport=None, cache=None):
+        """
+        Initialize the client
+
+        Args:
+            rate_per_minute: Sustained request rate
+            burst: Requests allowed back to back before the rate applies
+            max_concurrency: Requests in flight at once (also the pool size)
+            timeout: Per-request timeout in seconds
+            transport: Optional httpx transport (e.g. httpx.MockTransport)
+            cache: Optional ResponseCache shared with the sync client
+        """
+        if not HAVE_HTTPX:
+            raise ImportError("httpx is not installed")
+
+        self.bucket = TokenBucket(rate_per_minute / 60, burst)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            timeout=timeout,
+            transport=transport,
+            limits=httpx.Limits(max_connections=max_concurrency,
+                                max_keepalive_connections=max_concurrency)
+        )
+        self.cache = cache
+        self.requests = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connection pool"""
+        await self.client.aclose()
+
+    async def _get(self, endpoint: str, base_url: Optional[str] = None) -> Optional[Dict]:
+        """Rate-limited GET; fresh cache entries skip the network, 429/5xx are retried"""
+        cached = self.cache.lookup(endpoint) if self.cache else None
+        if cached and cached[1]:
+            return cached[0]
+
+        async with self.semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                await self.bucket.acquire()
+                self.requests += 1
+                try:
+                    response = await self.client.get(f"{base_url or ''}/{endpoint}",
+                                                     headers=cached[2] if cached else None)
+                    if response.status_code == 304 and cached:
+                        return self.cache.refresh(endpoint, cached[0])
+                    if response.status_code == 429 or response.status_code >= 500:
+                        if attempt < MAX_RETRIES:
+                            retry_after = response.headers.get('Retry-After', '')
+                            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else 2 ** attempt)
+                            continue
+                    response.raise_for_status()
+                    body = response.json()
+                    if self.cache:
+                        self.cache.store(endpoint, body, response.headers)
+                    return body
+                except httpx.HTTPError as e:
+                    print(f"✗ API request failed: {endpoint}: {e}")
+                    return None
+        return None
+
+    async def _get_list(self, endpoint: str, base_url: Optional[str] = None) -> List[Dict]:
+        result = await self._get(endpoint, base_url)
+        return result if result else []
+
+    # USER ENDPOINTS
+
+    async def get_user(self, username: str) -> Optional[Dict]:
+        """Get user by username"""
+        return await self._get(f"user/{username}")
+
+    async def get_user_leagues(self, user_id: str, sport: str = "nfl", season: str = "2025") -> List[Dict]:
+        """Get all leagues for a user in a given season"""
+        return await self._get_list(f"user/{user_id}/leagues/{sport}/{season}")
+
+    # LEAGUE ENDPOINTS
+
+    async def get_league(self, league_id: str) -> Optional[Dict]:
+        """Get league details"""
+        return await self._get(f"league/{league_id}")
+
+    async def get_rosters(self, league_id: str) -> List[Dict]:
+        """Get all rosters in a league"""
+        return await self._get_list(f"league/{league_id}/rosters")
+
+    async def get_users(self, league_id: str) -> List[Dict]:
+        """Get all users in a league"""
+        return await self._get_list(f"league/{league_id}/users")
+
+    async def get_matchups(self, league_id: str, week: int) -> List[Dict]:
+        """Get matchups for a specific week"""
+        return await self._get_list(f"league/{league_id}/matchups/{week}")
+
+    async def get_winners_bracket(self, league_id: str) -> List[Dict]:
+        """Get winners bracket for playoffs"""
+        return await self._get_list(f"league/{league_id}/winners_bracket")
+
+    async def get_losers_bracket(self, league_id: str) -> List[Dict]:
+        """Get losers bracket for playoffs"""
+        return await self._get_list(f"league/{league_id}/losers_bracket")
+
+    async def get_transactions(self, league_id: str, round_num: int) -> List[Dict]:
+        """Get transactions for a specific round (week)"""
+        return await self._get_list(f"league/{league_id}/transactions/{round_num}")
+
+    async def get_traded_picks(self, league_id: str) -> List[Dict]:
+        """Get all traded picks in a league"""
+        return await self._get_list(f"league/{league_id}/traded_picks")
+
+    # DRAFT ENDPOINTS
+
+    async def get_drafts_for_league(self, league_id: str) -> List[Dict]:
+        """Get all drafts for a league"""
+        return await self._get_list(f"league/{league_id}/drafts")
+
+    async def get_draft(self, draft_id: str) -> Optional[Dict]:
+        """Get draft details"""
+        return await self._get(f"draft/{draft_id}")
+
+    async def get_draft_picks(self, draft_id: str) -> List[Dict]:
+        """Get all picks in a draft"""
+        return await self._get_list(f"draft/{draft_id}/picks")
+
+    async def get_traded_draft_picks(self, draft_id: str) -> List[Dict]:
+        """Get traded picks in a draft"""
+        return await self._get_list(f"draft/{draft_id}/traded_picks")
+
+    # PROJECTIONS
+
+    async def get_projections(self, season, week: int, season_type: str = "regular") -> List[Dict]:
+        """Get player projections for a week (served from api.sleeper.com)"""
+        return await self._get_list(f"projections/nfl/{season}/{week}?season_type={season_type}",
+                                    self.PROJECTIONS_URL)
+
+    # NFL STATE
+
+    async def get_nfl_state(self) -> Optional[Dict]:
+        """Get current state of the NFL season (current week, season type, etc)"""
+        return await self._get("state/nfl")
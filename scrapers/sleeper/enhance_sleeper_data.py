@@ -1,69 +1,110 @@
 """
 Enhance Sleeper data with player names
-Downloads player mapping from Sleeper API and enriches matchup/draft data
+Downloads player mapping from Sleeper API and enriches matchup/draft data.
+Matchups are streamed week by week, so memory stays flat as the season grows.
 """
-import json
 import os
+import shutil
 import sys
 sys.path.insert(0, '.')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
 
 from sleeper_client import SleeperAPIClient
+from json_stream import load_shell, iter_members, dump_streaming
+from player_crosswalk import refresh_crosswalk
+from player_directory import open_player_directory, DEFAULT_MAX_AGE_HOURS
+from normalization import sleeper_player_name
 import config
 
 
-def load_or_fetch_players():
-    """Load players from cache or fetch from API"""
-    cache_file = os.path.join(config.DATA_DIR, "sleeper_players.json")
-    
-    # Check if we have a recent cache (less than 1 day old)
-    if os.path.exists(cache_file):
-        age_hours = (os.path.getmtime(cache_file) - os.path.getctime(cache_file)) / 3600
-        if age_hours < 24:
-            print("✓ Using cached player data")
-            with open(cache_file, 'r') as f:
-                return json.load(f)
+def load_or_fetch_players(max_age_hours=DEFAULT_MAX_AGE_HOURS, db_path=None, client=None, import_legacy=True):
+    """
+    Open the player directory, downloading it first if it is stale
+    
+    A refresh only rewrites players whose record changed. A legacy
+    sleeper_players.json cache is imported once (dated by its mtime).
+    
+    Args:
+        max_age_hours: Refresh when the directory is older than this
+        db_path: Database holding the directory (default: config.DB_FILE)
+        client: SleeperAPIClient to download with (default: a new one)
+        import_legacy: Import DATA_DIR/sleeper_players.json if present (off for
+            hermetic runs that must only see what `client` serves)
+    
+    Returns:
+        PlayerDirectory (player_id -> full Sleeper record)
+    """
+    players = open_player_directory(db_path or config.DB_FILE)
+    
+    if import_legacy:
+        legacy_file = os.path.join(config.DATA_DIR, "sleeper_players.json")
+        imported = players.import_players_file(legacy_file)
+        if imported:
+            print(f"✓ Imported {imported} players from {legacy_file}")
+    
+    if not players.is_stale(max_age_hours):
+        print(f"✓ Using player directory (refreshed {players.refreshed_at():%Y-%m-%d %H:%M})")
+        return players
     
     # Fetch from API
     print("Fetching player data from Sleeper API (5MB+, this may take a moment)...")
-    client = SleeperAPIClient()
-    players = client.get_all_players()
+    client = client or SleeperAPIClient()
+    directory = client.get_all_players()
     
-    if players:
-        # Save to cache
-        with open(cache_file, 'w') as f:
-            json.dump(players, f)
-        print(f"✓ Cached {len(players)} players")
+    if directory:
+        changed, removed = players.refresh(directory.items())
+        print(f"✓ Player directory refreshed: {changed} changed, {removed} removed "
+              f"({len(directory)} players)")
+        
+        # Keep the Sleeper -> nflverse ID crosswalk in step with the directory
+        print(f"✓ Crosswalked {refresh_crosswalk(players.conn)} players to nflverse IDs")
     
     return players
 
 
 def get_player_name(player_id, players):
     """Get player name from ID"""
-    if not player_id:
-        return "Unknown"
-    
-    # Handle defense teams (like 'DEN', 'KC', etc)
-    if isinstance(player_id, str) and len(player_id) <= 3 and player_id.isupper():
-        return f"{player_id} D/ST"
-    
-    player = players.get(str(player_id), {})
-    if not player:
-        return f"Player {player_id}"
-    
-    first = player.get('first_name', '')
-    last = player.get('last_name', '')
-    pos = player.get('position', '')
-    team = player.get('team', '')
-    
-    name = f"{first} {last}".strip()
-    if not name:
-        name = f"Player {player_id}"
-    
-    if pos and team:
-        return f"{name} ({team} {pos})"
-    elif pos:
-        return f"{name} ({pos})"
-    return name
+    return sleeper_player_name(player_id, players)
+
+
+def enhance_draft_picks(drafts, players):
+    """Add player_name / player_info to every draft pick; returns the number enhanced"""
+    pick_count = 0
+    for draft in drafts:
+        for pick in draft.get('picks', []):
+            player_id = pick.get('player_id')
+            if player_id:
+                pick['player_name'] = get_player_name(player_id, players)
+                pick['player_info'] = players.get(str(player_id), {})
+                pick_count += 1
+    return pick_count
+
+
+def add_player_names(matchup, players):
+    """Add starters_with_names / players_with_names to one raw Sleeper matchup entry"""
+    # Add player names to starters
+    if 'starters' in matchup:
+        matchup['starters_with_names'] = [
+            {
+                'player_id': pid,
+                'player_name': get_player_name(pid, players),
+                'points': matchup.get('players_points', {}).get(pid, 0)
+            }
+            for pid in matchup['starters']
+        ]
+    
+    # Add player names to all players (including bench)
+    if 'players' in matchup:
+        matchup['players_with_names'] = [
+            {
+                'player_id': pid,
+                'player_name': get_player_name(pid, players),
+                'points': matchup.get('players_points', {}).get(pid, 0),
+                'is_starter': pid in matchup.get('starters', [])
+            }
+            for pid in matchup['players']
+        ]
+    return matchup
 
 
 def enhance_sleeper_data(league_id, season="2025"):
@@ -79,9 +120,9 @@ def enhance_sleeper_data(league_id, season="2025"):
         print(f"✗ Sleeper data file not found: {sleeper_file}")
         return
     
-    print(f"\n1. Loading Sleeper data...")
-    with open(sleeper_file, 'r') as f:
-        data = json.load(f)
+    print(f"\n1. Loading Sleeper data (matchups streamed)...")
+    data = load_shell(sleeper_file, streamed=('matchups',))
+    drafts = data.get('drafts', [])
     
     # Load player mapping
     print(f"\n2. Loading player mapping...")
@@ -91,66 +132,31 @@ def enhance_sleeper_data(league_id, season="2025"):
         print("✗ Failed to load players")
         return
     
-    # Enhance matchups
-    print(f"\n3. Enhancing matchups...")
-    matchups = data.get('matchups', {})
-    enhanced_count = 0
-    
-    for week, week_matchups in matchups.items():
-        for matchup in week_matchups:
-            # Add player names to starters
-            if 'starters' in matchup:
-                matchup['starters_with_names'] = [
-                    {
-                        'player_id': pid,
-                        'player_name': get_player_name(pid, players),
-                        'points': matchup.get('players_points', {}).get(pid, 0)
-                    }
-                    for pid in matchup['starters']
-                ]
-            
-            # Add player names to all players (including bench)
-            if 'players' in matchup:
-                matchup['players_with_names'] = [
-                    {
-                        'player_id': pid,
-                        'player_name': get_player_name(pid, players),
-                        'points': matchup.get('players_points', {}).get(pid, 0),
-                        'is_starter': pid in matchup.get('starters', [])
-                    }
-                    for pid in matchup['players']
-                ]
-            
-            enhanced_count += 1
-    
-    print(f"   ✓ Enhanced {enhanced_count} matchups")
-    
     # Enhance draft picks
-    print(f"\n4. Enhancing draft picks...")
-    drafts = data.get('drafts', [])
-    pick_count = 0
+    print(f"\n3. Enhancing draft picks...")
+    pick_count = enhance_draft_picks(drafts, players)
+    print(f"   ✓ Enhanced {pick_count} draft picks")
     
-    for draft in drafts:
-        for pick in draft.get('picks', []):
-            player_id = pick.get('player_id')
-            if player_id:
-                pick['player_name'] = get_player_name(player_id, players)
-                pick['player_info'] = players.get(str(player_id), {})
-                pick_count += 1
+    # Enhance matchups one week at a time while writing the output
+    print(f"\n4. Enhancing matchups and saving...")
+    enhanced_count = 0
     
-    print(f"   ✓ Enhanced {pick_count} draft picks")
+    def enhanced_weeks():
+        nonlocal enhanced_count
+        for week, week_matchups in iter_members(sleeper_file, 'matchups'):
+            for matchup in week_matchups:
+                add_player_names(matchup, players)
+                enhanced_count += 1
+            yield week, week_matchups
     
-    # Save enhanced data
-    print(f"\n5. Saving enhanced data...")
     enhanced_file = sleeper_file.replace('.json', '_enhanced.json')
-    with open(enhanced_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    dump_streaming(enhanced_file, data, {'matchups': enhanced_weeks()})
     
+    print(f"   ✓ Enhanced {enhanced_count} matchups")
     print(f"   ✓ Saved to: {enhanced_file}")
     
     # Also update original file
-    with open(sleeper_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    shutil.copyfile(enhanced_file, sleeper_file)
     
     print(f"   ✓ Updated: {sleeper_file}")
     
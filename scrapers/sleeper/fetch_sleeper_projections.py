@@ -1,28 +1,52 @@
 """
 Fetch player projections from Sleeper API and merge into existing 2025 data
+Weeks are fetched concurrently (async client + HTTP cache when httpx is
+installed) into one index keyed by (week, player_id), so merging is a dict
+lookup per rostered player. Projections are merged into the season file
+(rewritten week by week, see scripts/json_stream.py) or, with --db, written
+straight to matchup_rosters.projected.
+
+Usage: python fetch_sleeper_projections.py [--db] [--missing-only] [--compact]
 """
-import json
+import argparse
+import asyncio
 import os
+import sqlite3
 import sys
 import time
+from typing import Dict, Iterable, List, Set, Tuple
+
 import requests
-from collections import defaultdict
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
 import config
+from async_sleeper_client import AsyncSleeperAPIClient, HAVE_HTTPX
+from response_cache import ResponseCache
+from json_stream import load_shell, iter_members, dump_streaming
+from migrations import ensure_schema
+
+# League scoring is Half PPR
+PROJECTION_FIELD = 'pts_half_ppr'
+
+# Pause between calls when httpx is missing and weeks are fetched one by one
+SYNC_REQUEST_DELAY = 0.5
+
+ProjectionIndex = Dict[Tuple[int, str], float]
+
 
-def fetch_weekly_projections(season, week, season_type='regular'):
+def fetch_weekly_projections(season, week, season_type='regular', session=None):
     """
     Fetch projections for a specific week
     URL: https://api.sleeper.com/projections/nfl/{season}/{week}?season_type={season_type}
     """
     url = f"https://api.sleeper.com/projections/nfl/{season}/{week}"
     params = {'season_type': season_type}
-    
+
     print(f"Fetching projections for {season} Week {week}...")
-    
+
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = (session or requests).get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         print(f"  ✓ Fetched {len(data)} player projections")
@@ -32,117 +56,206 @@ def fetch_weekly_projections(season, week, season_type='regular'):
         return []
 
 
-def fetch_all_projections(season, weeks, season_type='regular'):
+async def _fetch_projections_async(season, weeks: List[int], season_type, cache, async_options) -> List[List]:
+    async with AsyncSleeperAPIClient(cache=cache, **async_options) as client:
+        # The NFL state tells the cache which weeks' projections are final
+        await client.get_nfl_state()
+        return await asyncio.gather(*(client.get_projections(season, week, season_type) for week in weeks))
+
+
+def index_projections(week, projections: Iterable[Dict], index: ProjectionIndex) -> int:
+    """Add one week's raw projections to the (week, player_id) -> points index"""
+    count = 0
+    for proj in projections:
+        player_id = proj.get('player_id')
+        if player_id:
+            index[(int(week), player_id)] = (proj.get('stats') or {}).get(PROJECTION_FIELD, 0)
+            count += 1
+    return count
+
+
+def fetch_all_projections(season, weeks, season_type='regular', use_cache=True, session=None,
+                          **async_options) -> ProjectionIndex:
     """
-    Fetch projections for all weeks in a season
-    Returns: dict of {week: {player_id: projection_data}}
+    Fetch projections for the given weeks
+    session / async_options go to the sync fallback / AsyncSleeperAPIClient
+    Returns: dict of {(week, player_id): projected points}
     """
-    all_projections = {}
-    
-    for week in weeks:
-        projections = fetch_weekly_projections(season, week, season_type)
-        
-        # Convert list to dict keyed by player_id
-        week_projections = {}
-        for proj in projections:
-            player_id = proj.get('player_id')
-            if player_id:
-                # Extract the projected points (using Half PPR scoring)
-                stats = proj.get('stats', {})
-                week_projections[player_id] = {
-                    'pts_half_ppr': stats.get('pts_half_ppr', 0),
-                    'pts_ppr': stats.get('pts_ppr', 0),
-                    'pts_std': stats.get('pts_std', 0),
-                    'stats': stats
-                }
-        
-        all_projections[str(week)] = week_projections
-        time.sleep(0.5)  # Rate limiting
-    
-    return all_projections
-
-
-def merge_projections_into_matchups(data_file, projections):
+    weeks = list(weeks)
+    start = time.perf_counter()
+
+    if HAVE_HTTPX:
+        cache = ResponseCache() if use_cache else None
+        responses = asyncio.run(_fetch_projections_async(season, weeks, season_type, cache, async_options))
+        if cache:
+            print(f"  ✓ {cache.report()}")
+            cache.close()
+    else:
+        responses = []
+        for week in weeks:
+            responses.append(fetch_weekly_projections(season, week, season_type, session))
+            time.sleep(SYNC_REQUEST_DELAY)  # Rate limiting
+
+    index = {}
+    for week, projections in zip(weeks, responses):
+        if not index_projections(week, projections, index):
+            print(f"  ⚠ No projections returned for week {week}")
+
+    print(f"  ✓ Fetched {len(index)} player projections for {len(weeks)} weeks "
+          f"in {time.perf_counter() - start:.1f}s")
+    return index
+
+
+def json_projection_weeks(data_file) -> Tuple[List[int], Set[int]]:
+    """Weeks in a season file, and the ones that already have projections"""
+    weeks, projected = [], set()
+    for week, week_matchups in iter_members(data_file, 'matchups'):
+        weeks.append(int(week))
+        if any(player.get('projected')
+               for matchup in week_matchups for player in matchup.get('players_with_names', [])):
+            projected.add(int(week))
+    return sorted(weeks), projected
+
+
+def db_projection_weeks(conn, season) -> Tuple[List[int], Set[int]]:
+    """Sleeper weeks of a season in the database, and the ones that already have projections"""
+    cursor = conn.execute("""
+        SELECT r.week, MAX(COALESCE(r.projected, 0)) FROM matchup_rosters r
+        WHERE r.season_year = ?
+          AND r.league_id IN (SELECT league_id FROM matchups WHERE data_source = 'sleeper' AND season_year = ?)
+        GROUP BY r.week
+    """, (season, season))
+    rows = cursor.fetchall()
+    return sorted(row[0] for row in rows), {row[0] for row in rows if row[1]}
+
+
+def merge_projections_into_matchups(data_file, projections: ProjectionIndex, compact=False):
     """
     Merge projection data into the existing Sleeper matchup data
     """
-    print(f"\nLoading {data_file}...")
-    with open(data_file, 'r') as f:
-        data = json.load(f)
-    
-    matchups = data.get('matchups', {})
+    print(f"\nStreaming {data_file}...")
+    data = load_shell(data_file, streamed=('matchups',))
+    fetched_weeks = {week for week, _ in projections}
     updated_count = 0
-    
-    for week, week_matchups in matchups.items():
-        week_projections = projections.get(week, {})
-        
-        if not week_projections:
-            print(f"  No projections for week {week}")
-            continue
-        
-        print(f"\n  Processing Week {week}...")
-        week_updated = 0
-        
-        for matchup in week_matchups:
-            # Update projections for all players in matchup
-            if 'players_with_names' in matchup:
-                for player in matchup['players_with_names']:
-                    player_id = player.get('player_id')
-                    if player_id and player_id in week_projections:
-                        # Use pts_half_ppr for projections (Half PPR scoring)
-                        player['projected'] = week_projections[player_id]['pts_half_ppr']
+
+    def merged_weeks():
+        nonlocal updated_count
+        for week, week_matchups in iter_members(data_file, 'matchups'):
+            week_num = int(week)
+            if week_num not in fetched_weeks:
+                yield week, week_matchups
+                continue
+
+            week_updated = 0
+            for matchup in week_matchups:
+                # Update projections for all players in matchup
+                for player in matchup.get('players_with_names', []):
+                    projected = projections.get((week_num, player.get('player_id')))
+                    if projected is not None:
+                        player['projected'] = projected
                         week_updated += 1
-        
-        updated_count += week_updated
-        print(f"    ✓ Updated {week_updated} player projections")
-    
-    # Save updated data
+
+            updated_count += week_updated
+            print(f"  ✓ Week {week}: updated {week_updated} player projections")
+            yield week, week_matchups
+
+    # Save updated data (written as each week is merged)
+    dump_streaming(data_file, data, {'matchups': merged_weeks()}, compact=compact)
+
     print(f"\n✓ Total projections merged: {updated_count}")
-    print(f"Saving to {data_file}...")
-    
-    with open(data_file, 'w') as f:
-        json.dump(data, f, indent=2)
-    
     print(f"✓ Done! Updated {data_file}")
 
 
+def write_projections_to_db(conn, season, projections: ProjectionIndex) -> int:
+    """
+    Set matchup_rosters.projected for a season's Sleeper rows and re-total
+    the matchups' projected scores (started players only)
+
+    Returns:
+        Number of roster rows updated
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT r.id, r.week, r.player_id FROM matchup_rosters r
+        WHERE r.season_year = ? AND r.player_id IS NOT NULL
+          AND r.league_id IN (SELECT league_id FROM matchups WHERE data_source = 'sleeper' AND season_year = ?)
+    """, (season, season))
+    updates = [
+        (projections[(week, player_id)], row_id)
+        for row_id, week, player_id in cursor.fetchall()
+        if (week, player_id) in projections
+    ]
+    cursor.executemany("UPDATE matchup_rosters SET projected = ? WHERE id = ?", updates)
+
+    weeks = sorted({week for week, _ in projections})
+    for side in ('home', 'away'):
+        cursor.execute(f"""
+            UPDATE matchups SET {side}_projected = (
+                SELECT COALESCE(SUM(r.projected), 0) FROM matchup_rosters r
+                WHERE r.league_id = matchups.league_id AND r.season_year = matchups.season_year
+                  AND r.week = matchups.week AND r.matchup_id = matchups.matchup_id
+                  AND r.team_name = matchups.{side}_team AND r.started
+            )
+            WHERE data_source = 'sleeper' AND season_year = ?
+              AND week IN ({','.join('?' * len(weeks))})
+        """, (season, *weeks))
+    conn.commit()
+    return len(updates)
+
+
 def main():
-    # Configuration
-    season = 2025
-    league_id = '1257893653083332608'
-    data_file = os.path.join(config.DATA_DIR, f'sleeper_{league_id}_{season}.json')
-    
-    # Determine how many weeks we have in the data
-    with open(data_file, 'r') as f:
-        data = json.load(f)
-    
-    matchup_weeks = sorted([int(w) for w in data.get('matchups', {}).keys()])
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--league', default='1257893653083332608', help="Sleeper league ID (season file name)")
+    parser.add_argument('--db', action='store_true', help="Write to matchup_rosters.projected instead of the JSON file")
+    parser.add_argument('--missing-only', action='store_true', help="Only fetch weeks without projections")
+    parser.add_argument('--compact', action='store_true', help="Write the season file without indentation")
+    args = parser.parse_args()
+
+    # Determine which weeks we have (and which already have projections)
+    if args.db:
+        ensure_schema(config.DB_FILE)
+        conn = sqlite3.connect(config.DB_FILE)
+        matchup_weeks, projected_weeks = db_projection_weeks(conn, args.season)
+    else:
+        data_file = os.path.join(config.DATA_DIR, f'sleeper_{args.league}_{args.season}.json')
+        matchup_weeks, projected_weeks = json_projection_weeks(data_file)
     print(f"Found matchup data for weeks: {matchup_weeks}")
-    
+
     if not matchup_weeks:
         print("No matchups found in data!")
         return
-    
-    # Fetch projections for all weeks
-    print(f"\nFetching projections for {season} season...")
+
+    weeks = [week for week in matchup_weeks if week not in projected_weeks] if args.missing_only else matchup_weeks
+    if not weeks:
+        print("✓ Every week already has projections")
+        return
+
+    # Fetch projections for the selected weeks
+    print(f"\nFetching projections for {args.season} weeks {weeks}...")
     print("="*80)
-    
-    projections = fetch_all_projections(season, matchup_weeks, season_type='regular')
-    
+
+    projections = fetch_all_projections(args.season, weeks, season_type='regular')
+
     # Merge projections into matchup data
     print("\n" + "="*80)
     print("MERGING PROJECTIONS INTO MATCHUP DATA")
     print("="*80)
-    
-    merge_projections_into_matchups(data_file, projections)
-    
+
+    if args.db:
+        updated = write_projections_to_db(conn, args.season, projections)
+        conn.close()
+        print(f"\n✓ Updated {updated} player projections in {config.DB_FILE}")
+    else:
+        merge_projections_into_matchups(data_file, projections, compact=args.compact)
+
     print("\n" + "="*80)
     print("✓ ALL DONE!")
     print("="*80)
     print("\nProjections have been added to your matchup data.")
-    print("Restart the Flask app to see the updated projections.")
+    if not args.db:
+        print("Restart the Flask app to see the updated projections.")
 
 
 if __name__ == "__main__":
     main()
-
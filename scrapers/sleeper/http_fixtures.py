@@ -0,0 +1,206 @@
+"""
+HTTP fixtures for offline runs
+Records real API responses into a fixture directory and replays them, so the
+scrape -> normalize -> ingest pipeline can be benchmarked and regression
+tested without the network (see scripts/benchmark_pipeline.py).
+
+Both HTTP stacks are covered: a requests adapter for SleeperAPIClient and the
+projections fallback, and an httpx transport for AsyncSleeperAPIClient.
+Replay can add a fixed (plus seeded random) delay per request to model
+network latency. nflverse data is recorded as the NFLDataCache Parquet files
+under the same directory and replayed through its offline mode.
+
+Layout: {directory}/http/{sha1 of method + URL}.json, {directory}/nflverse/*.parquet
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    HAVE_HTTPX = True
+except ImportError:
+    HAVE_HTTPX = False
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# Kept with each response (bodies are stored decoded, so no encoding/length headers)
+KEPT_HEADERS = ('content-type', 'etag', 'last-modified', 'cache-control', 'expires')
+
+
+class FixtureMissing(LookupError):
+    """Raised on replay when a request was never recorded"""
+
+
+def request_key(method: str, url: str) -> str:
+    """Method and URL with the query string sorted (parameter order doesn't matter)"""
+    parts = urlsplit(str(url))
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return f"{method.upper()} {parts.netloc}{parts.path}{'?' + query if query else ''}"
+
+
+class FixtureStore:
+    """Recorded responses in a directory, one JSON file per request"""
+
+    def __init__(self, directory: str, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        """
+        Open (or create) a fixture directory
+
+        Args:
+            directory: Fixture directory
+            latency: Seconds added to every replayed request
+            jitter: Up to this many extra seconds per request (seeded, so runs repeat)
+            seed: Seed for the jitter
+        """
+        self.directory = directory
+        self.http_dir = os.path.join(directory, 'http')
+        self.nfl_dir = os.path.join(directory, 'nflverse')
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.recorded = 0
+        self.replayed = 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.http_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def save(self, method: str, url: str, status: int, headers, body: bytes):
+        """Store one response (overwrites an earlier recording of the same request)"""
+        os.makedirs(self.http_dir, exist_ok=True)
+        key = request_key(method, url)
+        fixture = {
+            'request': key,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() in KEPT_HEADERS},
+            'body': body.decode('utf-8'),
+        }
+        tmp = self.path(key) + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f)
+        os.replace(tmp, self.path(key))
+        self.recorded += 1
+
+    def load(self, method: str, url: str) -> Dict:
+        """The recorded response for a request (raises FixtureMissing)"""
+        key = request_key(method, url)
+        try:
+            with open(self.path(key), encoding='utf-8') as f:
+                fixture = json.load(f)
+        except FileNotFoundError:
+            raise FixtureMissing(f"No recorded response for {key} in {self.directory}") from None
+        self.replayed += 1
+        return fixture
+
+    def delay(self) -> float:
+        """Seconds to wait before serving one replayed response"""
+        return self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def __len__(self) -> int:
+        return len([name for name in os.listdir(self.http_dir) if name.endswith('.json')]) \
+            if os.path.isdir(self.http_dir) else 0
+
+    def nfl_cache(self, replay: bool):
+        """NFLDataCache over the fixture's Parquet files (offline when replaying)"""
+        from scrapers.nfl_data_cache import NFLDataCache
+        return NFLDataCache(cache_dir=self.nfl_dir, offline=replay)
+
+
+# REQUESTS (SleeperAPIClient, projections fallback)
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests as usual and stores every 2xx response"""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if 200 <= response.status_code < 300:
+            self.store.save(request.method, request.url, response.status_code,
+                            response.headers, response.content)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Serves recorded responses without touching the network"""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        fixture = self.store.load(request.method, request.url)
+        delay = self.store.delay()
+        if delay:
+            time.sleep(delay)
+        response = requests.Response()
+        response.status_code = fixture['status']
+        response.headers.update(fixture['headers'])
+        response._content = fixture['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def fixture_session(store: FixtureStore, mode: str) -> requests.Session:
+    """A requests.Session that records to or replays from `store`"""
+    session = requests.Session()
+    adapter = RecordingAdapter(store) if mode == RECORD else ReplayAdapter(store)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# HTTPX (AsyncSleeperAPIClient)
+
+if HAVE_HTTPX:
+    class RecordingTransport(httpx.AsyncBaseTransport):
+        """Sends requests through a real transport and stores every 2xx response"""
+
+        def __init__(self, store: FixtureStore, transport: Optional[httpx.AsyncBaseTransport] = None):
+            self.store = store
+            self.transport = transport or httpx.AsyncHTTPTransport()
+
+        async def handle_async_request(self, request):
+            response = await self.transport.handle_async_request(request)
+            body = await response.aread()
+            if 200 <= response.status_code < 300:
+                self.store.save(request.method, request.url, response.status_code, response.headers, body)
+            headers = [(name, value) for name, value in response.headers.items()
+                       if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+            return httpx.Response(response.status_code, headers=headers, content=body)
+
+        async def aclose(self):
+            await self.transport.aclose()
+
+    class ReplayTransport(httpx.AsyncBaseTransport):
+        """Serves recorded responses without touching the network"""
+
+        def __init__(self, store: FixtureStore):
+            self.store = store
+
+        async def handle_async_request(self, request):
+            fixture = self.store.load(request.method, request.url)
+            delay = self.store.delay()
+            if delay:
+                await asyncio.sleep(delay)
+            return httpx.Response(fixture['status'], headers=fixture['headers'],
+                                  content=fixture['body'].encode('utf-8'))
+
+
+def fixture_transport(store: FixtureStore, mode: str):
+    """An httpx transport that records to or replays from `store` (None without httpx)"""
+    if not HAVE_HTTPX:
+        return None
+    return RecordingTransport(store) if mode == RECORD else ReplayTransport(store)
@@ -0,0 +1,181 @@
+"""
+Multi-league Sleeper scheduler
+Discovers every league a user is in for a season, plus each league's dynasty
+history (the previous_league_id chain), and syncs them all concurrently
+through one async client (one connection pool and rate limiter), one HTTP
+cache and one player directory. Every league-season is written under its own
+league_id by a single writer connection; derived tables are rebuilt once at
+the end.
+
+Usage: python league_scheduler.py [--user USERNAME] [--league ID ...] [--season 2025]
+                                  [--no-history] [--max-leagues 4] [--full]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from async_sleeper_client import AsyncSleeperAPIClient, HAVE_HTTPX
+from response_cache import ResponseCache
+from enhance_sleeper_data import load_or_fetch_players
+from sleeper_sync import sync_league_async, open_sync_connection, refresh_derived
+from migrations import ensure_schema
+import config
+
+# League-seasons synced at once (requests are bounded separately by the client)
+DEFAULT_MAX_LEAGUES = 4
+
+NO_PREVIOUS_LEAGUE = (None, '', '0')
+
+
+async def discover_leagues(client, username: Optional[str] = None, league_ids: Iterable[str] = (),
+                           season: str = "2025", history: bool = True) -> List[Dict]:
+    """
+    A user's leagues for a season and, optionally, every earlier season of each
+
+    History chains are followed one level at a time, each level fetched
+    concurrently; a league reachable from two chains is fetched once.
+
+    Args:
+        client: Open AsyncSleeperAPIClient
+        username: Sleeper username whose leagues to include
+        league_ids: Extra league IDs to include
+        season: Season to list the user's leagues for
+        history: Follow previous_league_id back to the first season
+
+    Returns:
+        League responses, newest seasons first
+    """
+    seeds = list(league_ids)
+    if username:
+        user = await client.get_user(username)
+        if user:
+            leagues = await client.get_user_leagues(user['user_id'], "nfl", season)
+            print(f"✓ {username}: {len(leagues)} league(s) in {season}")
+            seeds += [league['league_id'] for league in leagues]
+        else:
+            print(f"✗ Sleeper user not found: {username}")
+
+    found, seen = [], set()
+    frontier = list(dict.fromkeys(seeds))
+    while frontier:
+        seen.update(frontier)
+        responses = await asyncio.gather(*(client.get_league(league_id) for league_id in frontier))
+        next_frontier = []
+        for league_id, league in zip(frontier, responses):
+            if not league:
+                print(f"⚠ League {league_id} not found, skipped")
+                continue
+            found.append(league)
+            previous = league.get('previous_league_id')
+            if history and previous not in NO_PREVIOUS_LEAGUE and previous not in seen:
+                next_frontier.append(previous)
+        frontier = list(dict.fromkeys(next_frontier))
+    return found
+
+
+async def _sync_all(client, leagues: List[Dict], players, conn, full: bool,
+                    max_leagues: int) -> List[Tuple[List[Tuple[int, int]], bool]]:
+    nfl_state = await client.get_nfl_state() or {}
+    limit = asyncio.Semaphore(max_leagues)
+
+    async def sync_one(league):
+        async with limit:
+            try:
+                return await sync_league_async(client, league, players, conn, nfl_state, full)
+            except Exception as e:
+                # One broken league must not stop the others
+                print(f"✗ {league.get('name')} {league.get('season')} ({league.get('league_id')}): {e}")
+                return [], False
+
+    return await asyncio.gather(*(sync_one(league) for league in leagues))
+
+
+async def _run(username, league_ids, season, history, conn, players, full, max_leagues, cache, async_options):
+    async with AsyncSleeperAPIClient(cache=cache, **async_options) as client:
+        leagues = await discover_leagues(client, username, league_ids, season, history)
+        print(f"✓ Scheduling {len(leagues)} league-season(s): " +
+              ", ".join(f"{league.get('name')} {league.get('season')}" for league in leagues))
+        results = await _sync_all(client, leagues, players, conn, full, max_leagues)
+        return leagues, results, client.requests
+
+
+def run_scheduler(username: Optional[str] = None, league_ids: Iterable[str] = (), season: str = "2025",
+                  history: bool = True, db_path: Optional[str] = None, full: bool = False,
+                  max_leagues: int = DEFAULT_MAX_LEAGUES, use_cache: bool = True,
+                  **async_options) -> List[Tuple[int, int]]:
+    """
+    Discover and sync every league for a user (and/or explicit league IDs)
+
+    Args:
+        username: Sleeper username whose leagues to sync
+        league_ids: Extra league IDs to sync
+        season: Season to discover the user's leagues in
+        history: Also sync each league's earlier seasons
+        db_path: SQLite database (default: config.DB_FILE)
+        full: Ignore stored hashes and reload every week
+        max_leagues: League-seasons synced at once
+        use_cache: Go through the on-disk HTTP response cache
+        **async_options: AsyncSleeperAPIClient settings (rate_per_minute, burst, max_concurrency)
+
+    Returns:
+        Every (season_year, week) slice that was reloaded
+    """
+    if not HAVE_HTTPX:
+        print("✗ The league scheduler needs httpx (pip install httpx); "
+              "use sleeper_sync.py to sync one league at a time")
+        return []
+
+    start = time.perf_counter()
+    db_path = db_path or config.DB_FILE
+    applied = ensure_schema(db_path)
+    if applied:
+        print(f"✓ Applied {applied} migrations to {db_path}")
+
+    cache = ResponseCache() if use_cache else None
+    players = load_or_fetch_players(db_path=db_path)
+    conn = open_sync_connection(db_path)
+    try:
+        leagues, results, requests = asyncio.run(_run(
+            username, league_ids, season, history, conn, players, full, max_leagues, cache, async_options
+        ))
+    finally:
+        conn.close()
+
+    reloaded = sorted({slice_ for slices, _ in results for slice_ in slices})
+    refresh_derived(db_path, reloaded, any(season_changed for _, season_changed in results))
+
+    print(f"\n✓ Synced {len(leagues)} league-season(s), {len(reloaded)} season-weeks reloaded, "
+          f"{requests} API requests")
+    if cache:
+        print(f"✓ {cache.report()}")
+        cache.close()
+    print(f"✓ Done in {time.perf_counter() - start:.1f}s")
+    return reloaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user', help="Sleeper username whose leagues to sync")
+    parser.add_argument('--league', action='append', default=[], help="League ID to sync (repeatable)")
+    parser.add_argument('--season', default="2025")
+    parser.add_argument('--no-history', action='store_true', help="Skip previous seasons (previous_league_id)")
+    parser.add_argument('--max-leagues', type=int, default=DEFAULT_MAX_LEAGUES)
+    parser.add_argument('--full', action='store_true', help="Reload every week, ignoring stored hashes")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the HTTP response cache")
+    args = parser.parse_args()
+
+    if not args.user and not args.league:
+        parser.error("give --user and/or --league")
+
+    run_scheduler(args.user, args.league, args.season, history=not args.no_history, full=args.full,
+                  max_leagues=args.max_leagues, use_cache=not args.no_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Live game-day scoring
+Polls the current week's Sleeper matchups and keeps matchups.home/away_score
+and matchup_rosters.points current while games are on. Each poll is diffed
+against the last snapshot and only the points that moved are written, in one
+short WAL transaction, so the API's readers never wait on it.
+
+Cadence adapts to what is happening: every LIVE_INTERVAL while scores move
+or a game window is open, backing off to WINDOW_IDLE_INTERVAL once a window
+goes quiet and to IDLE_INTERVAL outside the windows. One matchups request per
+poll (plus state/nfl every STATE_INTERVAL) stays far below Sleeper's
+1000 requests/minute.
+
+Lineup changes and a new week are handed to sleeper_sync, which loads the
+week's full structure; the sync that runs after the games replaces the live
+rows with the final ones (their hashes no longer match).
+
+Usage: python live_scores.py [--league LEAGUE_ID] [--once]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from sleeper_client import SleeperAPIClient
+from sleeper_sync import sync_league, open_sync_connection, DEFAULT_LEAGUE_ID
+from normalization import normalize_season
+from migrations import ensure_schema
+import config
+
+try:
+    from zoneinfo import ZoneInfo
+    EASTERN = ZoneInfo("America/New_York")
+except Exception:  # no tz database: kickoff times are close enough on EST
+    EASTERN = timezone(timedelta(hours=-5))
+
+# Seconds between polls
+LIVE_INTERVAL = 30          # scores moving, or inside a game window
+WINDOW_IDLE_INTERVAL = 120  # inside a window but nothing moved for QUIET_POLLS polls
+IDLE_INTERVAL = 900         # outside every game window
+STATE_INTERVAL = 600        # state/nfl (current week / season type) refresh
+QUIET_POLLS = 10
+
+# NFL game windows, US Eastern: (weekday Mon=0, first hour, last hour exclusive)
+GAME_WINDOWS = (
+    (3, 20, 24),  # Thursday night
+    (5, 13, 24),  # Saturday (late season)
+    (6, 9, 24),   # Sunday, London kickoffs through Sunday night
+    (0, 0, 1),    # Sunday night games running past midnight
+    (0, 19, 24),  # Monday night
+)
+
+# (team_name, player_id) -> points, (matchup_id, team_name) -> score
+PlayerPoints = Dict[Tuple[str, str], float]
+TeamScores = Dict[Tuple[str, str], float]
+
+
+def in_game_window(now: Optional[datetime] = None) -> bool:
+    """True when an NFL game can be in progress"""
+    now = (now or datetime.now(timezone.utc)).astimezone(EASTERN)
+    return any(now.weekday() == day and start <= now.hour < end for day, start, end in GAME_WINDOWS)
+
+
+def next_interval(quiet_polls: int, now: Optional[datetime] = None) -> int:
+    """Seconds until the next poll, given how many polls in a row changed nothing"""
+    if quiet_polls == 0:
+        return LIVE_INTERVAL
+    if in_game_window(now):
+        return LIVE_INTERVAL if quiet_polls < QUIET_POLLS else WINDOW_IDLE_INTERVAL
+    return IDLE_INTERVAL
+
+
+def live_points(matchups: List[Dict], roster_to_team: Dict) -> Tuple[TeamScores, PlayerPoints]:
+    """Team scores and per-player points from a raw Sleeper matchups response"""
+    scores, points = {}, {}
+    for entry in matchups:
+        if entry.get('matchup_id') is None:
+            continue  # Bye / consolation rosters are not stored
+        team = roster_to_team.get(entry.get('roster_id'), f"Team {entry.get('roster_id')}")
+        scores[(str(entry['matchup_id']), team)] = entry.get('points') or 0
+        players_points = entry.get('players_points') or {}
+        for player_id in entry.get('players') or []:
+            points[(team, player_id)] = players_points.get(player_id, 0)
+    return scores, points
+
+
+def lineups(matchups: List[Dict]) -> frozenset:
+    """Who is on each roster and who starts (changes need the week re-synced)"""
+    return frozenset(
+        (entry.get('roster_id'), entry.get('matchup_id'),
+         frozenset(entry.get('players') or ()), frozenset(entry.get('starters') or ()))
+        for entry in matchups
+    )
+
+
+def stored_points(conn, league_id, season_year, week) -> Tuple[TeamScores, PlayerPoints]:
+    """The same snapshot as live_points, read back from the database"""
+    scores = {}
+    for matchup_id, home, home_score, away, away_score in conn.execute("""
+        SELECT matchup_id, home_team, home_score, away_team, away_score FROM matchups
+        WHERE league_id = ? AND season_year = ? AND week = ?
+    """, (league_id, season_year, week)):
+        scores[(str(matchup_id), home)] = home_score
+        scores[(str(matchup_id), away)] = away_score
+    points = {
+        (team, player_id): player_points
+        for team, player_id, player_points in conn.execute("""
+            SELECT team_name, player_id, points FROM matchup_rosters
+            WHERE league_id = ? AND season_year = ? AND week = ? AND player_id IS NOT NULL
+        """, (league_id, season_year, week))
+    }
+    return scores, points
+
+
+class LiveScorePoller:
+    """Keeps one league's current week in the database up to date during games"""
+
+    def __init__(self, league_id: str = DEFAULT_LEAGUE_ID, db_path: Optional[str] = None):
+        """
+        Initialize the poller
+
+        Args:
+            league_id: Sleeper league ID
+            db_path: SQLite database (default: config.DB_FILE)
+        """
+        self.league_id = league_id
+        self.db_path = db_path or config.DB_FILE
+        ensure_schema(self.db_path)
+        # Live data is never served from the response cache
+        self.client = SleeperAPIClient()
+        self.conn = open_sync_connection(self.db_path)
+
+        self.nfl_state = {}
+        self.state_checked = 0.0
+        self.season_year = None
+        self.week = None
+        self.roster_to_team = {}
+        self.scores, self.points = {}, {}
+        self.lineups = None
+        self.requests = 0
+
+    def close(self):
+        self.conn.close()
+
+    def _refresh_state(self) -> bool:
+        """Re-read state/nfl when due; True when the scoring week changed"""
+        if self.week is not None and time.monotonic() - self.state_checked < STATE_INTERVAL:
+            return False
+        self.state_checked = time.monotonic()
+        self.nfl_state = self.client.get_nfl_state() or self.nfl_state
+        self.requests += 1
+        week = self.nfl_state.get('week')
+        return bool(week) and (int(week), str(self.nfl_state.get('season'))) != (self.week, str(self.season_year))
+
+    def _load_week(self):
+        """Sync the week's structure, then snapshot what the database holds"""
+        sync_league(self.league_id, self.db_path, use_cache=False)
+        league = self.client.get_league(self.league_id) or {}
+        season_data = normalize_season({
+            'league': league,
+            'users': self.client.get_users(self.league_id),
+            'rosters': self.client.get_rosters(self.league_id),
+            'season': str(league.get('season'))
+        }, 'sleeper')
+        self.requests += 3
+
+        self.season_year = season_data['season_year']
+        self.week = int(self.nfl_state.get('week') or 0)
+        self.roster_to_team = {s['roster_id']: s['team_name'] for s in season_data['standings']}
+        self.scores, self.points = stored_points(self.conn, self.league_id, self.season_year, self.week)
+        self.lineups = None
+        print(f"✓ Watching {league.get('name')} {self.season_year} week {self.week} "
+              f"({len(self.scores)} teams, {len(self.points)} players)")
+
+    def write_changes(self, scores: TeamScores, points: PlayerPoints) -> int:
+        """
+        Write the scores and points that differ from the snapshot (one transaction)
+
+        Returns:
+            Number of rows updated
+        """
+        key = (self.league_id, self.season_year, self.week)
+        score_updates = [(score, *key, matchup_id, team)
+                         for (matchup_id, team), score in scores.items()
+                         if self.scores.get((matchup_id, team)) != score]
+        point_updates = [(player_points, *key, team, player_id)
+                         for (team, player_id), player_points in points.items()
+                         if self.points.get((team, player_id)) != player_points]
+        if not score_updates and not point_updates:
+            return 0
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for side in ('home', 'away'):
+                self.conn.executemany(f"""
+                    UPDATE matchups SET {side}_score = ?
+                    WHERE league_id = ? AND season_year = ? AND week = ? AND matchup_id = ? AND {side}_team = ?
+                """, score_updates)
+            self.conn.executemany("""
+                UPDATE matchup_rosters SET points = ?
+                WHERE league_id = ? AND season_year = ? AND week = ? AND team_name = ? AND player_id = ?
+            """, point_updates)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        self.scores.update(scores)
+        self.points.update(points)
+        return len(score_updates) + len(point_updates)
+
+    def poll(self) -> int:
+        """
+        One poll of the current week
+
+        Returns:
+            Number of rows updated
+        """
+        if self._refresh_state():
+            self._load_week()
+        if not self.week:
+            return 0
+
+        matchups = self.client.get_matchups(self.league_id, self.week)
+        self.requests += 1
+        if not matchups:
+            return 0
+        current = lineups(matchups)
+        if self.lineups is not None and current != self.lineups:
+            # Lineup or roster moves: rows to add/remove, not just points to update
+            print("⚠ Lineups changed, re-syncing the week")
+            self._load_week()
+        self.lineups = current
+        return self.write_changes(*live_points(matchups, self.roster_to_team))
+
+    def run(self, once: bool = False):
+        """Poll until interrupted, at the adaptive cadence"""
+        quiet_polls = 0
+        while True:
+            updated = self.poll()
+            quiet_polls = 0 if updated else quiet_polls + 1
+            if updated:
+                print(f"✓ {datetime.now():%H:%M:%S} week {self.week}: {updated} scores updated")
+            if once:
+                return
+            time.sleep(next_interval(quiet_polls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--league', default=DEFAULT_LEAGUE_ID, help="Sleeper league ID")
+    parser.add_argument('--once', action='store_true', help="Poll once and exit (e.g. from cron)")
+    args = parser.parse_args()
+
+    poller = LiveScorePoller(args.league)
+    start = time.perf_counter()
+    try:
+        poller.run(once=args.once)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.close()
+        print(f"\n✓ {poller.requests} API requests in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
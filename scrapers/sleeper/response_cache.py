@@ -0,0 +1,208 @@
+"""
+Sleeper HTTP Response Cache
+SQLite cache of Sleeper API responses keyed by endpoint, shared by the sync
+and async clients. How long a response stays valid depends on what it is:
+completed weeks, finished leagues, completed drafts and past weeks'
+projections never change and are kept forever; the current week and
+`state/nfl` expire within minutes. Expired
+entries are revalidated with ETag / Last-Modified when Sleeper sent them.
+"""
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, Optional
+
+import config
+
+
+DEFAULT_CACHE_FILE = os.path.join(config.DATA_DIR, "sleeper_http_cache.db")
+
+IMMUTABLE = None  # expires_at for responses that never change
+
+# Seconds each kind of response stays fresh
+STATE_TTL = 300
+LIVE_WEEK_TTL = 60
+RECENT_WEEK_TTL = 3600  # last week: stat corrections still land
+LEAGUE_TTL = 600
+DRAFT_TTL = 600
+PLAYERS_TTL = 24 * 3600
+PROJECTIONS_TTL = 3600  # current/upcoming weeks: projections move until kickoff
+
+WEEKLY_PATTERN = re.compile(r'^league/(\w+)/(matchups|transactions)/(\d+)$')
+LEAGUE_PATTERN = re.compile(r'^league/(\w+)(/[\w/]+)?$')
+DRAFT_PATTERN = re.compile(r'^draft/(\w+)(/[\w/]+)?$')
+PROJECTIONS_PATTERN = re.compile(r'^projections/nfl/(\d+)/(\d+)')
+
+
+class ResponseCache:
+    """
+    Persistent per-endpoint cache with immutability rules and revalidation
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite file (default: DATA_DIR/sleeper_http_cache.db)
+        """
+        self.path = path or DEFAULT_CACHE_FILE
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                endpoint TEXT PRIMARY KEY,
+                body TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                expires_at REAL
+            )
+        """)
+        self.conn.commit()
+
+        # What the responses seen so far say about the season (drives the policy)
+        self.nfl_season = None
+        self.nfl_week = None
+        self.league_seasons: Dict[str, str] = {}
+        self.complete_leagues = set()
+        self.complete_drafts = set()
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    # POLICY
+
+    def observe(self, endpoint: str, body):
+        """Record season/week, league and draft status from a response"""
+        league = LEAGUE_PATTERN.match(endpoint)
+        draft = DRAFT_PATTERN.match(endpoint)
+
+        if endpoint == 'state/nfl' and isinstance(body, dict):
+            self.nfl_season = str(body.get('season') or '') or None
+            self.nfl_week = body.get('week')
+        elif league and not league.group(2) and isinstance(body, dict):
+            self.league_seasons[league.group(1)] = str(body.get('season') or '')
+            if body.get('status') == 'complete':
+                self.complete_leagues.add(league.group(1))
+        elif league and league.group(2) == '/drafts' and isinstance(body, list):
+            self.complete_drafts.update(d.get('draft_id') for d in body if d.get('status') == 'complete')
+        elif draft and not draft.group(2) and isinstance(body, dict) and body.get('status') == 'complete':
+            self.complete_drafts.add(draft.group(1))
+
+    def _league_finished(self, league_id: str) -> bool:
+        if league_id in self.complete_leagues:
+            return True
+        season = self.league_seasons.get(league_id)
+        return bool(season and self.nfl_season and season < self.nfl_season)
+
+    def ttl(self, endpoint: str) -> Optional[float]:
+        """
+        Seconds a fresh response for `endpoint` may be served (IMMUTABLE: forever, 0: never)
+        """
+        if endpoint == 'state/nfl':
+            return STATE_TTL
+        if endpoint == 'players/nfl':
+            return PLAYERS_TTL
+        if endpoint.startswith('players/nfl/trending'):
+            return 0
+
+        projections = PROJECTIONS_PATTERN.match(endpoint)
+        if projections:
+            season, week = projections.group(1), int(projections.group(2))
+            if self.nfl_season and (season < self.nfl_season or
+                                    (season == self.nfl_season and self.nfl_week and week < self.nfl_week)):
+                return IMMUTABLE
+            return PROJECTIONS_TTL
+
+        weekly = WEEKLY_PATTERN.match(endpoint)
+        if weekly:
+            league_id, week = weekly.group(1), int(weekly.group(3))
+            if self._league_finished(league_id):
+                return IMMUTABLE
+            if self.nfl_week is None:
+                return LIVE_WEEK_TTL
+            if week < self.nfl_week - 1:
+                return IMMUTABLE
+            return RECENT_WEEK_TTL if week == self.nfl_week - 1 else LIVE_WEEK_TTL
+
+        draft = DRAFT_PATTERN.match(endpoint)
+        if draft:
+            return IMMUTABLE if draft.group(1) in self.complete_drafts else DRAFT_TTL
+
+        league = LEAGUE_PATTERN.match(endpoint)
+        if league:
+            return IMMUTABLE if self._league_finished(league.group(1)) else LEAGUE_TTL
+
+        return LEAGUE_TTL
+
+    # LOOKUP / STORE
+
+    def lookup(self, endpoint: str):
+        """
+        Cached entry for an endpoint (a fresh entry counts as a hit)
+
+        Returns:
+            (body, fresh, conditional request headers), or None when not cached
+        """
+        row = self.conn.execute(
+            "SELECT body, etag, last_modified, expires_at FROM responses WHERE endpoint = ?",
+            (endpoint,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        body = json.loads(row[0])
+        self.observe(endpoint, body)
+        fresh = row[3] is IMMUTABLE or row[3] > time.time()
+        if fresh:
+            self.hits += 1
+
+        headers = {}
+        if row[1]:
+            headers['If-None-Match'] = row[1]
+        if row[2]:
+            headers['If-Modified-Since'] = row[2]
+        return body, fresh, headers
+
+    def store(self, endpoint: str, body, headers) -> None:
+        """Save a 200 response under the endpoint's policy"""
+        self.misses += 1
+        self.observe(endpoint, body)
+        ttl = self.ttl(endpoint)
+        if ttl == 0:
+            return
+        now = time.time()
+        self.conn.execute("""
+            INSERT OR REPLACE INTO responses (endpoint, body, etag, last_modified, fetched_at, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            endpoint, json.dumps(body), headers.get('ETag'), headers.get('Last-Modified'),
+            now, IMMUTABLE if ttl is IMMUTABLE else now + ttl
+        ))
+        self.conn.commit()
+
+    def refresh(self, endpoint: str, body):
+        """A 304 revalidated the cached body: extend its expiry and return it"""
+        self.revalidated += 1
+        ttl = self.ttl(endpoint)
+        now = time.time()
+        self.conn.execute(
+            "UPDATE responses SET fetched_at = ?, expires_at = ? WHERE endpoint = ?",
+            (now, IMMUTABLE if ttl is IMMUTABLE else now + ttl, endpoint)
+        )
+        self.conn.commit()
+        return body
+
+    def report(self) -> str:
+        """One-line hit-rate summary"""
+        total = self.hits + self.revalidated + self.misses
+        rate = (self.hits + self.revalidated) / total * 100 if total else 0
+        return (f"HTTP cache: {self.hits} hits, {self.revalidated} revalidated, "
+                f"{self.misses} downloaded ({rate:.0f}% served from cache)")
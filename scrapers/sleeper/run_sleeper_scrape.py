@@ -1,5 +1,8 @@
 """
 Scrape 2025 Sleeper data for pvels
+
+Usage: python run_sleeper_scrape.py [--sync]
+  --sync  Update the database with only the new/changed weeks (no JSON file)
 """
 import sys
 sys.path.insert(0, '.')
@@ -10,6 +13,11 @@ from sleeper_scraper import SleeperScraper
 USERNAME = "pvels"
 LEAGUE_ID = "1257893653083332608"
 
+if '--sync' in sys.argv:
+    from sleeper_sync import sync_league
+    sync_league(LEAGUE_ID)
+    sys.exit(0)
+
 # Create scraper
 scraper = SleeperScraper(username=USERNAME, league_id=LEAGUE_ID)
 
@@ -13,18 +13,34 @@ class SleeperAPIClient:
     
     BASE_URL = "https://api.sleeper.app/v1"
     
-    def __init__(self):
-        """Initialize the Sleeper API client"""
-        self.session = requests.Session()
+    def __init__(self, cache=None, session: Optional[requests.Session] = None):
+        """
+        Initialize the Sleeper API client
+        
+        Args:
+            cache: Optional ResponseCache shared across clients and runs
+            session: Optional requests.Session (e.g. http_fixtures.fixture_session)
+        """
+        self.session = session or requests.Session()
+        self.cache = cache
         print("✓ Initialized Sleeper API client")
     
     def _get(self, endpoint: str) -> Optional[Dict]:
-        """Make a GET request to the Sleeper API"""
+        """Make a GET request to the Sleeper API (served from the cache while fresh)"""
+        cached = self.cache.lookup(endpoint) if self.cache else None
+        if cached and cached[1]:
+            return cached[0]
+        
         url = f"{self.BASE_URL}/{endpoint}"
         try:
-            response = self.session.get(url)
+            response = self.session.get(url, headers=cached[2] if cached else None)
+            if response.status_code == 304 and cached:
+                return self.cache.refresh(endpoint, cached[0])
             response.raise_for_status()
-            return response.json()
+            body = response.json()
+            if self.cache:
+                self.cache.store(endpoint, body, response.headers)
+            return body
         except requests.exceptions.RequestException as e:
             print(f"✗ API request failed: {e}")
             return None
@@ -2,30 +2,45 @@
 Sleeper Fantasy Football Data Scraper for 2025 Season
 Fetches all league data via the Sleeper API
 """
+import asyncio
 import json
 import os
 import sys
 from datetime import datetime
 import time
+from typing import List, Sequence, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from sleeper_client import SleeperAPIClient
+from async_sleeper_client import AsyncSleeperAPIClient, HAVE_HTTPX
+from response_cache import ResponseCache
 import config
 
+# Pause between calls when httpx is missing and requests run one by one
+SYNC_REQUEST_DELAY = 0.5
+
 
 class SleeperScraper:
     """Scraper for fetching complete league data from Sleeper"""
     
-    def __init__(self, username: str = None, league_id: str = None):
+    def __init__(self, username: str = None, league_id: str = None, use_cache: bool = True,
+                 session=None, **async_options):
         """
         Initialize scraper
         
         Args:
             username: Your Sleeper username (optional if you have league_id)
             league_id: Your league ID (optional if you have username)
+            use_cache: Keep responses in the on-disk HTTP cache (completed
+                weeks and drafts are never downloaded twice)
+            session: Optional requests.Session for the sync client
+            **async_options: AsyncSleeperAPIClient settings (rate_per_minute,
+                burst, max_concurrency) for the concurrent per-week fetch
         """
-        self.client = SleeperAPIClient()
+        self.cache = ResponseCache() if use_cache else None
+        self.client = SleeperAPIClient(cache=self.cache, session=session)
+        self.async_options = async_options
         self.username = username
         self.league_id = league_id
         self.data = {}
@@ -64,7 +79,8 @@ class SleeperScraper:
                 self.league_id = leagues[0].get("league_id")
                 print(f"\n✓ Using league: {leagues[0].get('name')}")
             else:
-                print("\nMultiple leagues found. Please set league_id in config.py")
+                print("\nMultiple leagues found. Please set league_id in config.py "
+                      "(or sync them all with league_scheduler.py)")
                 return
         
         if not self.league_id:
@@ -105,50 +121,45 @@ class SleeperScraper:
             print(f"✓ Found {len(rosters)} rosters")
             self.data["rosters"] = rosters
         
-        # Step 6: Get all matchups (week by week)
-        print(f"\n7. Fetching matchups for all weeks...")
+        # Step 6: Get traded picks
+        print(f"\n7. Fetching traded picks...")
+        traded_picks = self.client.get_traded_picks(self.league_id)
+        if traded_picks:
+            print(f"✓ Found {len(traded_picks)} traded picks")
+            self.data["traded_picks"] = traded_picks
+        
+        # Step 7: Get drafts
+        print(f"\n8. Fetching drafts...")
+        drafts = self.client.get_drafts_for_league(self.league_id)
+        if drafts:
+            print(f"✓ Found {len(drafts)} draft(s)")
+        
+        # Step 8: Matchups and transactions for every week plus draft picks
+        print(f"\n9. Fetching matchups, transactions and draft picks...")
+        start = time.perf_counter()
+        week_matchups, week_transactions, draft_picks = self.fetch_weekly(
+            range(1, current_week + 1), [draft.get("draft_id") for draft in drafts]
+        )
+        print(f"✓ Fetched in {time.perf_counter() - start:.1f}s")
+        
         all_matchups = {}
-        for week in range(1, current_week + 1):
-            matchups = self.client.get_matchups(self.league_id, week)
+        for week, matchups in enumerate(week_matchups, 1):
             if matchups:
                 all_matchups[str(week)] = matchups
                 print(f"   Week {week}: {len(matchups)} matchups")
-            time.sleep(0.5)  # Rate limiting
         self.data["matchups"] = all_matchups
         
-        # Step 7: Get transactions
-        print(f"\n8. Fetching transactions...")
         all_transactions = {}
-        for week in range(1, current_week + 1):
-            transactions = self.client.get_transactions(self.league_id, week)
+        for week, transactions in enumerate(week_transactions, 1):
             if transactions:
                 all_transactions[str(week)] = transactions
                 print(f"   Week {week}: {len(transactions)} transactions")
-            time.sleep(0.5)  # Rate limiting
         self.data["transactions"] = all_transactions
         
-        # Step 8: Get traded picks
-        print(f"\n9. Fetching traded picks...")
-        traded_picks = self.client.get_traded_picks(self.league_id)
-        if traded_picks:
-            print(f"✓ Found {len(traded_picks)} traded picks")
-            self.data["traded_picks"] = traded_picks
-        
-        # Step 9: Get drafts
-        print(f"\n10. Fetching drafts...")
-        drafts = self.client.get_drafts_for_league(self.league_id)
         if drafts:
-            print(f"✓ Found {len(drafts)} draft(s)")
-            
-            # Get picks for each draft
-            for draft in drafts:
-                draft_id = draft.get("draft_id")
-                print(f"   Fetching picks for draft {draft_id}...")
-                picks = self.client.get_draft_picks(draft_id)
+            for draft, picks in zip(drafts, draft_picks):
                 draft["picks"] = picks
-                print(f"   ✓ Got {len(picks)} picks")
-                time.sleep(0.5)
-            
+                print(f"   ✓ Draft {draft.get('draft_id')}: {len(picks)} picks")
             self.data["drafts"] = drafts
         
         # Step 10: Get playoff brackets (if in playoffs)
@@ -174,9 +185,50 @@ class SleeperScraper:
         print("\n" + "="*80)
         print("DATA EXTRACTION COMPLETE")
         print("="*80)
+        if self.cache:
+            print(f"✓ {self.cache.report()}")
         
         return self.data
     
+    def fetch_weekly(self, weeks: Sequence[int], draft_ids: List[str]) -> Tuple[List, List, List]:
+        """
+        Fetch the per-week and per-draft endpoints
+        
+        With httpx installed every call runs concurrently through the async
+        client (rate limited); otherwise they run one by one.
+        
+        Args:
+            weeks: Weeks to fetch (e.g. range(1, current_week + 1))
+            draft_ids: Drafts whose picks to fetch
+            
+        Returns:
+            (matchups per week, transactions per week, picks per draft), in the order requested
+        """
+        if HAVE_HTTPX:
+            return asyncio.run(self._fetch_weekly_async(weeks, draft_ids))
+        
+        matchups, transactions, picks = [], [], []
+        for week in weeks:
+            matchups.append(self.client.get_matchups(self.league_id, week))
+            time.sleep(SYNC_REQUEST_DELAY)  # Rate limiting
+        for week in weeks:
+            transactions.append(self.client.get_transactions(self.league_id, week))
+            time.sleep(SYNC_REQUEST_DELAY)
+        for draft_id in draft_ids:
+            picks.append(self.client.get_draft_picks(draft_id))
+            time.sleep(SYNC_REQUEST_DELAY)
+        return matchups, transactions, picks
+    
+    async def _fetch_weekly_async(self, weeks: Sequence[int], draft_ids: List[str]) -> Tuple[List, List, List]:
+        count = len(weeks)
+        async with AsyncSleeperAPIClient(cache=self.cache, **self.async_options) as client:
+            responses = await asyncio.gather(
+                *(client.get_matchups(self.league_id, week) for week in weeks),
+                *(client.get_transactions(self.league_id, week) for week in weeks),
+                *(client.get_draft_picks(draft_id) for draft_id in draft_ids),
+            )
+        return responses[:count], responses[count:2 * count], responses[2 * count:]
+    
     def save_to_json(self, season: str = "2025"):
         """Save scraped data to JSON file"""
         
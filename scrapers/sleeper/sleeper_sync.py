@@ -0,0 +1,317 @@
+"""
+Incremental Sleeper sync
+Brings one league-season in the database up to date straight from the API,
+without the season JSON file: only the weeks since the last sync are fetched
+(concurrently, through the HTTP cache), each is normalized and hashed, and
+only weeks whose content changed are replaced in matchups / matchup_rosters,
+with their transactions upserted, in one transaction.
+
+The last synced week comes from the scrape_metadata hash rows this sync
+writes (source_file 'sleeper_sync_{league_id}_{season}'). The week before it
+is always refetched so stat corrections are picked up.
+
+Usage: python sleeper_sync.py [--league LEAGUE_ID] [--full] [--no-cache]
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+
+from sleeper_scraper import SleeperScraper
+from enhance_sleeper_data import load_or_fetch_players, enhance_draft_picks, add_player_names
+from draft_value import build_draft_value
+from migrations import ensure_schema
+from normalization import (normalize_season, normalize_sleeper_week, normalize_sleeper_transactions,
+                           sleeper_transaction_assets)
+from populate_database import (build_load_batches, load_batches, report_bad_rows, stored_hashes,
+                               transaction_batch, asset_batch, _sha256_json, SEASON_HASH_WEEK, NO_SEASON_SLICE,
+                               LEAGUE_UPSERT)
+from ratings import update_ratings, invalidate_ratings
+from rescoring import invalidate_rescored_weeks
+import config
+
+DEFAULT_LEAGUE_ID = "1257893653083332608"
+LAST_WEEK = 18  # Sleeper's final scoring week when the league doesn't say
+
+# The database is the only copy of synced data, so keep commits durable
+# (WAL makes NORMAL safe) and wait out API readers instead of failing.
+SYNC_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+def sync_source(league_id, season) -> str:
+    """scrape_metadata.source_file under which a league-season's sync hashes are kept"""
+    return f"sleeper_sync_{league_id}_{season}"
+
+
+def open_sync_connection(db_path):
+    """Open a connection for the sync writer (explicit BEGIN/COMMIT)"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for pragma in SYNC_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def final_week(league: Dict, nfl_state: Dict) -> int:
+    """Last week with data: the current NFL week in season, else the league's last scored week"""
+    if str(nfl_state.get('season')) == str(league.get('season')) and nfl_state.get('week'):
+        return min(int(nfl_state['week']), LAST_WEEK)
+    return int((league.get('settings') or {}).get('last_scored_leg') or LAST_WEEK)
+
+
+def stored_projections(conn, league_id, season_year, weeks) -> Dict[Tuple[int, str], float]:
+    """
+    Projected points already in matchup_rosters for the weeks being synced
+
+    Projections are merged by fetch_sleeper_projections, not returned by the
+    matchups endpoint, so a re-synced week keeps the ones it had.
+    """
+    if not weeks:
+        return {}
+    cursor = conn.execute("""
+        SELECT week, player_id, projected FROM matchup_rosters
+        WHERE league_id = ? AND season_year = ? AND week BETWEEN ? AND ?
+          AND player_id IS NOT NULL AND projected != 0
+    """, (league_id, season_year, min(weeks), max(weeks)))
+    return {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+
+
+def plan_sync(conn, league: Dict, nfl_state: Dict, full: bool = False) -> Tuple[str, Dict, List[int]]:
+    """
+    Work out which weeks of a league-season need fetching
+
+    Returns:
+        (scrape_metadata source_file, stored hashes, weeks to fetch)
+    """
+    season = str(league.get('season'))
+    source_file = sync_source(league.get('league_id'), season)
+    previous = {} if full else stored_hashes(conn, source_file)
+    synced = max((week for week in previous if week), default=0)
+    weeks = list(range(max(1, synced - 1), final_week(league, nfl_state) + 1))
+    print(f"Syncing {league.get('name')} {season}: "
+          f"{'weeks ' + str(weeks[0]) + '-' + str(weeks[-1]) if weeks else 'no weeks'}"
+          f" (last synced week: {synced or 'none'})")
+    return source_file, previous, weeks
+
+
+def apply_sync(conn, league: Dict, users: List[Dict], rosters: List[Dict], drafts: List[Dict],
+               weeks: List[int], week_matchups: List[List[Dict]], week_transactions: List[List[Dict]],
+               players, previous: Dict, source_file: str,
+               traded_picks: Optional[List[Dict]] = None) -> Tuple[List[Tuple[int, int]], bool]:
+    """
+    Normalize fetched data and write the slices whose hash changed (one transaction)
+
+    Args:
+        conn: Connection from open_sync_connection (the only writer)
+        league, users, rosters: Sleeper responses for the league
+        drafts: Sleeper drafts with their 'picks' attached
+        weeks: Weeks that were fetched, aligned with week_matchups / week_transactions
+        players: PlayerDirectory (names, positions, teams)
+        previous, source_file: From plan_sync
+        traded_picks: The league's traded_picks response
+
+    Returns:
+        (reloaded (season_year, week) slices, whether standings/draft changed)
+    """
+    enhance_draft_picks(drafts, players)
+
+    scraped_at = datetime.now().isoformat()
+    season_data = normalize_season({
+        'league': league, 'users': users, 'rosters': rosters, 'drafts': drafts,
+        'traded_picks': traded_picks or [], 'season': str(league.get('season')), 'scraped_at': scraped_at
+    }, 'sleeper')
+    season_year = season_data['season_year']
+    roster_to_team = {s['roster_id']: s['team_name'] for s in season_data['standings']}
+
+    # Standings/draft slice, then only the weeks whose content changed
+    hashes = {SEASON_HASH_WEEK: _sha256_json(
+        [season_data['standings'], season_data['draft'], season_data['traded_picks']]
+    )}
+    season_changed = previous.get(SEASON_HASH_WEEK) != hashes[SEASON_HASH_WEEK]
+    batches = build_load_batches(
+        season_data if season_changed else {**season_data, **NO_SEASON_SLICE}, 'sleeper'
+    )
+
+    projected = stored_projections(conn, batches['league_id'], season_year, weeks)
+    changed = []
+    for week, matchups, transactions in zip(weeks, week_matchups, week_transactions):
+        if not matchups:
+            continue  # Not scheduled yet (or the request failed): leave it for the next sync
+        for matchup in matchups:
+            for player in add_player_names(matchup, players).get('players_with_names', []):
+                if projected.get((week, player['player_id'])):
+                    player['projected'] = projected[(week, player['player_id'])]
+
+        normalized = normalize_sleeper_week(week, matchups, season_year, roster_to_team, players)
+        transaction_rows = normalize_sleeper_transactions(week, transactions, roster_to_team, players)
+        asset_rows = sleeper_transaction_assets(week, transactions, roster_to_team, players)
+        hashes[week] = _sha256_json([normalized, transaction_rows, asset_rows])
+        if previous.get(week) == hashes[week]:
+            continue
+        changed.append(week)
+
+        week_batches = build_load_batches(
+            {**season_data, **NO_SEASON_SLICE, 'matchups': {week: normalized}}, 'sleeper'
+        )
+        for key in ('matchups', 'rosters', 'bad_rows'):
+            batches[key].extend(week_batches[key])
+        batches['transactions'].extend(
+            transaction_batch(batches['league_id'], season_year, transaction_rows, scraped_at, batches['bad_rows'])
+        )
+        batches['transaction_assets'].extend(
+            asset_batch(batches['league_id'], season_year, asset_rows, batches['bad_rows'])
+        )
+
+    if not changed and not season_changed:
+        conn.execute(LEAGUE_UPSERT, batches['league'])  # databases synced before leagues existed
+        print(f"  ✓ {league.get('name')} {season_year}: already up to date")
+        return [], False
+
+    batches.update({
+        'replace_weeks': changed,
+        'replace_season': season_changed,
+        'hashes': [(batches['league_id'], season_year, source_file, week, digest)
+                   for week, digest in {**previous, **hashes}.items()],
+    })
+    load_batches(conn, batches)
+    print(f"  ✓ {league.get('name')} {season_year}: reloaded {len(changed)} weeks"
+          f"{' + standings/draft' if season_changed else ''}"
+          f" ({len(hashes) - len(changed) - season_changed} slices unchanged)")
+    print(f"  ✓ Upserted {len(batches['matchups'])} matchups, {len(batches['rosters'])} player entries,"
+          f" {len(batches['transactions'])} transactions ({len(batches['transaction_assets'])} assets moved)")
+    report_bad_rows(batches['bad_rows'])
+    return [(season_year, week) for week in changed], season_changed
+
+
+def refresh_derived(db_path, reloaded: List[Tuple[int, int]], season_changed: bool):
+    """Drop what the reloaded weeks invalidate in the derived tables, then extend them"""
+    if not reloaded and not season_changed:
+        return
+    conn = sqlite3.connect(db_path)
+    if reloaded:
+        invalidate_rescored_weeks(conn, reloaded)
+        invalidate_ratings(conn, *min(reloaded))
+        print(f"  ✓ Updated {update_ratings(conn)} manager-week power ratings")
+    if season_changed:
+        print(f"  ✓ Valued {build_draft_value(conn)} draft picks")
+    conn.close()
+
+
+async def sync_league_async(client, league: Dict, players, conn, nfl_state: Dict,
+                            full: bool = False) -> Tuple[List[Tuple[int, int]], bool]:
+    """
+    Sync one league-season through a shared AsyncSleeperAPIClient
+
+    Writes go through apply_sync without awaiting in between, so leagues
+    gathered on one event loop share a single writer connection safely.
+
+    Args:
+        client: Open AsyncSleeperAPIClient (shared pool, rate limiter and cache)
+        league: The league's Sleeper response
+        players: PlayerDirectory
+        conn: Connection from open_sync_connection
+        nfl_state: state/nfl response
+        full: Ignore stored hashes
+
+    Returns:
+        Same as apply_sync
+    """
+    league_id = league['league_id']
+    source_file, previous, weeks = plan_sync(conn, league, nfl_state, full)
+    users, rosters, drafts, traded_picks, *weekly = await asyncio.gather(
+        client.get_users(league_id),
+        client.get_rosters(league_id),
+        client.get_drafts_for_league(league_id),
+        client.get_traded_picks(league_id),
+        *(client.get_matchups(league_id, week) for week in weeks),
+        *(client.get_transactions(league_id, week) for week in weeks),
+    )
+    draft_picks = await asyncio.gather(*(client.get_draft_picks(draft.get('draft_id')) for draft in drafts))
+    for draft, picks in zip(drafts, draft_picks):
+        draft['picks'] = picks
+
+    return apply_sync(conn, league, users, rosters, drafts, weeks, weekly[:len(weeks)], weekly[len(weeks):],
+                      players, previous, source_file, traded_picks)
+
+
+def sync_league(league_id: str = DEFAULT_LEAGUE_ID, db_path: str = None, full: bool = False,
+                use_cache: bool = True, session=None, import_legacy_players: bool = True,
+                **async_options) -> List[Tuple[int, int]]:
+    """
+    Sync one Sleeper league's current season into the database
+
+    Args:
+        league_id: Sleeper league ID (its season is the league's season)
+        db_path: SQLite database (default: config.DB_FILE)
+        full: Ignore stored hashes and refetch/reload every week
+        use_cache: Go through the on-disk HTTP response cache
+        session: Optional requests.Session for the sync client
+        import_legacy_players: Seed the player directory from DATA_DIR/sleeper_players.json
+        **async_options: AsyncSleeperAPIClient settings for the weekly fetch
+
+    Returns:
+        List of (season_year, week) slices that were reloaded
+    """
+    start = time.perf_counter()
+    db_path = db_path or config.DB_FILE
+    applied = ensure_schema(db_path)
+    if applied:
+        print(f"✓ Applied {applied} migrations to {db_path}")
+
+    scraper = SleeperScraper(league_id=league_id, use_cache=use_cache, session=session, **async_options)
+    client = scraper.client
+
+    league = client.get_league(league_id)
+    if not league:
+        print(f"✗ League {league_id} not found")
+        return []
+    nfl_state = client.get_nfl_state() or {}
+
+    conn = open_sync_connection(db_path)
+    source_file, previous, weeks = plan_sync(conn, league, nfl_state, full)
+
+    # Season shell, then every week and draft in one concurrent round of requests
+    users = client.get_users(league_id)
+    rosters = client.get_rosters(league_id)
+    drafts = client.get_drafts_for_league(league_id)
+    traded_picks = client.get_traded_picks(league_id)
+    week_matchups, week_transactions, draft_picks = scraper.fetch_weekly(
+        weeks, [draft.get('draft_id') for draft in drafts]
+    )
+    for draft, picks in zip(drafts, draft_picks):
+        draft['picks'] = picks
+
+    players = load_or_fetch_players(db_path=db_path, client=client, import_legacy=import_legacy_players)
+    reloaded, season_changed = apply_sync(conn, league, users, rosters, drafts, weeks, week_matchups,
+                                          week_transactions, players, previous, source_file, traded_picks)
+    conn.close()
+    refresh_derived(db_path, reloaded, season_changed)
+
+    if scraper.cache:
+        print(f"✓ {scraper.cache.report()}")
+    print(f"✓ Synced in {time.perf_counter() - start:.1f}s")
+    return reloaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--league', default=DEFAULT_LEAGUE_ID, help="Sleeper league ID")
+    parser.add_argument('--full', action='store_true', help="Reload every week, ignoring stored hashes")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the HTTP response cache")
+    args = parser.parse_args()
+
+    sync_league(args.league, full=args.full, use_cache=not args.no_cache)
+
+
+if __name__ == "__main__":
+    main()
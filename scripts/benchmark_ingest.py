@@ -0,0 +1,144 @@
+"""
+Benchmark full-history database reloads
+Compares the bulk loader in populate_database.py (executemany, one transaction
+per file, load pragmas) with the old per-row INSERT path on synthetic seasons
+shaped like the normalized ESPN/Sleeper files.
+
+Usage: python benchmark_ingest.py [--seasons 7] [--teams 10] [--weeks 17]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'legacy-dashboard'))
+
+from migrations import ensure_schema
+from populate_database import (
+    open_load_connection, build_load_batches, load_batches,
+    TEAM_INSERT, MATCHUP_INSERT, ROSTER_INSERT, PICK_INSERT
+)
+
+POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'FLEX', 'D/ST', 'K']
+
+
+def make_season(season, teams=10, weeks=17, roster_size=16, rng=None):
+    """Build one synthetic normalized season (same shape as normalize_data output)"""
+    rng = rng or random.Random(season)
+    team_names = [f"Team {i} ({season})" for i in range(teams)]
+
+    def roster():
+        return [
+            {
+                'player_name': f"Player {rng.randint(1, 900)}",
+                'position': POSITIONS[j % len(POSITIONS)],
+                'nfl_team': 'KC',
+                'points': round(rng.uniform(0, 30), 2),
+                'projected': round(rng.uniform(5, 20), 2),
+                'started': j < 9
+            }
+            for j in range(roster_size)
+        ]
+
+    matchups = {}
+    for week in range(1, weeks + 1):
+        order = team_names[:]
+        rng.shuffle(order)
+        matchups[str(week)] = [
+            {
+                'matchup_id': m,
+                'home_team': order[2 * m],
+                'away_team': order[2 * m + 1],
+                'home_score': round(rng.uniform(70, 160), 2),
+                'away_score': round(rng.uniform(70, 160), 2),
+                'home_roster': roster(),
+                'away_roster': roster()
+            }
+            for m in range(teams // 2)
+        ]
+
+    return {
+        'league_id': 'bench',
+        'season': season,
+        'standings': [
+            {'team_name': name, 'owner': f"Owner {i}", 'rank': i + 1, 'wins': 7, 'losses': 7,
+             'points_for': 1500.0, 'points_against': 1500.0}
+            for i, name in enumerate(team_names)
+        ],
+        'matchups': matchups,
+        'draft': {'picks': [
+            {'round': (n - 1) // teams + 1, 'pick': (n - 1) % teams + 1, 'overall_pick': n,
+             'team': team_names[(n - 1) % teams], 'player_name': f"Player {n}", 'position': 'RB',
+             'nfl_team': 'KC'}
+            for n in range(1, teams * roster_size + 1)
+        ]}
+    }
+
+
+def load_per_row(db_path, seasons):
+    """The previous load path: one connection per file, one execute per row"""
+    for data in seasons:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        batches = build_load_batches(data, 'espn')
+        for sql, key in ((TEAM_INSERT, 'teams'), (MATCHUP_INSERT, 'matchups'),
+                         (ROSTER_INSERT, 'rosters'), (PICK_INSERT, 'picks')):
+            for row in batches[key]:
+                try:
+                    cursor.execute(sql, row)
+                except Exception as e:
+                    print(f"  Error inserting {key}: {e}")
+        conn.commit()
+        conn.close()
+
+
+def load_bulk(db_path, seasons):
+    """The current load path: shared connection, executemany per table, one transaction per file"""
+    conn = open_load_connection(db_path)
+    for data in seasons:
+        load_batches(conn, build_load_batches(data, 'espn'))
+    conn.close()
+
+
+def time_load(loader, seasons):
+    """Reload into a fresh database and return (seconds, roster rows)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        ensure_schema(db_path)
+        start = time.perf_counter()
+        loader(db_path, seasons)
+        elapsed = time.perf_counter() - start
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT COUNT(*) FROM matchup_rosters").fetchone()[0]
+        conn.close()
+    return elapsed, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=7)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--weeks', type=int, default=17)
+    args = parser.parse_args()
+
+    seasons = [make_season(2019 + i, args.teams, args.weeks) for i in range(args.seasons)]
+
+    print("=" * 60)
+    print(f"FULL-HISTORY RELOAD: {args.seasons} seasons x {args.teams} teams x {args.weeks} weeks")
+    print("=" * 60)
+
+    results = {}
+    for name, loader in (('per-row', load_per_row), ('bulk', load_bulk)):
+        elapsed, rows = time_load(loader, seasons)
+        results[name] = elapsed
+        print(f"  {name:8s} {elapsed:7.3f}s  ({rows} roster rows, {rows / elapsed:,.0f} rows/s)")
+
+    print(f"\n✓ Bulk loader speedup: {results['per-row'] / results['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
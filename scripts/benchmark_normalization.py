@@ -0,0 +1,181 @@
+"""
+Benchmark season normalization
+Measures the import cost of normalization.py next to the legacy Flask app
+that used to host normalize_data, and normalization throughput on synthetic
+ESPN (2019 roster layout) and Sleeper seasons, whole-season vs week by week.
+
+Usage: python benchmark_normalization.py [--seasons 7] [--teams 10] [--weeks 17]
+"""
+import argparse
+import copy
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from normalization import normalize_data, normalize_season, iter_normalized_weeks
+
+POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'FLEX', 'D/ST', 'K']
+NFL_TEAMS = ['KC', 'BUF', 'PHI', 'SF', 'DAL', 'MIA', 'DET', 'BAL']
+
+IMPORT_SNIPPET = (
+    "import sys, time; sys.path[:0] = {paths!r}; "
+    "t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+)
+
+
+def make_espn_season(season, teams=10, weeks=17, roster_size=16, rng=None):
+    """Synthetic ESPN season in the 2019 layout (player/team_pos/fpts, separate bench)"""
+    rng = rng or random.Random(season)
+
+    def players(count, offset):
+        return [
+            {
+                'player': f"Player {rng.randint(1, 900)}",
+                'team_pos': f"{rng.choice(NFL_TEAMS)} {POSITIONS[(offset + j) % len(POSITIONS)]}",
+                'slot': POSITIONS[(offset + j) % len(POSITIONS)],
+                'fpts': round(rng.uniform(0, 30), 2),
+                'proj': round(rng.uniform(5, 20), 2)
+            }
+            for j in range(count)
+        ]
+
+    matchups = {}
+    for week in range(1, weeks + 1):
+        matchups[str(week)] = [
+            {
+                'matchup_id': m,
+                'home_team': f"Team {2 * m}",
+                'away_team': f"Team {2 * m + 1}",
+                'home_score': round(rng.uniform(70, 160), 2),
+                'away_score': round(rng.uniform(70, 160), 2),
+                'home_roster': players(9, 0),
+                'away_roster': players(9, 0),
+                'home_bench': players(roster_size - 9, 9),
+                'away_bench': players(roster_size - 9, 9)
+            }
+            for m in range(teams // 2)
+        ]
+    return {'league_id': 'bench', 'season_year': season, 'standings': [], 'matchups': matchups}
+
+
+def make_sleeper_season(season, teams=10, weeks=17, roster_size=16, rng=None):
+    """Synthetic raw Sleeper season file (users, rosters, players_with_names) and player directory"""
+    rng = rng or random.Random(season)
+    directory = {
+        str(n): {'position': POSITIONS[n % len(POSITIONS)], 'team': rng.choice(NFL_TEAMS)}
+        for n in range(1, 901)
+    }
+
+    matchups = {}
+    for week in range(1, weeks + 1):
+        order = list(range(1, teams + 1))
+        rng.shuffle(order)
+        matchups[str(week)] = [
+            {
+                'roster_id': roster_id,
+                'matchup_id': i // 2 + 1,
+                'points': round(rng.uniform(70, 160), 2),
+                'players_with_names': [
+                    {
+                        'player_id': player_id,
+                        'player_name': f"Player {player_id} ({directory[player_id]['team']} "
+                                       f"{directory[player_id]['position']})",
+                        'points': round(rng.uniform(0, 30), 2),
+                        'projected': round(rng.uniform(5, 20), 2),
+                        'is_starter': j < 9
+                    }
+                    for j, player_id in enumerate(rng.sample(sorted(directory), roster_size))
+                ]
+            }
+            for i, roster_id in enumerate(order)
+        ]
+
+    data = {
+        'season': str(season),
+        'league': {'league_id': 'bench'},
+        'users': [{'user_id': f"u{i}", 'display_name': f"Owner {i}", 'metadata': {}}
+                  for i in range(1, teams + 1)],
+        'rosters': [{'roster_id': i, 'owner_id': f"u{i}",
+                     'settings': {'wins': rng.randint(0, 14), 'fpts': rng.randint(1200, 1800)}}
+                    for i in range(1, teams + 1)],
+        'matchups': matchups,
+        'drafts': [{'type': 'snake', 'start_time': 1725000000000, 'picks': []}]
+    }
+    return data, directory
+
+
+def import_seconds(module, paths):
+    """Cold import time of a module in a fresh interpreter (None if it fails to import)"""
+    result = subprocess.run(
+        [sys.executable, '-c', IMPORT_SNIPPET.format(paths=paths, module=module)],
+        capture_output=True, text=True
+    )
+    return float(result.stdout) if result.returncode == 0 else None
+
+
+def run(label, seasons, normalize):
+    """Time and trace one normalization strategy over copies of the seasons"""
+    seasons = copy.deepcopy(seasons)
+    tracemalloc.start()
+    start = time.perf_counter()
+    players = 0
+    for data, source, directory in seasons:
+        for week_matchups in normalize(data, source, directory):
+            players += sum(len(m['home_roster']) + len(m['away_roster']) for m in week_matchups)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:22s} {elapsed:7.3f}s  {players / elapsed:>10,.0f} players/s  "
+          f"peak {peak / 1e6:6.1f} MB")
+
+
+def whole_season(data, source, directory):
+    return normalize_data(data, source, directory)['matchups'].values()
+
+
+def week_by_week(data, source, directory):
+    season = normalize_season(data, source)
+    weeks = ((week, data['matchups'][week]) for week in list(data['matchups']))
+    for _, week_matchups in iter_normalized_weeks(weeks, source, season, directory):
+        yield week_matchups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=7)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--weeks', type=int, default=17)
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    dashboard = os.path.join(here, '..', 'legacy-dashboard')
+
+    print("=" * 60)
+    print("IMPORT COST")
+    print("=" * 60)
+    for label, module, paths in (('normalization', 'normalization', [here]),
+                                 ('legacy app', 'app', [dashboard, os.path.join(here, '..')])):
+        seconds = import_seconds(module, paths)
+        print(f"  {label:22s} " + (f"{seconds * 1000:7.1f} ms" if seconds is not None else "  (not importable here)"))
+
+    espn = [(make_espn_season(2019 + i, args.teams, args.weeks), 'espn', None) for i in range(args.seasons)]
+    sleeper = []
+    for i in range(args.seasons):
+        data, directory = make_sleeper_season(2019 + i, args.teams, args.weeks)
+        sleeper.append((data, 'sleeper', directory))
+
+    for title, seasons in (('ESPN 2019 LAYOUT', espn), ('SLEEPER', sleeper)):
+        print("\n" + "=" * 60)
+        print(f"{title}: {args.seasons} seasons x {args.teams} teams x {args.weeks} weeks")
+        print("=" * 60)
+        run('whole season', seasons, whole_season)
+        run('week by week', seasons, week_by_week)
+
+
+if __name__ == "__main__":
+    main()
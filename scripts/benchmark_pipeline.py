@@ -0,0 +1,193 @@
+"""
+Benchmark the scrape -> normalize -> ingest pipeline offline
+`record` runs the pipeline once against the live APIs and keeps every
+response in a fixture directory (scrapers/sleeper/http_fixtures.py), together
+with a digest of each table it produced. `replay` reruns it from those
+fixtures into a scratch database (no network), with optional injected
+latency, times each stage and checks the tables against the recorded digests.
+
+Stages: Sleeper sync (league, weeks, drafts, player directory), projections
+(--db path of fetch_sleeper_projections) and, when polars/nflreadpy fixtures
+exist, nflverse weekly stats.
+
+Usage: python benchmark_pipeline.py record [--league ID] [--nfl-seasons 2024 2025]
+       python benchmark_pipeline.py replay [--latency 0.05] [--jitter 0.02] [--repeat 3] [--unthrottled]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'legacy-dashboard'))
+sys.path.insert(0, os.path.join(ROOT, 'scrapers', 'sleeper'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from http_fixtures import FixtureStore, FixtureMissing, fixture_session, fixture_transport, RECORD, REPLAY
+from sleeper_sync import sync_league, DEFAULT_LEAGUE_ID
+from fetch_sleeper_projections import fetch_all_projections, db_projection_weeks, write_projections_to_db
+
+DEFAULT_FIXTURES = os.path.join(config.DATA_DIR, 'fixtures', 'pipeline')
+DIGEST_FILE = 'expected.json'
+
+# Tables checked on replay, with the columns that must match (no scrape timestamps)
+DIGEST_QUERIES = {
+    'teams': "SELECT league_id, season_year, team_name, owner, wins, losses, ties, points_for, points_against "
+             "FROM teams",
+    'matchups': "SELECT league_id, season_year, week, matchup_id, home_team, home_score, home_projected, "
+                "away_team, away_score, away_projected, bracket_type FROM matchups",
+    'matchup_rosters': "SELECT league_id, season_year, week, matchup_id, team_name, player_name, position, "
+                       "nfl_team, points, projected, started, player_id FROM matchup_rosters",
+    'draft_picks': "SELECT league_id, season_year, round, pick, team, player_name, position, player_id "
+                   "FROM draft_picks",
+    'transactions': "SELECT league_id, season_year, week, transaction_id, type, status, team, "
+                    "players_added, players_dropped, description FROM transactions",
+    'nfl_weekly_stats': "SELECT player_id, season, week, season_type, recent_team, opponent_team, "
+                        "fantasy_points, fantasy_points_ppr FROM nfl_weekly_stats",
+}
+
+
+def table_digests(db_path) -> dict:
+    """(rows, sha256) per checked table, over its rows in a fixed order"""
+    conn = sqlite3.connect(db_path)
+    digests = {}
+    for table, query in DIGEST_QUERIES.items():
+        columns = query.split('FROM')[0].count(',') + 1
+        rows = conn.execute(f"{query} ORDER BY {', '.join(str(i) for i in range(1, columns + 1))}").fetchall()
+        digest = hashlib.sha256(json.dumps(rows).encode('utf-8')).hexdigest()
+        digests[table] = [len(rows), digest]
+    conn.close()
+    return digests
+
+
+def run_nfl_stage(store: FixtureStore, mode, db_path, seasons):
+    """nflverse weekly stats through the fixture's Parquet cache (skipped without polars)"""
+    try:
+        from scrapers.nfl_stats_fetcher import NFLStatsFetcher
+        fetcher = NFLStatsFetcher(db_path=db_path, cache=store.nfl_cache(replay=mode == REPLAY))
+    except ImportError as e:
+        print(f"⚠ Skipping nflverse stage: {e}")
+        return None
+    return fetcher.store_weekly_stats(fetcher.fetch_weekly_stats(seasons))
+
+
+def run_pipeline(store: FixtureStore, mode, db_path, league_id, nfl_seasons, async_options) -> dict:
+    """
+    Run every stage into db_path through the fixtures
+
+    Returns:
+        Seconds per stage
+    """
+    timings = {}
+
+    # Each stage gets its own transport: closing a client closes its transport.
+    # The player directory comes from the recorded API response only, never
+    # from a sleeper_players.json lying around in DATA_DIR
+    start = time.perf_counter()
+    sync_league(league_id, db_path=db_path, full=True, use_cache=False,
+                session=fixture_session(store, mode), transport=fixture_transport(store, mode),
+                import_legacy_players=False, **async_options)
+    timings['sleeper sync'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    season = conn.execute(
+        "SELECT MAX(season_year) FROM matchups WHERE league_id = ?", (league_id,)
+    ).fetchone()[0]
+    weeks, _ = db_projection_weeks(conn, season)
+    if weeks:
+        projections = fetch_all_projections(season, weeks, use_cache=False, session=fixture_session(store, mode),
+                                            transport=fixture_transport(store, mode), **async_options)
+        write_projections_to_db(conn, season, projections)
+    conn.close()
+    timings['projections'] = time.perf_counter() - start
+
+    if nfl_seasons and (mode == RECORD or os.path.isdir(store.nfl_dir)):
+        start = time.perf_counter()
+        if run_nfl_stage(store, mode, db_path, nfl_seasons) is not None:
+            timings['nflverse stats'] = time.perf_counter() - start
+    return timings
+
+
+def record(args):
+    store = FixtureStore(args.fixtures)
+    settings = {'league_id': args.league, 'nfl_seasons': args.nfl_seasons}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'pipeline.db')
+        timings = run_pipeline(store, RECORD, db_path, args.league, args.nfl_seasons, {})
+        digests = table_digests(db_path)
+
+    with open(os.path.join(args.fixtures, DIGEST_FILE), 'w') as f:
+        json.dump({'settings': settings, 'tables': digests}, f, indent=2)
+    print(f"\n✓ Recorded {store.recorded} responses to {args.fixtures} "
+          f"({sum(timings.values()):.1f}s against the live APIs)")
+
+
+def replay(args):
+    with open(os.path.join(args.fixtures, DIGEST_FILE)) as f:
+        expected = json.load(f)
+    settings = expected['settings']
+    # Without throttling the run measures the pipeline itself, not the rate limiter
+    async_options = {'rate_per_minute': 10 ** 6, 'burst': 10 ** 6} if args.unthrottled else {}
+
+    runs, ok = [], True
+    for run in range(args.repeat):
+        store = FixtureStore(args.fixtures, latency=args.latency, jitter=args.jitter, seed=run)
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'pipeline.db')
+            try:
+                timings = run_pipeline(store, REPLAY, db_path, settings['league_id'],
+                                       settings['nfl_seasons'], async_options)
+            except FixtureMissing as e:
+                print(f"✗ {e} (record the fixtures again)")
+                sys.exit(1)
+            digests = table_digests(db_path)
+        runs.append(timings)
+
+        for table, (rows, digest) in expected['tables'].items():
+            if digests.get(table) != [rows, digest]:
+                ok = False
+                print(f"✗ Run {run + 1}: {table} differs from the recording "
+                      f"({digests.get(table, [0])[0]} rows, expected {rows})")
+
+    print("\n" + "=" * 60)
+    print(f"PIPELINE REPLAY: {len(runs)} runs, {args.latency * 1000:.0f}ms "
+          f"(+{args.jitter * 1000:.0f}ms jitter) per request"
+          f"{', unthrottled' if args.unthrottled else ''}")
+    print("=" * 60)
+    for stage in runs[0]:
+        times = sorted(run[stage] for run in runs)
+        print(f"  {stage:16s} best {times[0]:7.3f}s  median {times[len(times) // 2]:7.3f}s")
+    total = sorted(sum(run.values()) for run in runs)
+    print(f"  {'total':16s} best {total[0]:7.3f}s  median {total[len(total) // 2]:7.3f}s")
+    print(f"\n{'✓ Every table matches the recording' if ok else '✗ Output differs from the recording'}")
+    if not ok:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('mode', choices=(RECORD, REPLAY))
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help="Fixture directory")
+    parser.add_argument('--league', default=DEFAULT_LEAGUE_ID, help="Sleeper league ID (record)")
+    parser.add_argument('--nfl-seasons', type=int, nargs='*', default=[], help="nflverse seasons (record)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added per replayed request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Up to this many extra seconds per request")
+    parser.add_argument('--repeat', type=int, default=3, help="Replay runs")
+    parser.add_argument('--unthrottled', action='store_true', help="Replay without the client rate limit")
+    args = parser.parse_args()
+
+    if args.mode == RECORD:
+        record(args)
+    else:
+        replay(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,10 @@ import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import config
+try:
+    from migrations import ensure_schema
+except ImportError:  # imported as scripts.data_manager (legacy dashboard)
+    from scripts.migrations import ensure_schema
 
 
 class DataManager:
@@ -31,261 +35,8 @@ class DataManager:
         self._init_database()
     
     def _init_database(self):
-        """Create database tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Teams table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS teams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                league_id INTEGER,
-                season_year INTEGER,
-                team_name TEXT,
-                owner TEXT,
-                rank INTEGER,
-                wins INTEGER,
-                losses INTEGER,
-                ties INTEGER,
-                points_for REAL,
-                points_against REAL,
-                streak TEXT,
-                scraped_at TIMESTAMP,
-                UNIQUE(league_id, season_year, team_name, scraped_at)
-            )
-        """)
-        
-        # Matchups table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS matchups (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                league_id INTEGER,
-                season_year INTEGER,
-                week INTEGER,
-                matchup_id INTEGER,
-                home_team TEXT,
-                home_score REAL,
-                home_projected REAL,
-                away_team TEXT,
-                away_score REAL,
-                away_projected REAL,
-                is_complete BOOLEAN,
-                scraped_at TIMESTAMP,
-                UNIQUE(league_id, season_year, week, matchup_id, scraped_at)
-            )
-        """)
-        
-        # Rosters table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rosters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                league_id INTEGER,
-                season_year INTEGER,
-                team_name TEXT,
-                player_name TEXT,
-                position TEXT,
-                nfl_team TEXT,
-                is_starter BOOLEAN,
-                points REAL,
-                status TEXT,
-                scraped_at TIMESTAMP
-            )
-        """)
-        
-        # Transactions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                league_id INTEGER,
-                season_year INTEGER,
-                date TEXT,
-                type TEXT,
-                team TEXT,
-                players_added TEXT,
-                players_dropped TEXT,
-                description TEXT,
-                scraped_at TIMESTAMP
-            )
-        """)
-        
-        # Player stats table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS player_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                league_id INTEGER,
-                season_year INTEGER,
-                player_name TEXT,
-                position TEXT,
-                nfl_team TEXT,
-                owned_by TEXT,
-                total_points REAL,
-                average_points REAL,
-                last_week_points REAL,
-                scraped_at TIMESTAMP
-            )
-        """)
-        
-        # Scrape metadata table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS scrape_metadata (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                league_id INTEGER,
-                season_year INTEGER,
-                scraped_at TIMESTAMP,
-                data_types TEXT,
-                success BOOLEAN,
-                notes TEXT
-            )
-        """)
-        
-        # NFL weekly stats table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS nfl_weekly_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player_id TEXT,
-                player_name TEXT,
-                player_display_name TEXT,
-                position TEXT,
-                position_group TEXT,
-                headshot_url TEXT,
-                recent_team TEXT,
-                season INTEGER,
-                week INTEGER,
-                season_type TEXT,
-                opponent_team TEXT,
-                completions INTEGER,
-                attempts INTEGER,
-                passing_yards REAL,
-                passing_tds INTEGER,
-                interceptions INTEGER,
-                sacks INTEGER,
-                sack_yards REAL,
-                sack_fumbles INTEGER,
-                sack_fumbles_lost INTEGER,
-                passing_air_yards REAL,
-                passing_yards_after_catch REAL,
-                passing_first_downs INTEGER,
-                passing_epa REAL,
-                passing_2pt_conversions INTEGER,
-                carries INTEGER,
-                rushing_yards REAL,
-                rushing_tds INTEGER,
-                rushing_fumbles INTEGER,
-                rushing_fumbles_lost INTEGER,
-                rushing_first_downs INTEGER,
-                rushing_epa REAL,
-                rushing_2pt_conversions INTEGER,
-                receptions INTEGER,
-                targets INTEGER,
-                receiving_yards REAL,
-                receiving_tds INTEGER,
-                receiving_fumbles INTEGER,
-                receiving_fumbles_lost INTEGER,
-                receiving_air_yards REAL,
-                receiving_yards_after_catch REAL,
-                receiving_first_downs INTEGER,
-                receiving_epa REAL,
-                receiving_2pt_conversions INTEGER,
-                racr REAL,
-                target_share REAL,
-                air_yards_share REAL,
-                wopr REAL,
-                special_teams_tds INTEGER,
-                fantasy_points REAL,
-                fantasy_points_ppr REAL,
-                UNIQUE(player_id, season, week, season_type)
-            )
-        """)
-        
-        # NFL player mapping table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS nfl_player_mapping (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                fantasy_player_name TEXT,
-                nfl_player_id TEXT,
-                nfl_player_name TEXT,
-                nfl_player_display_name TEXT,
-                position TEXT,
-                team TEXT,
-                confidence_score REAL,
-                created_at TIMESTAMP,
-                UNIQUE(fantasy_player_name, nfl_player_id)
-            )
-        """)
-        
-        # NFL team defense/special teams stats table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS nfl_team_defense_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                team TEXT,
-                team_abbr TEXT,
-                season INTEGER,
-                week INTEGER,
-                season_type TEXT,
-                opponent_team TEXT,
-                
-                -- Defensive Stats
-                def_sacks INTEGER DEFAULT 0,
-                def_sack_yards REAL DEFAULT 0.0,
-                def_qb_hits INTEGER DEFAULT 0,
-                def_tackles_for_loss INTEGER DEFAULT 0,
-                def_tackles_for_loss_yards REAL DEFAULT 0.0,
-                def_interceptions INTEGER DEFAULT 0,
-                def_interception_yards REAL DEFAULT 0.0,
-                def_passes_defended INTEGER DEFAULT 0,
-                def_fumbles_forced INTEGER DEFAULT 0,
-                def_fumbles_recovered INTEGER DEFAULT 0,
-                def_fumble_recovery_yards REAL DEFAULT 0.0,
-                
-                -- Scoring Stats
-                def_touchdowns INTEGER DEFAULT 0,
-                def_safeties INTEGER DEFAULT 0,
-                special_teams_tds INTEGER DEFAULT 0,
-                
-                -- Points Allowed (for fantasy scoring)
-                points_allowed INTEGER DEFAULT 0,
-                
-                -- Additional Stats
-                def_penalties INTEGER DEFAULT 0,
-                def_penalty_yards INTEGER DEFAULT 0,
-                
-                -- Fantasy Points
-                fantasy_points REAL DEFAULT 0.0,
-                fantasy_points_ppr REAL DEFAULT 0.0,
-                
-                UNIQUE(team, season, week, season_type)
-            )
-        """)
-        
-        # Create indexes for faster queries
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_nfl_weekly_stats_player 
-            ON nfl_weekly_stats(player_id, season, week)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_nfl_weekly_stats_name 
-            ON nfl_weekly_stats(player_display_name, season, week)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_nfl_player_mapping_fantasy_name 
-            ON nfl_player_mapping(fantasy_player_name)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_nfl_team_defense_team 
-            ON nfl_team_defense_stats(team, season, week)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_nfl_team_defense_abbr 
-            ON nfl_team_defense_stats(team_abbr, season, week)
-        """)
-        
-        conn.commit()
-        conn.close()
-        
+        """Create or upgrade the database schema"""
+        ensure_schema(self.db_path)
         print(f"✓ Database initialized: {self.db_path}")
     
     def save_to_json(self, data: Dict[Any, Any], filename: Optional[str] = None) -> str:
@@ -334,7 +85,8 @@ class DataManager:
             season_year = data.get('season_year', config.SEASON_YEAR)
             scraped_at = datetime.now().isoformat()
             
-            # Save standings
+            # Standings and matchups replace the row for their team-season /
+            # matchup (latest scrape wins); rosters and the rest stay snapshots
             standings = data.get('standings', [])
             for team in standings:
                 cursor.execute("""
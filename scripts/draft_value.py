@@ -0,0 +1,266 @@
+"""
+Draft value engine
+Joins draft_picks to season production and precomputes points scored,
+value over positional replacement (VOR) and VOR over the slot average
+(how much better a pick did than the same slot usually does) into draft_value.
+Runs as a batch job at ingest using set-based SQL (no per-pick lookups).
+"""
+import sqlite3
+from typing import Dict
+
+
+# Starting slots per team used to set the replacement level at each position
+# (FLEX spread across RB/WR)
+REPLACEMENT_SLOTS = {
+    'QB': 1,
+    'RB': 2.5,
+    'WR': 2.5,
+    'TE': 1,
+    'K': 1,
+    'D/ST': 1,
+}
+
+# Season point sources, each used only once its loader has created the tables
+# (a missing one reads as empty instead of failing the build)
+ESPN_POINTS = ("""
+    SELECT player_name, season_year, total_points AS points,
+           CAST(ROUND(total_points / NULLIF(average_points, 0)) AS INTEGER) AS games
+    FROM (
+        SELECT player_name, season_year, total_points, average_points,
+               ROW_NUMBER() OVER (
+                   PARTITION BY player_name, season_year ORDER BY total_points DESC
+               ) AS rn
+        FROM player_stats
+    )
+    WHERE rn = 1
+""", ('player_stats',))
+
+# Sleeper picks join nfl_weekly_stats by ID through the crosswalk, so players
+# sharing a display name don't borrow each other's points
+NFL_ID_POINTS = ("""
+    SELECT c.sleeper_id, n.season AS season_year,
+           SUM(n.fantasy_points_ppr) AS points, COUNT(*) AS games
+    FROM nfl_weekly_stats n
+    JOIN player_id_crosswalk c ON c.gsis_id = n.player_id
+    WHERE n.season_type = 'REG'
+    GROUP BY c.sleeper_id, n.season
+""", ('nfl_weekly_stats', 'player_id_crosswalk'))
+
+NFL_POINTS = ("""
+    SELECT bm.fantasy_player_name AS player_name, n.season AS season_year,
+           SUM(n.fantasy_points_ppr) AS points, COUNT(*) AS games
+    FROM nfl_weekly_stats n
+    JOIN (
+        SELECT fantasy_player_name, nfl_player_id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY fantasy_player_name ORDER BY confidence_score DESC
+               ) AS rn
+        FROM nfl_player_mapping
+    ) bm ON bm.nfl_player_id = n.player_id AND bm.rn = 1
+    WHERE n.season_type = 'REG'
+    GROUP BY bm.fantasy_player_name, n.season
+""", ('nfl_weekly_stats', 'nfl_player_mapping'))
+
+NO_POINTS = "SELECT NULL AS {key}, NULL AS season_year, NULL AS points, NULL AS games WHERE 0"
+
+
+def build_draft_value(conn: sqlite3.Connection) -> int:
+    """
+    Rebuild the draft_value table from draft_picks and season production
+
+    Season points come from one source per league-season so positions are
+    ranked on comparable numbers: player_stats (ESPN season totals),
+    nfl_weekly_stats (PPR, regular season; joined by Sleeper ID through
+    player_id_crosswalk or else by name through nfl_player_mapping) or the
+    league's own matchup_rosters points, whichever covers the most of that
+    draft's picks (earlier in that order on ties). Picks the source has no
+    points for count as 0; games come from the same source.
+    Replacement levels are set per league-season; a slot's expected VOR is
+    averaged over every draft with the same number of teams, and each pick's
+    vor_over_slot is its VOR minus that average.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        Number of picks valued
+    """
+    # Replacement slots as an inline VALUES table
+    slots_sql = " UNION ALL ".join(
+        f"SELECT '{pos}' AS position, {slots} AS slots" for pos, slots in REPLACEMENT_SLOTS.items()
+    )
+
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    espn_sql, nfl_id_sql, nfl_sql = (
+        sql if all(table in tables for table in needed) else NO_POINTS.format(key=key)
+        for (sql, needed), key in ((ESPN_POINTS, 'player_name'), (NFL_ID_POINTS, 'sleeper_id'),
+                                   (NFL_POINTS, 'player_name'))
+    )
+
+    conn.execute("DELETE FROM draft_value")
+    cursor = conn.execute(f"""
+        INSERT INTO draft_value (
+            league_id, season_year, round, pick, overall_pick, team, player_name, position,
+            points, points_source, games, position_rank, replacement_points, vor,
+            expected_vor, vor_over_slot
+        )
+        WITH espn_points AS ({espn_sql}),
+        nfl_id_points AS ({nfl_id_sql}),
+        nfl_points AS ({nfl_sql}),
+        roster_points AS (
+            SELECT league_id, player_name, season_year, SUM(points) AS points, COUNT(*) AS games
+            FROM (
+                SELECT DISTINCT league_id, season_year, week, player_name, points
+                FROM matchup_rosters
+            )
+            GROUP BY league_id, player_name, season_year
+        ),
+        pick_points AS (
+            SELECT d.league_id, d.season_year, d.round, d.pick, d.overall_pick, d.team,
+                   d.player_name,
+                   CASE WHEN d.position IN ('DEF', 'DST', 'D/ST') THEN 'D/ST' ELSE d.position END
+                       AS position,
+                   e.points AS espn_points, e.games AS espn_games,
+                   COALESCE(ni.points, n.points) AS nfl_points,
+                   CASE WHEN ni.points IS NOT NULL THEN ni.games ELSE n.games END AS nfl_games,
+                   r.points AS roster_points, r.games AS roster_games
+            FROM draft_picks d
+            LEFT JOIN espn_points e
+                ON e.player_name = d.player_name AND e.season_year = d.season_year
+            LEFT JOIN nfl_id_points ni
+                ON ni.sleeper_id = d.player_id AND ni.season_year = d.season_year
+            LEFT JOIN nfl_points n
+                ON n.player_name = d.player_name AND n.season_year = d.season_year
+            LEFT JOIN roster_points r
+                ON r.league_id = d.league_id AND r.player_name = d.player_name
+               AND r.season_year = d.season_year
+        ),
+        season_source AS (
+            SELECT league_id, season_year,
+                   CASE
+                       WHEN COUNT(espn_points) > 0 AND COUNT(espn_points) >= COUNT(nfl_points)
+                            AND COUNT(espn_points) >= COUNT(roster_points) THEN 'player_stats'
+                       WHEN COUNT(nfl_points) > 0
+                            AND COUNT(nfl_points) >= COUNT(roster_points) THEN 'nfl_weekly_stats'
+                       WHEN COUNT(roster_points) > 0 THEN 'matchup_rosters'
+                   END AS source
+            FROM pick_points
+            GROUP BY league_id, season_year
+        ),
+        sourced AS (
+            SELECT p.*, s.source,
+                   CASE s.source
+                       WHEN 'player_stats' THEN p.espn_points
+                       WHEN 'nfl_weekly_stats' THEN p.nfl_points
+                       WHEN 'matchup_rosters' THEN p.roster_points
+                   END AS source_points,
+                   CASE s.source
+                       WHEN 'player_stats' THEN p.espn_games
+                       WHEN 'nfl_weekly_stats' THEN p.nfl_games
+                       WHEN 'matchup_rosters' THEN p.roster_games
+                   END AS source_games
+            FROM pick_points p
+            JOIN season_source s ON s.league_id = p.league_id AND s.season_year = p.season_year
+        ),
+        picks AS (
+            SELECT league_id, season_year, round, pick, overall_pick, team, player_name, position,
+                   COALESCE(source_points, 0) AS points,
+                   CASE WHEN source_points IS NOT NULL THEN source END AS points_source,
+                   COALESCE(source_games, 0) AS games
+            FROM sourced
+        ),
+        ranked AS (
+            SELECT p.*,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY league_id, season_year, position ORDER BY points DESC
+                   ) AS position_rank,
+                   COUNT(*) OVER (PARTITION BY league_id, season_year, position) AS position_count
+            FROM picks p
+        ),
+        league_size AS (
+            SELECT league_id, season_year, COUNT(DISTINCT team) AS teams
+            FROM draft_picks
+            GROUP BY league_id, season_year
+        ),
+        slots AS ({slots_sql}),
+        replacement AS (
+            SELECT r.league_id, r.season_year, r.position, r.points AS replacement_points
+            FROM ranked r
+            JOIN league_size ls ON ls.league_id = r.league_id AND ls.season_year = r.season_year
+            LEFT JOIN slots s ON s.position = r.position
+            WHERE r.position_rank = MIN(
+                r.position_count,
+                CAST(ls.teams * COALESCE(s.slots, 1) + 0.999 AS INTEGER)
+            )
+        ),
+        valued AS (
+            SELECT r.*, ls.teams, COALESCE(rp.replacement_points, 0) AS replacement_points,
+                   r.points - COALESCE(rp.replacement_points, 0) AS vor
+            FROM ranked r
+            JOIN league_size ls ON ls.league_id = r.league_id AND ls.season_year = r.season_year
+            LEFT JOIN replacement rp
+                ON rp.league_id = r.league_id AND rp.season_year = r.season_year
+               AND rp.position = r.position
+        )
+        SELECT league_id, season_year, round, pick, overall_pick, team, player_name, position,
+               ROUND(points, 2), points_source, games, position_rank,
+               ROUND(replacement_points, 2), ROUND(vor, 2),
+               ROUND(AVG(vor) OVER (PARTITION BY teams, overall_pick), 2),
+               ROUND(vor - AVG(vor) OVER (PARTITION BY teams, overall_pick), 2)
+        FROM valued
+    """)
+    count = cursor.rowcount
+
+    conn.commit()
+    return count
+
+
+def best_draft_slots(conn: sqlite3.Connection) -> Dict:
+    """
+    All-time draft value aggregated by draft slot and by round
+
+    Args:
+        conn: Open database connection (row_factory = sqlite3.Row)
+
+    Returns:
+        Dict with 'slots' (by pick within round, best first) and 'rounds'
+    """
+    cursor = conn.execute("""
+        SELECT pick AS slot,
+               COUNT(*) AS picks,
+               COUNT(DISTINCT season_year) AS seasons,
+               ROUND(AVG(points), 1) AS avg_points,
+               ROUND(AVG(vor), 1) AS avg_vor,
+               ROUND(SUM(vor), 1) AS total_vor,
+               ROUND(100.0 * SUM(vor > 0) / COUNT(*), 1) AS hit_rate
+        FROM draft_value
+        GROUP BY pick
+        ORDER BY avg_vor DESC
+    """)
+    slots = [dict(row) for row in cursor.fetchall()]
+
+    cursor = conn.execute("""
+        SELECT round,
+               COUNT(*) AS picks,
+               ROUND(AVG(points), 1) AS avg_points,
+               ROUND(AVG(vor), 1) AS avg_vor,
+               ROUND(100.0 * SUM(vor > 0) / COUNT(*), 1) AS hit_rate,
+               ROUND(MAX(vor_over_slot), 1) AS best_vor_over_slot
+        FROM draft_value
+        GROUP BY round
+        ORDER BY round
+    """)
+    rounds = [dict(row) for row in cursor.fetchall()]
+
+    return {'slots': slots, 'rounds': rounds}
+
+
+if __name__ == "__main__":
+    import sys
+    from migrations import migrate
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else '../data/espn_fantasy.db'
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    print(f"✓ Valued {build_draft_value(conn)} draft picks")
+    conn.close()
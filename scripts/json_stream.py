@@ -0,0 +1,152 @@
+"""
+Streaming JSON helpers for season files and the Sleeper players dump
+Reads one top-level member (e.g. one week of matchups) at a time with ijson,
+and writes files back the same way, so peak memory tracks the largest week
+rather than the whole file. Without ijson everything falls back to json.load.
+"""
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import ijson
+    HAVE_IJSON = True
+except ImportError:
+    HAVE_IJSON = False
+
+
+# Placeholder left in a shell for members that are streamed separately
+STREAMED = object()
+
+_OPEN_EVENTS = ('start_map', 'start_array')
+_CLOSE_EVENTS = ('end_map', 'end_array')
+
+
+def _consume_value(events, builder=None):
+    """Read exactly one JSON value from an ijson event stream"""
+    depth = 0
+    for _, event, value in events:
+        if builder is not None:
+            builder.event(event, value)
+        if event in _OPEN_EVENTS:
+            depth += 1
+        elif event in _CLOSE_EVENTS:
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def load_shell(path: str, streamed: Iterable[str] = ('matchups',)) -> Dict[str, Any]:
+    """
+    Load a JSON object file without its large members
+
+    Args:
+        path: JSON file whose top level is an object
+        streamed: Top-level keys to leave out (read them with iter_members)
+
+    Returns:
+        Dict of the remaining members, in file order, with STREAMED in place
+        of each skipped member
+    """
+    streamed = set(streamed)
+
+    if not HAVE_IJSON:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return {key: STREAMED if key in streamed else value for key, value in data.items()}
+
+    shell = {}
+    with open(path, 'rb') as f:
+        events = ijson.parse(f, use_float=True)
+        for prefix, event, value in events:
+            if prefix != '' or event != 'map_key':
+                continue
+            if value in streamed:
+                shell[value] = STREAMED
+                _consume_value(events)
+            else:
+                builder = ijson.ObjectBuilder()
+                _consume_value(events, builder)
+                shell[value] = builder.value
+    return shell
+
+
+def iter_members(path: str, key: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (name, value) pairs of one top-level object member, one at a time
+
+    e.g. iter_members(season_file, 'matchups') yields (week, week_matchups)
+    """
+    if not HAVE_IJSON:
+        with open(path, 'r') as f:
+            members = json.load(f).get(key) or {}
+        yield from members.items()
+        return
+
+    with open(path, 'rb') as f:
+        yield from ijson.kvitems(f, key, use_float=True)
+
+
+def iter_object(path: str) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) pairs of a top-level object (e.g. the players dump)"""
+    yield from iter_members(path, '') if HAVE_IJSON else _iter_loaded(path)
+
+
+def _iter_loaded(path: str) -> Iterator[Tuple[str, Any]]:
+    with open(path, 'r') as f:
+        yield from json.load(f).items()
+
+
+def _indented(value: Any, level: int) -> str:
+    """json.dumps(value, indent=2) shifted to sit `level` levels deep"""
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * level)
+
+
+def dump_streaming(path: str, shell: Dict[str, Any],
+                   streams: Optional[Dict[str, Iterable[Tuple[str, Any]]]] = None, compact: bool = False):
+    """
+    Write a JSON object file, pulling STREAMED members from iterators
+
+    Output is identical to json.dump(data, f, indent=2), or to
+    json.dump(data, f, separators=(',', ':')) when compact. The file is
+    written to a temporary path and swapped in at the end, so the streams may
+    read from the file being replaced.
+
+    Args:
+        path: Destination file
+        shell: Top-level members in order (STREAMED where a stream is used)
+        streams: key -> iterable of (name, value) pairs for STREAMED members
+        compact: No indentation or whitespace (several times smaller)
+    """
+    streams = streams or {}
+    if compact:
+        dumps = lambda value, level: json.dumps(value, separators=(',', ':'))
+        newline = lambda level: ''
+        colon = ':'
+    else:
+        dumps = _indented
+        newline = lambda level: '\n' + '  ' * level
+        colon = ': '
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, 'w') as f:
+        if not shell:
+            f.write('{}')
+        else:
+            f.write('{')
+            for i, (key, value) in enumerate(shell.items()):
+                f.write(',' if i else '')
+                f.write(f"{newline(1)}{json.dumps(key)}{colon}")
+                if value is not STREAMED:
+                    f.write(dumps(value, 1))
+                    continue
+
+                empty = True
+                for name, member in streams.get(key, ()):
+                    f.write('{' if empty else ',')
+                    f.write(f"{newline(2)}{json.dumps(name)}{colon}{dumps(member, 2)}")
+                    empty = False
+                f.write('{}' if empty else newline(1) + '}')
+            f.write(newline(0) + '}')
+
+    os.replace(tmp_path, path)
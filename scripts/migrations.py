@@ -0,0 +1,747 @@
+"""
+Versioned database schema
+Every table and index lives in one ordered registry. The database records how
+many migrations it has applied in PRAGMA user_version, so an up-to-date
+database is recognised with a single integer read, and pending migrations run
+once each, in order, each in its own transaction.
+
+Databases created before versioning report user_version 0; the early
+migrations only create what is missing and add columns that are absent.
+Tables first created by DataManager kept one teams/matchups row per scrape
+(UNIQUE over scraped_at, INTEGER league_id); a later migration rebuilds them
+into the shared one-row-per-team-season / per-matchup layout, keeping the
+most recent scrape of each, so every database ends up with the same keys.
+"""
+import re
+import sqlite3
+from typing import Callable, List, Sequence, Tuple, Union
+
+Step = Union[str, Callable[[sqlite3.Cursor], None]]
+
+
+def add_columns(table: str, columns: Sequence[Tuple[str, str]]) -> Callable[[sqlite3.Cursor], None]:
+    """Migration step adding any of `columns` (name, type) missing from `table`"""
+    def step(cursor: sqlite3.Cursor):
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, col_type in columns:
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+    return step
+
+
+BASE_TABLES = (
+    # League standings (one row per team-season)
+    """
+    CREATE TABLE IF NOT EXISTS teams (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id TEXT,
+        season_year INTEGER,
+        team_name TEXT,
+        owner TEXT,
+        rank INTEGER,
+        wins INTEGER,
+        losses INTEGER,
+        ties INTEGER,
+        points_for REAL,
+        points_against REAL,
+        data_source TEXT,
+        streak TEXT,
+        scraped_at TIMESTAMP,
+        UNIQUE(league_id, season_year, team_name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS matchups (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id TEXT,
+        season_year INTEGER,
+        week INTEGER,
+        matchup_id TEXT,
+        home_team TEXT,
+        home_score REAL,
+        home_projected REAL,
+        away_team TEXT,
+        away_score REAL,
+        away_projected REAL,
+        bracket_type TEXT,
+        round TEXT,
+        is_two_week_playoff BOOLEAN,
+        home_total_score REAL,
+        away_total_score REAL,
+        is_complete BOOLEAN,
+        data_source TEXT,
+        scraped_at TIMESTAMP,
+        UNIQUE(league_id, season_year, week, matchup_id, home_team, away_team)
+    )
+    """,
+    # Every player in every matchup
+    """
+    CREATE TABLE IF NOT EXISTS matchup_rosters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id TEXT,
+        season_year INTEGER,
+        week INTEGER,
+        matchup_id TEXT,
+        team_name TEXT,
+        player_name TEXT,
+        position TEXT,
+        nfl_team TEXT,
+        points REAL,
+        projected REAL,
+        started BOOLEAN,
+        UNIQUE(league_id, season_year, week, matchup_id, team_name, player_name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS draft_picks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id TEXT,
+        season_year INTEGER,
+        round INTEGER,
+        pick INTEGER,
+        overall_pick INTEGER,
+        team TEXT,
+        player_name TEXT,
+        position TEXT,
+        nfl_team TEXT,
+        data_source TEXT,
+        UNIQUE(league_id, season_year, overall_pick)
+    )
+    """,
+    # Live scraper snapshots (DataManager)
+    """
+    CREATE TABLE IF NOT EXISTS rosters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id INTEGER,
+        season_year INTEGER,
+        team_name TEXT,
+        player_name TEXT,
+        position TEXT,
+        nfl_team TEXT,
+        is_starter BOOLEAN,
+        points REAL,
+        status TEXT,
+        scraped_at TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id INTEGER,
+        season_year INTEGER,
+        date TEXT,
+        type TEXT,
+        team TEXT,
+        players_added TEXT,
+        players_dropped TEXT,
+        description TEXT,
+        scraped_at TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS player_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id INTEGER,
+        season_year INTEGER,
+        player_name TEXT,
+        position TEXT,
+        nfl_team TEXT,
+        owned_by TEXT,
+        total_points REAL,
+        average_points REAL,
+        last_week_points REAL,
+        scraped_at TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS scrape_metadata (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id INTEGER,
+        season_year INTEGER,
+        scraped_at TIMESTAMP,
+        data_types TEXT,
+        success BOOLEAN,
+        notes TEXT
+    )
+    """,
+    # nflverse weekly player stats
+    """
+    CREATE TABLE IF NOT EXISTS nfl_weekly_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_id TEXT,
+        player_name TEXT,
+        player_display_name TEXT,
+        position TEXT,
+        position_group TEXT,
+        headshot_url TEXT,
+        recent_team TEXT,
+        season INTEGER,
+        week INTEGER,
+        season_type TEXT,
+        opponent_team TEXT,
+        completions INTEGER,
+        attempts INTEGER,
+        passing_yards REAL,
+        passing_tds INTEGER,
+        interceptions INTEGER,
+        sacks INTEGER,
+        sack_yards REAL,
+        sack_fumbles INTEGER,
+        sack_fumbles_lost INTEGER,
+        passing_air_yards REAL,
+        passing_yards_after_catch REAL,
+        passing_first_downs INTEGER,
+        passing_epa REAL,
+        passing_2pt_conversions INTEGER,
+        carries INTEGER,
+        rushing_yards REAL,
+        rushing_tds INTEGER,
+        rushing_fumbles INTEGER,
+        rushing_fumbles_lost INTEGER,
+        rushing_first_downs INTEGER,
+        rushing_epa REAL,
+        rushing_2pt_conversions INTEGER,
+        receptions INTEGER,
+        targets INTEGER,
+        receiving_yards REAL,
+        receiving_tds INTEGER,
+        receiving_fumbles INTEGER,
+        receiving_fumbles_lost INTEGER,
+        receiving_air_yards REAL,
+        receiving_yards_after_catch REAL,
+        receiving_first_downs INTEGER,
+        receiving_epa REAL,
+        receiving_2pt_conversions INTEGER,
+        racr REAL,
+        target_share REAL,
+        air_yards_share REAL,
+        wopr REAL,
+        special_teams_tds INTEGER,
+        fantasy_points REAL,
+        fantasy_points_ppr REAL,
+        UNIQUE(player_id, season, week, season_type)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS nfl_player_mapping (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fantasy_player_name TEXT,
+        nfl_player_id TEXT,
+        nfl_player_name TEXT,
+        nfl_player_display_name TEXT,
+        position TEXT,
+        team TEXT,
+        confidence_score REAL,
+        created_at TIMESTAMP,
+        UNIQUE(fantasy_player_name, nfl_player_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS nfl_team_defense_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        team TEXT,
+        team_abbr TEXT,
+        season INTEGER,
+        week INTEGER,
+        season_type TEXT,
+        opponent_team TEXT,
+        def_sacks INTEGER DEFAULT 0,
+        def_sack_yards REAL DEFAULT 0.0,
+        def_qb_hits INTEGER DEFAULT 0,
+        def_tackles_for_loss INTEGER DEFAULT 0,
+        def_tackles_for_loss_yards REAL DEFAULT 0.0,
+        def_interceptions INTEGER DEFAULT 0,
+        def_interception_yards REAL DEFAULT 0.0,
+        def_passes_defended INTEGER DEFAULT 0,
+        def_fumbles_forced INTEGER DEFAULT 0,
+        def_fumbles_recovered INTEGER DEFAULT 0,
+        def_fumble_recovery_yards REAL DEFAULT 0.0,
+        def_touchdowns INTEGER DEFAULT 0,
+        def_safeties INTEGER DEFAULT 0,
+        special_teams_tds INTEGER DEFAULT 0,
+        points_allowed INTEGER DEFAULT 0,
+        def_penalties INTEGER DEFAULT 0,
+        def_penalty_yards INTEGER DEFAULT 0,
+        fantasy_points REAL DEFAULT 0.0,
+        fantasy_points_ppr REAL DEFAULT 0.0,
+        UNIQUE(team, season, week, season_type)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_nfl_weekly_stats_player ON nfl_weekly_stats(player_id, season, week)",
+    "CREATE INDEX IF NOT EXISTS idx_nfl_weekly_stats_name ON nfl_weekly_stats(player_display_name, season, week)",
+    "CREATE INDEX IF NOT EXISTS idx_nfl_player_mapping_fantasy_name ON nfl_player_mapping(fantasy_player_name)",
+    "CREATE INDEX IF NOT EXISTS idx_nfl_team_defense_team ON nfl_team_defense_stats(team, season, week)",
+    "CREATE INDEX IF NOT EXISTS idx_nfl_team_defense_abbr ON nfl_team_defense_stats(team_abbr, season, week)",
+)
+
+# teams/matchups used to be created by whichever of DataManager or
+# populate_database ran first; give either layout the other's columns
+RECONCILE_LEAGUE_TABLES = (
+    add_columns('teams', [('data_source', 'TEXT'), ('streak', 'TEXT'), ('scraped_at', 'TIMESTAMP')]),
+    add_columns('matchups', [
+        ('bracket_type', 'TEXT'),
+        ('round', 'TEXT'),
+        ('is_two_week_playoff', 'BOOLEAN'),
+        ('home_total_score', 'REAL'),
+        ('away_total_score', 'REAL'),
+        ('is_complete', 'BOOLEAN'),
+        ('data_source', 'TEXT'),
+    ]),
+)
+
+KICKER_COLUMNS = (
+    add_columns('nfl_weekly_stats', [
+        ('fg_made', 'INTEGER DEFAULT 0'),
+        ('fg_att', 'INTEGER DEFAULT 0'),
+        ('fg_missed', 'INTEGER DEFAULT 0'),
+        ('fg_blocked', 'INTEGER DEFAULT 0'),
+        ('fg_long', 'INTEGER DEFAULT 0'),
+        ('fg_pct', 'REAL DEFAULT 0.0'),
+        ('fg_made_0_19', 'INTEGER DEFAULT 0'),
+        ('fg_made_20_29', 'INTEGER DEFAULT 0'),
+        ('fg_made_30_39', 'INTEGER DEFAULT 0'),
+        ('fg_made_40_49', 'INTEGER DEFAULT 0'),
+        ('fg_made_50_59', 'INTEGER DEFAULT 0'),
+        ('fg_made_60_', 'INTEGER DEFAULT 0'),
+        ('fg_missed_0_19', 'INTEGER DEFAULT 0'),
+        ('fg_missed_20_29', 'INTEGER DEFAULT 0'),
+        ('fg_missed_30_39', 'INTEGER DEFAULT 0'),
+        ('fg_missed_40_49', 'INTEGER DEFAULT 0'),
+        ('fg_missed_50_59', 'INTEGER DEFAULT 0'),
+        ('fg_missed_60_', 'INTEGER DEFAULT 0'),
+        ('pat_made', 'INTEGER DEFAULT 0'),
+        ('pat_att', 'INTEGER DEFAULT 0'),
+        ('pat_missed', 'INTEGER DEFAULT 0'),
+        ('pat_blocked', 'INTEGER DEFAULT 0'),
+        ('pat_pct', 'REAL DEFAULT 0.0'),
+        ('gwfg_att', 'INTEGER DEFAULT 0'),
+        ('gwfg_made', 'INTEGER DEFAULT 0'),
+    ]),
+)
+
+# Per-file/per-week content hashes for incremental reloads
+CONTENT_HASHES = (
+    add_columns('scrape_metadata', [('source_file', 'TEXT'), ('week', 'INTEGER'), ('content_hash', 'TEXT')]),
+    "CREATE INDEX IF NOT EXISTS idx_scrape_metadata_source ON scrape_metadata(source_file, week)",
+)
+
+# Sleeper player IDs (NULL for ESPN seasons) and the Sleeper -> nflverse crosswalk
+PLAYER_IDS = (
+    add_columns('matchup_rosters', [('player_id', 'TEXT')]),
+    add_columns('draft_picks', [('player_id', 'TEXT')]),
+    "CREATE INDEX IF NOT EXISTS idx_matchup_rosters_player_id ON matchup_rosters(player_id)",
+    """
+    CREATE TABLE IF NOT EXISTS player_id_crosswalk (
+        sleeper_id TEXT PRIMARY KEY,
+        gsis_id TEXT NOT NULL,
+        espn_id TEXT,
+        full_name TEXT,
+        position TEXT,
+        team TEXT,
+        updated_at TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_player_id_crosswalk_gsis ON player_id_crosswalk(gsis_id)",
+)
+
+# Tables rebuilt from the league data (draft_value.py, ratings.py, rescoring.py)
+DERIVED_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS draft_value (
+        league_id TEXT,
+        season_year INTEGER,
+        round INTEGER,
+        pick INTEGER,
+        overall_pick INTEGER,
+        team TEXT,
+        player_name TEXT,
+        position TEXT,
+        points REAL,
+        points_source TEXT,
+        games INTEGER,
+        position_rank INTEGER,
+        replacement_points REAL,
+        vor REAL,
+        expected_vor REAL,
+        roi REAL,
+        PRIMARY KEY (season_year, overall_pick)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_draft_value_slot ON draft_value(round, pick)",
+    """
+    CREATE TABLE IF NOT EXISTS ratings (
+        owner TEXT,
+        season_year INTEGER,
+        week INTEGER,
+        rating REAL,
+        rating_change REAL,
+        opponent TEXT,
+        margin REAL,
+        PRIMARY KEY (owner, season_year, week)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_ratings_week ON ratings(season_year, week)",
+    """
+    CREATE TABLE IF NOT EXISTS scoring_rulesets (
+        ruleset_hash TEXT PRIMARY KEY,
+        rules TEXT,
+        created_at TIMESTAMP
+    )
+    """,
+    # One row per NFL player-week per ruleset
+    """
+    CREATE TABLE IF NOT EXISTS rescored_player_weeks (
+        ruleset_hash TEXT,
+        player_id TEXT,
+        season INTEGER,
+        week INTEGER,
+        season_type TEXT,
+        points REAL,
+        PRIMARY KEY (ruleset_hash, player_id, season, week, season_type)
+    )
+    """,
+    # One row per fantasy team-week per ruleset (started players only)
+    """
+    CREATE TABLE IF NOT EXISTS rescored_lineups (
+        ruleset_hash TEXT,
+        season_year INTEGER,
+        week INTEGER,
+        team_name TEXT,
+        points REAL,
+        starters INTEGER,
+        rescored_starters INTEGER,
+        PRIMARY KEY (ruleset_hash, season_year, week, team_name)
+    )
+    """,
+)
+
+# Lookups the API and the loaders run on every request / reload
+QUERY_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_matchups_season_week ON matchups(season_year, week)",
+    "CREATE INDEX IF NOT EXISTS idx_matchup_rosters_week ON matchup_rosters(season_year, week, team_name)",
+    "CREATE INDEX IF NOT EXISTS idx_draft_picks_season ON draft_picks(season_year, team)",
+    "CREATE INDEX IF NOT EXISTS idx_nfl_player_mapping_player ON nfl_player_mapping(nfl_player_id)",
+)
+
+# Sleeper transactions are upserted by their own ID, one week at a time
+TRANSACTION_KEYS = (
+    add_columns('transactions', [
+        ('week', 'INTEGER'),
+        ('transaction_id', 'TEXT'),
+        ('status', 'TEXT'),
+        ('data_source', 'TEXT'),
+    ]),
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_source_id ON transactions(league_id, transaction_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_season_week ON transactions(season_year, week)",
+)
+
+# Sleeper's player directory (player_directory.py); `data` is the full record
+PLAYER_DIRECTORY = (
+    """
+    CREATE TABLE IF NOT EXISTS sleeper_players (
+        player_id TEXT PRIMARY KEY,
+        first_name TEXT,
+        last_name TEXT,
+        full_name TEXT,
+        position TEXT,
+        team TEXT,
+        gsis_id TEXT,
+        espn_id TEXT,
+        data TEXT,
+        content_hash TEXT,
+        updated_at TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sleeper_players_gsis ON sleeper_players(gsis_id)",
+)
+
+# Sleeper season files and syncs (scrape_metadata.source_file) name their league
+SLEEPER_SOURCE_FILE = re.compile(r'^sleeper_(?:sync_)?(\d+)_(\d{4})(?:\.json)?$')
+
+
+def _rekey_sleeper_rows(cursor: sqlite3.Cursor):
+    """
+    Sleeper rows used to be stored under league_id '' (the loader looked for
+    the ID in the raw file layout); file them under their league's ID, read
+    from the name of the file or sync that loaded them
+    """
+    cursor.execute("SELECT DISTINCT source_file FROM scrape_metadata WHERE source_file LIKE 'sleeper%'")
+    for (source_file,) in cursor.fetchall():
+        match = SLEEPER_SOURCE_FILE.match(source_file)
+        if not match:
+            continue
+        league_id, season = match.group(1), int(match.group(2))
+        for table in ('teams', 'matchups', 'matchup_rosters', 'draft_picks', 'draft_value',
+                      'transactions', 'scrape_metadata'):
+            cursor.execute(f"UPDATE {table} SET league_id = ? WHERE league_id = '' AND season_year = ?",
+                           (league_id, season))
+
+
+SLEEPER_LEAGUE_KEYS = (
+    _rekey_sleeper_rows,
+    "CREATE INDEX IF NOT EXISTS idx_matchups_league_season ON matchups(league_id, season_year, week)",
+)
+
+# Sleeper transactions flattened to one row per asset moved, and the current
+# owners of traded future picks (both replaced by the loaders, never edited)
+TRANSACTION_ASSETS = (
+    """
+    CREATE TABLE IF NOT EXISTS transaction_assets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id TEXT,
+        season_year INTEGER,
+        week INTEGER,
+        transaction_id TEXT,
+        date TEXT,
+        type TEXT,
+        asset_type TEXT,
+        player_id TEXT,
+        player_name TEXT,
+        position TEXT,
+        from_team TEXT,
+        to_team TEXT,
+        pick_season TEXT,
+        pick_round INTEGER,
+        pick_original_team TEXT,
+        amount INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_transaction_assets_txn ON transaction_assets(transaction_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transaction_assets_player ON transaction_assets(player_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transaction_assets_type ON transaction_assets(season_year, type, asset_type)",
+    "CREATE INDEX IF NOT EXISTS idx_transaction_assets_to_team ON transaction_assets(to_team)",
+    "CREATE INDEX IF NOT EXISTS idx_transaction_assets_from_team ON transaction_assets(from_team)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_season_type ON transactions(season_year, type)",
+    """
+    CREATE TABLE IF NOT EXISTS traded_picks (
+        league_id TEXT,
+        season_year INTEGER,
+        pick_season TEXT,
+        round INTEGER,
+        roster_id INTEGER,
+        original_team TEXT,
+        owner_team TEXT,
+        previous_owner_team TEXT,
+        PRIMARY KEY (league_id, pick_season, round, roster_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_traded_picks_owner ON traded_picks(owner_team)",
+)
+
+# Several leagues can share a season: derived tables are keyed by league too.
+# They only hold values rebuilt from the league data, so they are recreated
+# empty and refilled by the next load (ratings replay from FIRST_SEASON).
+# leagues links each Sleeper season to the previous one (every season of a
+# Sleeper league has its own ID) so ratings carry over along the chain.
+LEAGUE_SCOPED_DERIVED = (
+    """
+    CREATE TABLE IF NOT EXISTS leagues (
+        league_id TEXT PRIMARY KEY,
+        season_year INTEGER,
+        previous_league_id TEXT
+    )
+    """,
+    """
+    INSERT OR IGNORE INTO leagues (league_id, season_year)
+    SELECT CAST(league_id AS TEXT), MAX(season_year) FROM teams
+    WHERE league_id IS NOT NULL AND league_id != ''
+    GROUP BY league_id
+    """,
+    "DROP TABLE IF EXISTS draft_value",
+    """
+    CREATE TABLE draft_value (
+        league_id TEXT,
+        season_year INTEGER,
+        round INTEGER,
+        pick INTEGER,
+        overall_pick INTEGER,
+        team TEXT,
+        player_name TEXT,
+        position TEXT,
+        points REAL,
+        points_source TEXT,
+        games INTEGER,
+        position_rank INTEGER,
+        replacement_points REAL,
+        vor REAL,
+        expected_vor REAL,
+        roi REAL,
+        PRIMARY KEY (league_id, season_year, overall_pick)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_draft_value_slot ON draft_value(round, pick)",
+    "CREATE INDEX IF NOT EXISTS idx_draft_value_season ON draft_value(season_year, league_id)",
+    "DROP TABLE IF EXISTS ratings",
+    """
+    CREATE TABLE ratings (
+        league_id TEXT,
+        owner TEXT,
+        season_year INTEGER,
+        week INTEGER,
+        rating REAL,
+        rating_change REAL,
+        opponent TEXT,
+        margin REAL,
+        PRIMARY KEY (league_id, owner, season_year, week)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_ratings_week ON ratings(season_year, week)",
+    "DROP TABLE IF EXISTS rescored_lineups",
+    """
+    CREATE TABLE rescored_lineups (
+        ruleset_hash TEXT,
+        league_id TEXT,
+        season_year INTEGER,
+        week INTEGER,
+        team_name TEXT,
+        points REAL,
+        starters INTEGER,
+        rescored_starters INTEGER,
+        PRIMARY KEY (ruleset_hash, league_id, season_year, week, team_name)
+    )
+    """,
+)
+
+# draft_value.roi was VOR minus the slot's average VOR, not a return ratio
+DRAFT_VALUE_VOR_OVER_SLOT = (
+    "ALTER TABLE draft_value RENAME COLUMN roi TO vor_over_slot",
+)
+
+def _snapshot_layout(cursor: sqlite3.Cursor, table: str) -> bool:
+    """True for DataManager's old layout (a UNIQUE key over scraped_at or an INTEGER league_id)"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if any(row[1] == 'league_id' and row[2].upper() == 'INTEGER' for row in cursor.fetchall()):
+        return True
+    cursor.execute(f"PRAGMA index_list({table})")
+    for index in [row[1] for row in cursor.fetchall() if row[2]]:
+        cursor.execute(f"PRAGMA index_info({index})")
+        if 'scraped_at' in {row[2] for row in cursor.fetchall()}:
+            return True
+    return False
+
+
+def rebuild_snapshot_table(table: str, create_sql: str,
+                           indexes: Sequence[str] = ()) -> Callable[[sqlite3.Cursor], None]:
+    """
+    Migration step moving a DataManager snapshot table into the shared layout:
+    rows are copied oldest scrape first, so INSERT OR REPLACE keeps the latest
+    """
+    def step(cursor: sqlite3.Cursor):
+        if not _snapshot_layout(cursor, table):
+            return
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_snapshots")
+        cursor.execute(create_sql)
+        cursor.execute(f"PRAGMA table_info({table})")
+        new_columns = [row[1] for row in cursor.fetchall() if row[1] != 'id']
+        cursor.execute(f"PRAGMA table_info({table}_snapshots)")
+        old_columns = {row[1] for row in cursor.fetchall()}
+        columns = [name for name in new_columns if name in old_columns]
+        select = ', '.join('CAST(league_id AS TEXT)' if name == 'league_id' else name for name in columns)
+        cursor.execute(f"""
+            INSERT OR REPLACE INTO {table} ({', '.join(columns)})
+            SELECT {select} FROM {table}_snapshots ORDER BY scraped_at, id
+        """)
+        cursor.execute(f"DROP TABLE {table}_snapshots")
+        for index in indexes:
+            cursor.execute(index)
+    return step
+
+
+# DataManager-created teams/matchups get the keys every other loader writes with
+DATA_MANAGER_LAYOUT = (
+    rebuild_snapshot_table('teams', BASE_TABLES[0]),
+    rebuild_snapshot_table('matchups', BASE_TABLES[1], (QUERY_INDEXES[0], SLEEPER_LEAGUE_KEYS[1])),
+)
+
+# Ratings now carry over into the league that replaced an earlier one; the
+# stored ones were rated without that link, so they replay from FIRST_SEASON
+RATINGS_ACROSS_LEAGUES = (
+    "DELETE FROM ratings",
+)
+
+# Applied in order; a database at user_version N has run the first N.
+# Append only - never edit or reorder a migration that has shipped.
+MIGRATIONS: List[Tuple[str, Sequence[Step]]] = [
+    ("base tables", BASE_TABLES),
+    ("reconcile teams/matchups layouts", RECONCILE_LEAGUE_TABLES),
+    ("kicker stat columns", KICKER_COLUMNS),
+    ("scrape_metadata content hashes", CONTENT_HASHES),
+    ("Sleeper player IDs and crosswalk", PLAYER_IDS),
+    ("derived tables", DERIVED_TABLES),
+    ("query indexes", QUERY_INDEXES),
+    ("Sleeper transaction keys", TRANSACTION_KEYS),
+    ("Sleeper player directory", PLAYER_DIRECTORY),
+    ("Sleeper rows keyed by league", SLEEPER_LEAGUE_KEYS),
+    ("Sleeper transaction assets and traded picks", TRANSACTION_ASSETS),
+    ("league-scoped derived tables", LEAGUE_SCOPED_DERIVED),
+    ("draft_value.roi renamed vor_over_slot", DRAFT_VALUE_VOR_OVER_SLOT),
+    ("DataManager teams/matchups in the shared layout", DATA_MANAGER_LAYOUT),
+    ("ratings replayed across replaced leagues", RATINGS_ACROSS_LEAGUES),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Number of migrations applied to this database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply pending migrations
+
+    Each migration runs in its own IMMEDIATE transaction together with the
+    user_version bump, so a failure leaves the database at the previous
+    version and concurrent callers never apply the same migration twice.
+
+    Args:
+        conn: Open database connection (any open transaction is committed)
+
+    Returns:
+        Number of migrations applied (0 when already current)
+    """
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return 0
+
+    if conn.in_transaction:
+        conn.commit()
+
+    applied = 0
+    cursor = conn.cursor()
+    while True:
+        cursor.execute("BEGIN IMMEDIATE")
+        version = schema_version(conn)
+        if version >= SCHEMA_VERSION:
+            conn.rollback()
+            return applied
+
+        description, steps = MIGRATIONS[version]
+        try:
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            print(f"✗ Migration {version + 1} ({description}) failed")
+            raise
+        applied += 1
+
+
+def ensure_schema(db_path: str) -> int:
+    """
+    Bring the database at `db_path` (created if missing) up to date
+
+    Returns:
+        Number of migrations applied
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        return migrate(conn)
+    finally:
+        conn.close()
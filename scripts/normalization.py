@@ -0,0 +1,478 @@
+"""
+League data normalization shared by the loaders and the dashboards
+Converts ESPN (including the 2019 roster layout) and Sleeper season files to
+one structure. Standard library only, so ingest workers can import it without
+pulling in a web framework.
+
+Whole seasons go through normalize_data(); to keep one week in memory at a
+time, normalize the season with normalize_season() and feed the raw weeks
+(e.g. json_stream.iter_members(path, 'matchups')) to iter_normalized_weeks().
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Roster display order (starters first, then bench, each in this order)
+POSITION_ORDER = {
+    'QB': 1,
+    'RB': 2,
+    'WR': 3,
+    'TE': 4,
+    'FLEX': 5,
+    'D/ST': 6,
+    'DEF': 6,  # Defense alias
+    'K': 7
+}
+
+
+def clean_sleeper_player_name(name):
+    """Remove (TEAM POS) suffix from Sleeper player names"""
+    if name and '(' in name and ')' in name:
+        return name.split('(')[0].strip()
+    return name
+
+
+def sleeper_player_name(player_id, players):
+    """Display name for a Sleeper player ID: "Name (TEAM POS)", or "DEN D/ST" for defenses"""
+    if not player_id:
+        return "Unknown"
+
+    # Handle defense teams (like 'DEN', 'KC', etc)
+    if isinstance(player_id, str) and len(player_id) <= 3 and player_id.isupper():
+        return f"{player_id} D/ST"
+
+    player = players.get(str(player_id), {})
+    if not player:
+        return f"Player {player_id}"
+
+    first = player.get('first_name', '')
+    last = player.get('last_name', '')
+    pos = player.get('position', '')
+    team = player.get('team', '')
+
+    name = f"{first} {last}".strip()
+    if not name:
+        name = f"Player {player_id}"
+
+    if pos and team:
+        return f"{name} ({team} {pos})"
+    elif pos:
+        return f"{name} ({pos})"
+    return name
+
+
+def sort_roster_by_position(roster):
+    """
+    Sort roster with starters first (in position order), then bench.
+    Position order: QB, RB, WR, TE, FLEX, D/ST, K
+    """
+    return sorted(roster, key=lambda p: (not p.get('started'),
+                                         POSITION_ORDER.get(p.get('position', 'ZZ'), 99)))
+
+
+def normalize_espn_roster(roster, is_bench=False):
+    """Convert old ESPN roster format (2019) to new format"""
+    normalized = []
+    for player in roster:
+        # Handle old format (2019) - has 'player' instead of 'player_name'
+        if 'player' in player and 'player_name' not in player:
+            # Parse team_pos like "Ten QB" to get team and position
+            parts = (player.get('team_pos') or '').split()
+            normalized.append({
+                'player_name': player.get('player'),
+                'position': parts[1] if len(parts) > 1 else player.get('slot', 'N/A'),
+                'nfl_team': parts[0] if parts else '',
+                'points': player.get('fpts', 0),
+                'projected': player.get('proj', 0),
+                'started': not is_bench and player.get('slot', '').lower() != 'bench'
+            })
+        else:
+            # Already in new format
+            normalized.append(player)
+    return normalized
+
+
+def normalize_espn_week(week_matchups):
+    """Normalize one week of ESPN matchups in place (benches folded into rosters)"""
+    for matchup in week_matchups:
+        for side in ('home', 'away'):
+            roster_key, bench_key = f'{side}_roster', f'{side}_bench'
+            if matchup.get(roster_key):
+                matchup[roster_key] = normalize_espn_roster(matchup[roster_key])
+            if matchup.get(bench_key):
+                matchup[roster_key].extend(normalize_espn_roster(matchup[bench_key], is_bench=True))
+                del matchup[bench_key]
+    return week_matchups
+
+
+def normalize_espn_data(data):
+    """Normalize ESPN data to handle different field name formats (2019 vs later years)"""
+    for week_matchups in data.get('matchups', {}).values():
+        normalize_espn_week(week_matchups)
+    return data
+
+
+def sleeper_standings(data) -> List[Dict]:
+    """Sleeper rosters + users as ESPN-style standings, in final order"""
+    users = {u['user_id']: u for u in data.get('users', [])}
+
+    standings = []
+    for roster in data.get('rosters', []):
+        settings = roster.get('settings', {})
+        user = users.get(roster.get('owner_id'), {})
+        standings.append({
+            'rank': settings.get('final_rank', 0),  # Use final_rank if available
+            'team_name': user.get('metadata', {}).get('team_name') or user.get('display_name', 'Unknown'),
+            'owner': user.get('display_name', 'Unknown'),
+            'wins': settings.get('wins', 0),
+            'losses': settings.get('losses', 0),
+            'ties': settings.get('ties', 0),
+            'points_for': settings.get('fpts', 0) + settings.get('fpts_decimal', 0) / 100,
+            'points_against': settings.get('fpts_against', 0) + settings.get('fpts_against_decimal', 0) / 100,
+            'roster_id': roster.get('roster_id'),
+            'final_rank': settings.get('final_rank')  # Keep final_rank for sorting
+        })
+
+    # Sort by final_rank if available, otherwise by wins then points
+    if any(team.get('final_rank') for team in standings):
+        return sorted(standings, key=lambda x: x.get('final_rank', 999))
+
+    standings.sort(key=lambda x: (x['wins'], x['points_for']), reverse=True)
+    for i, team in enumerate(standings, 1):
+        team['rank'] = i
+    return standings
+
+
+def sleeper_draft(data, roster_to_team: Dict[Any, str]) -> Dict:
+    """Sleeper drafts as ESPN-style draft info and picks"""
+    drafts = data.get('drafts', [])
+    draft_info = drafts[0] if drafts else {}
+    draft_start_time = draft_info.get('start_time')
+
+    picks = []
+    for draft in drafts:
+        for idx, pick in enumerate(draft.get('picks', []), 1):
+            player_info = pick.get('player_info', {})
+            metadata = pick.get('metadata', {})
+            roster_id = pick.get('roster_id')
+            picks.append({
+                'round': pick.get('round'),
+                'pick': pick.get('pick_no'),
+                'overall_pick': idx,
+                'team': roster_to_team.get(roster_id, f"Team {roster_id}"),
+                'player_name': clean_sleeper_player_name(pick.get('player_name', 'Unknown')),
+                'position': player_info.get('position') or metadata.get('position', 'N/A'),
+                'nfl_team': player_info.get('team') or metadata.get('team', ''),
+                'player_id': pick.get('player_id'),
+                'picked_by': pick.get('picked_by'),
+                'roster_id': roster_id,
+                'metadata': metadata,
+                'player_info': player_info
+            })
+
+    return {
+        'picks': picks,
+        'draft_type': draft_info.get('type', 'snake').capitalize(),
+        'draft_date': (datetime.fromtimestamp(draft_start_time / 1000).strftime('%B %d, %Y')
+                       if draft_start_time else 'Unknown')
+    }
+
+
+def normalize_season(data, source, players: Optional[Dict[str, Dict]] = None) -> Dict:
+    """
+    Everything but the matchups, normalized ('matchups' is left empty)
+
+    Args:
+        data: Raw season file (matchups may be missing, e.g. a json_stream shell)
+        source: 'espn' or 'sleeper'
+        players: Sleeper player_id -> player dict; when given, the file's
+            per-week transactions are flattened too (Sleeper only)
+    """
+    if source != 'sleeper':
+        return {**data, '_source': 'espn', 'matchups': {}}
+
+    standings = sleeper_standings(data)
+    roster_to_team = {s['roster_id']: s['team_name'] for s in standings}
+    transactions, assets = [], []
+    if players is not None:
+        for week, week_transactions in (data.get('transactions') or {}).items():
+            if str(week).isdigit():
+                transactions += normalize_sleeper_transactions(week, week_transactions, roster_to_team, players)
+                assets += sleeper_transaction_assets(week, week_transactions, roster_to_team, players)
+    return {
+        '_source': 'sleeper',
+        'scraped_at': data.get('scraped_at', ''),
+        'season_year': int(data.get('season', 2025)),
+        'league_id': data.get('league', {}).get('league_id', ''),
+        'previous_league_id': data.get('league', {}).get('previous_league_id'),
+        'standings': standings,
+        'matchups': {},
+        'draft': sleeper_draft(data, roster_to_team),
+        'transactions': transactions,
+        'transaction_assets': assets,
+        'traded_picks': normalize_sleeper_traded_picks(data.get('traded_picks') or [], roster_to_team)
+    }
+
+
+def _sleeper_roster(team: Dict, players: Dict[str, Dict]) -> Tuple[List[Dict], float]:
+    """One side of a Sleeper matchup as an ESPN-style roster and its projected total"""
+    roster = []
+    for p in team.get('players_with_names', []):
+        player_id = p.get('player_id')
+        player_info = players.get(player_id, {})
+        roster.append({
+            'player_name': clean_sleeper_player_name(p.get('player_name', 'Unknown')),
+            'position': player_info.get('position', 'N/A'),
+            'nfl_team': player_info.get('team', ''),
+            'points': p.get('points', 0),
+            'projected': p.get('projected', 0),
+            'started': p.get('is_starter', False),
+            'player_id': player_id
+        })
+    roster = sort_roster_by_position(roster)
+    return roster, sum(p['projected'] for p in roster if p.get('started'))
+
+
+def normalize_sleeper_week(week, week_matchups, season_year: int,
+                           roster_to_team: Dict[Any, str], players: Dict[str, Dict]) -> List[Dict]:
+    """
+    One week of Sleeper matchups (one entry per roster) as ESPN-style matchups
+
+    Args:
+        week: Week key from the season file
+        week_matchups: Raw Sleeper matchup entries for the week
+        season_year: Season the week belongs to
+        roster_to_team: roster_id -> team name
+        players: Sleeper player_id -> player dict (position/team lookups)
+    """
+    # Pair the two rosters of each matchup_id
+    matchup_groups = defaultdict(list)
+    for m in week_matchups:
+        matchup_groups[m.get('matchup_id')].append(m)
+
+    normalized = []
+    for matchup_id, teams in matchup_groups.items():
+        if len(teams) != 2:
+            continue
+        team1, team2 = teams
+        home_roster, home_projected = _sleeper_roster(team1, players)
+        away_roster, away_projected = _sleeper_roster(team2, players)
+
+        matchup = {
+            'week': int(week),
+            'season': season_year,
+            'matchup_id': matchup_id,
+            'home_team': roster_to_team.get(team1.get('roster_id'), f"Team {team1.get('roster_id')}"),
+            'away_team': roster_to_team.get(team2.get('roster_id'), f"Team {team2.get('roster_id')}"),
+            'home_score': team1.get('points', 0),
+            'away_score': team2.get('points', 0),
+            'home_projected': home_projected,
+            'away_projected': away_projected,
+            'home_roster': home_roster,
+            'away_roster': away_roster
+        }
+
+        bracket_type = team1.get('bracket_type') or team2.get('bracket_type')
+        if bracket_type:
+            matchup['bracket_type'] = bracket_type
+
+        normalized.append(matchup)
+    return normalized
+
+
+def normalize_sleeper_transactions(week, transactions: List[Dict], roster_to_team: Dict[Any, str],
+                                   players: Dict[str, Dict]) -> List[Dict]:
+    """
+    One week of Sleeper transactions as flat rows (completed ones only)
+
+    Args:
+        week: Week (Sleeper "round") the transactions belong to
+        transactions: Raw Sleeper transactions for the week
+        roster_to_team: roster_id -> team name
+        players: Sleeper player_id -> player dict (names)
+    """
+    def team_of(roster_id):
+        return _sleeper_team(roster_to_team, roster_id)
+
+    def names(player_ids):
+        return [clean_sleeper_player_name(sleeper_player_name(pid, players)) for pid in player_ids]
+
+    rows = []
+    for txn in transactions:
+        if txn.get('status') != 'complete' or not txn.get('transaction_id'):
+            continue
+        adds = txn.get('adds') or {}
+        drops = txn.get('drops') or {}
+        roster_ids = txn.get('roster_ids') or sorted(set(adds.values()) | set(drops.values()))
+
+        parts = []
+        for roster_id in roster_ids:
+            added = names(pid for pid, rid in adds.items() if rid == roster_id)
+            dropped = names(pid for pid, rid in drops.items() if rid == roster_id)
+            verbs = ([f"added {', '.join(added)}"] if added else []) + \
+                    ([f"dropped {', '.join(dropped)}"] if dropped else [])
+            if verbs:
+                parts.append(f"{team_of(roster_id)} {' and '.join(verbs)}")
+        bid = (txn.get('settings') or {}).get('waiver_bid')
+
+        rows.append({
+            'transaction_id': str(txn['transaction_id']),
+            'week': int(week),
+            'date': _sleeper_transaction_date(txn),
+            'type': txn.get('type'),
+            'status': txn.get('status'),
+            'team': ', '.join(team_of(rid) for rid in roster_ids),
+            'players_added': ', '.join(names(adds)),
+            'players_dropped': ', '.join(names(drops)),
+            'description': '; '.join(parts) + (f" (${bid} FAAB)" if bid else '')
+        })
+    return rows
+
+
+def _sleeper_team(roster_to_team: Dict[Any, str], roster_id) -> Optional[str]:
+    if roster_id is None:
+        return None
+    return roster_to_team.get(roster_id, f"Team {roster_id}")
+
+
+def _sleeper_transaction_date(txn: Dict) -> Optional[str]:
+    timestamp = txn.get('status_updated') or txn.get('created')
+    return datetime.fromtimestamp(timestamp / 1000).isoformat() if timestamp else None
+
+
+def sleeper_transaction_assets(week, transactions: List[Dict], roster_to_team: Dict[Any, str],
+                               players: Dict[str, Dict]) -> List[Dict]:
+    """
+    One week of Sleeper transactions as one row per asset moved (completed ones only)
+
+    Players, draft picks and traded FAAB each get a row with the team they
+    left (from_team, None for free agents/waivers) and the team they joined
+    (to_team, None for drops). Waiver adds carry the winning bid in 'amount'.
+
+    Args:
+        week: Week (Sleeper "round") the transactions belong to
+        transactions: Raw Sleeper transactions for the week
+        roster_to_team: roster_id -> team name
+        players: Sleeper player_id -> player dict (names, positions)
+    """
+    rows = []
+    for txn in transactions:
+        if txn.get('status') != 'complete' or not txn.get('transaction_id'):
+            continue
+        base = {
+            'transaction_id': str(txn['transaction_id']),
+            'week': int(week),
+            'date': _sleeper_transaction_date(txn),
+            'type': txn.get('type'),
+        }
+        adds = txn.get('adds') or {}
+        drops = txn.get('drops') or {}
+        bid = (txn.get('settings') or {}).get('waiver_bid') if txn.get('type') == 'waiver' else None
+
+        def player_row(player_id, from_roster, to_roster, amount=None):
+            return {
+                **base,
+                'asset_type': 'player',
+                'player_id': player_id,
+                'player_name': clean_sleeper_player_name(sleeper_player_name(player_id, players)),
+                'position': (players.get(player_id) or {}).get('position'),
+                'from_team': _sleeper_team(roster_to_team, from_roster),
+                'to_team': _sleeper_team(roster_to_team, to_roster),
+                'amount': amount,
+            }
+
+        # A player in both adds and drops changed teams (trade); otherwise a pickup or a release
+        for player_id, roster_id in adds.items():
+            rows.append(player_row(player_id, drops.get(player_id), roster_id, bid))
+        for player_id, roster_id in drops.items():
+            if player_id not in adds:
+                rows.append(player_row(player_id, roster_id, None))
+
+        for pick in txn.get('draft_picks') or []:
+            rows.append({
+                **base,
+                'asset_type': 'pick',
+                'from_team': _sleeper_team(roster_to_team, pick.get('previous_owner_id')),
+                'to_team': _sleeper_team(roster_to_team, pick.get('owner_id')),
+                'pick_season': str(pick.get('season')),
+                'pick_round': pick.get('round'),
+                'pick_original_team': _sleeper_team(roster_to_team, pick.get('roster_id')),
+            })
+
+        for budget in txn.get('waiver_budget') or []:
+            rows.append({
+                **base,
+                'asset_type': 'faab',
+                'from_team': _sleeper_team(roster_to_team, budget.get('sender')),
+                'to_team': _sleeper_team(roster_to_team, budget.get('receiver')),
+                'amount': budget.get('amount'),
+            })
+    return rows
+
+
+def normalize_sleeper_traded_picks(traded_picks: List[Dict], roster_to_team: Dict[Any, str]) -> List[Dict]:
+    """Current owner of every traded future pick (league/{id}/traded_picks)"""
+    return [
+        {
+            'pick_season': str(pick.get('season')),
+            'round': pick.get('round'),
+            'roster_id': pick.get('roster_id'),
+            'original_team': _sleeper_team(roster_to_team, pick.get('roster_id')),
+            'owner_team': _sleeper_team(roster_to_team, pick.get('owner_id')),
+            'previous_owner_team': _sleeper_team(roster_to_team, pick.get('previous_owner_id')),
+        }
+        for pick in traded_picks
+    ]
+
+
+def iter_normalized_weeks(weeks: Iterable[Tuple[Any, List[Dict]]], source, season: Optional[Dict] = None,
+                          players: Optional[Dict[str, Dict]] = None) -> Iterator[Tuple[Any, List[Dict]]]:
+    """
+    Normalize raw weeks one at a time
+
+    Args:
+        weeks: (week, raw week matchups) pairs, e.g. data['matchups'].items()
+        source: 'espn' or 'sleeper'
+        season: normalize_season() output (Sleeper team names and season year)
+        players: Sleeper player_id -> player dict (Sleeper only)
+
+    Yields:
+        (week, normalized week matchups)
+    """
+    if source != 'sleeper':
+        for week, week_matchups in weeks:
+            yield week, normalize_espn_week(week_matchups)
+        return
+
+    season = season or {}
+    players = players or {}
+    season_year = season.get('season_year')
+    roster_to_team = {s['roster_id']: s['team_name'] for s in season.get('standings', [])}
+    for week, week_matchups in weeks:
+        yield week, normalize_sleeper_week(week, week_matchups, season_year, roster_to_team, players)
+
+
+def normalize_data(data, source, players: Optional[Dict[str, Dict]] = None):
+    """
+    Normalize data structure between ESPN and Sleeper formats
+
+    Args:
+        data: Raw season file
+        source: 'espn' or 'sleeper'
+        players: Sleeper player_id -> player dict for position/team lookups
+
+    Returns:
+        ESPN data normalized in place, or a new ESPN-style dict for Sleeper
+        (with the raw file under '_raw_sleeper' for advanced views)
+    """
+    if source != 'sleeper':
+        # ESPN data - normalize field names (handles 2019 format)
+        data['_source'] = 'espn'
+        return normalize_espn_data(data)
+
+    normalized = normalize_season(data, source)
+    normalized['matchups'] = dict(
+        iter_normalized_weeks(data.get('matchups', {}).items(), source, normalized, players)
+    )
+    normalized['_raw_sleeper'] = data
+    return normalized
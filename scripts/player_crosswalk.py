@@ -0,0 +1,76 @@
+"""
+Sleeper -> nflverse player ID crosswalk
+Sleeper's player directory carries each player's GSIS ID, which is the
+player_id used by nflverse (nfl_weekly_stats). Storing the pairs lets Sleeper
+rosters join to NFL stats by ID instead of by display name.
+"""
+import sqlite3
+from typing import Dict, Tuple
+
+
+def refresh_crosswalk(conn: sqlite3.Connection) -> int:
+    """
+    Rebuild the crosswalk from the Sleeper player directory (sleeper_players)
+
+    Rescored lineups resolve starters through the crosswalk, so their cache
+    is dropped when any Sleeper -> GSIS pair changed.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        Number of players with a GSIS ID
+    """
+    pairs_sql = "SELECT sleeper_id, gsis_id FROM player_id_crosswalk"
+    before = set(conn.execute(pairs_sql))
+    conn.execute("DELETE FROM player_id_crosswalk")
+    cursor = conn.execute("""
+        INSERT OR REPLACE INTO player_id_crosswalk
+        (sleeper_id, gsis_id, espn_id, full_name, position, team, updated_at)
+        SELECT player_id, gsis_id, espn_id, full_name, position, team, updated_at
+        FROM sleeper_players
+        WHERE gsis_id IS NOT NULL
+    """)
+    count = cursor.rowcount
+    if set(conn.execute(pairs_sql)) != before:
+        conn.execute("DELETE FROM rescored_lineups")
+    conn.commit()
+    return count
+
+
+def crosswalk_ids(conn: sqlite3.Connection) -> Dict[str, Tuple]:
+    """
+    League players resolved through their Sleeper IDs
+
+    Keyed by Sleeper ID so two players sharing a display name stay apart.
+
+    Returns:
+        Dict of Sleeper ID -> (gsis_id, full_name, position, team, names) for
+        every roster or draft entry whose Sleeper ID is in the crosswalk, where
+        names are the league display names recorded for that ID
+    """
+    cursor = conn.execute("""
+        SELECT c.sleeper_id, c.gsis_id, c.full_name, c.position, c.team, r.player_name
+        FROM (
+            SELECT DISTINCT player_name, player_id FROM matchup_rosters WHERE player_id IS NOT NULL
+            UNION
+            SELECT DISTINCT player_name, player_id FROM draft_picks WHERE player_id IS NOT NULL
+        ) r
+        JOIN player_id_crosswalk c ON c.sleeper_id = r.player_id
+        ORDER BY c.sleeper_id, r.player_name
+    """)
+    players = {}
+    for sleeper_id, gsis_id, full_name, position, team, name in cursor.fetchall():
+        players.setdefault(sleeper_id, (gsis_id, full_name, position, team, []))[4].append(name)
+    return {sleeper_id: (*player[:4], tuple(player[4])) for sleeper_id, player in players.items()}
+
+
+if __name__ == "__main__":
+    import sys
+    from migrations import migrate
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else '../data/espn_fantasy.db'
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    print(f"✓ Crosswalked {refresh_crosswalk(conn)} Sleeper players to GSIS IDs")
+    conn.close()
@@ -0,0 +1,195 @@
+"""
+Sleeper player directory
+The ~10k-player directory from Sleeper's players/nfl endpoint, stored in the
+sleeper_players table instead of a 5 MB JSON file. Lookups read one row by
+player_id and are kept in a bounded in-process LRU; a refresh hashes each
+player and upserts only the ones that changed. Every refresh is logged in
+scrape_metadata, so staleness is measured from when the directory was
+actually downloaded.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from json_stream import iter_object
+    from migrations import ensure_schema
+except ImportError:  # imported as scripts.player_directory (dashboards)
+    from scripts.json_stream import iter_object
+    from scripts.migrations import ensure_schema
+
+# scrape_metadata.source_file of directory refreshes
+DIRECTORY_SOURCE = 'players/nfl'
+
+DEFAULT_MAX_AGE_HOURS = 24
+DEFAULT_CACHE_SIZE = 4096
+
+PLAYER_UPSERT = """
+    INSERT INTO sleeper_players
+    (player_id, first_name, last_name, full_name, position, team, gsis_id, espn_id,
+     data, content_hash, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(player_id) DO UPDATE SET
+        first_name = excluded.first_name, last_name = excluded.last_name,
+        full_name = excluded.full_name, position = excluded.position, team = excluded.team,
+        gsis_id = excluded.gsis_id, espn_id = excluded.espn_id, data = excluded.data,
+        content_hash = excluded.content_hash, updated_at = excluded.updated_at
+"""
+
+
+def player_hash(player: Dict) -> str:
+    """Content hash of one directory entry (key order independent)"""
+    canonical = json.dumps(player, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _player_row(player_id: str, player: Dict, digest: str, updated_at: str) -> Tuple:
+    full_name = player.get('full_name') or \
+        f"{player.get('first_name') or ''} {player.get('last_name') or ''}".strip()
+    espn_id = player.get('espn_id')
+    return (
+        player_id,
+        player.get('first_name'),
+        player.get('last_name'),
+        full_name,
+        player.get('position'),
+        player.get('team'),
+        (player.get('gsis_id') or '').strip() or None,
+        str(espn_id) if espn_id else None,
+        json.dumps(player),
+        digest,
+        updated_at
+    )
+
+
+class PlayerDirectory:
+    """
+    Sleeper players by ID, read lazily from the database
+
+    Supports the dict reads the normalizers use (get, [], in), so it can be
+    passed wherever a player_id -> player dict was.
+    """
+
+    def __init__(self, db_path: str, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Open the directory (the schema must be current, see open_player_directory)
+
+        Args:
+            db_path: SQLite database holding sleeper_players
+            cache_size: Player records kept in the in-process LRU
+        """
+        self.db_path = db_path
+        # Shared by the dashboards' request threads; lookups are single SELECTs
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lookup = lru_cache(maxsize=cache_size)(self._load)
+
+    def close(self):
+        self.conn.close()
+
+    def _load(self, player_id: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT data FROM sleeper_players WHERE player_id = ?", (player_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # LOOKUPS
+
+    def get(self, player_id, default=None):
+        """Full Sleeper record for a player ID (default when unknown)"""
+        player = self._lookup(str(player_id))
+        return player if player is not None else default
+
+    def __getitem__(self, player_id) -> Dict:
+        player = self._lookup(str(player_id))
+        if player is None:
+            raise KeyError(player_id)
+        return player
+
+    def __contains__(self, player_id) -> bool:
+        return self._lookup(str(player_id)) is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM sleeper_players").fetchone()[0]
+
+    def cache_info(self):
+        """LRU statistics (hits, misses, maxsize, currsize)"""
+        return self._lookup.cache_info()
+
+    # FRESHNESS
+
+    def refreshed_at(self) -> Optional[datetime]:
+        """When the directory was last downloaded (None if it never was)"""
+        row = self.conn.execute("""
+            SELECT MAX(scraped_at) FROM scrape_metadata
+            WHERE source_file = ? AND success = 1
+        """, (DIRECTORY_SOURCE,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def is_stale(self, max_age_hours: float = DEFAULT_MAX_AGE_HOURS) -> bool:
+        """True when the directory is empty or older than max_age_hours"""
+        refreshed = self.refreshed_at()
+        return refreshed is None or datetime.now() - refreshed > timedelta(hours=max_age_hours)
+
+    # REFRESH
+
+    def refresh(self, players: Iterable[Tuple[str, Dict]], fetched_at: Optional[datetime] = None,
+                remove_missing: bool = True) -> Tuple[int, int]:
+        """
+        Bring the table in line with a full directory download
+
+        Args:
+            players: (player_id, record) pairs, e.g. get_all_players().items()
+            fetched_at: When the directory was downloaded (default: now)
+            remove_missing: Delete players that are no longer in the directory
+
+        Returns:
+            (players inserted or changed, players removed)
+        """
+        fetched_at = (fetched_at or datetime.now()).isoformat()
+        stored = dict(self.conn.execute("SELECT player_id, content_hash FROM sleeper_players"))
+
+        changed = []
+        for player_id, player in players:
+            if not isinstance(player, dict):
+                continue
+            player_id = str(player_id)
+            digest = player_hash(player)
+            if stored.pop(player_id, None) != digest:
+                changed.append(_player_row(player_id, player, digest, fetched_at))
+        removed = list(stored) if remove_missing else []
+
+        with self.conn:
+            self.conn.executemany(PLAYER_UPSERT, changed)
+            self.conn.executemany("DELETE FROM sleeper_players WHERE player_id = ?",
+                                  [(player_id,) for player_id in removed])
+            self.conn.execute("""
+                INSERT INTO scrape_metadata (scraped_at, data_types, success, notes, source_file)
+                VALUES (?, 'players', 1, ?, ?)
+            """, (fetched_at, f"{len(changed)} changed, {len(removed)} removed", DIRECTORY_SOURCE))
+
+        self._lookup.cache_clear()
+        return len(changed), len(removed)
+
+    def import_players_file(self, path: str) -> int:
+        """
+        One-time import of a legacy sleeper_players.json, dated by its mtime
+
+        Does nothing once the directory has been refreshed.
+
+        Returns:
+            Number of players imported
+        """
+        if self.refreshed_at() is not None or not os.path.exists(path):
+            return 0
+        # Streamed, so the dump is never fully loaded
+        return self.refresh(iter_object(path), fetched_at=datetime.fromtimestamp(os.path.getmtime(path)))[0]
+
+
+def open_player_directory(db_path: str, cache_size: int = DEFAULT_CACHE_SIZE) -> PlayerDirectory:
+    """Upgrade the schema if needed and open the player directory"""
+    ensure_schema(db_path)
+    return PlayerDirectory(db_path, cache_size)
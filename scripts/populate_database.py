@@ -4,296 +4,723 @@ Populate SQLite database with all fantasy league data (ESPN 2019-2024 + Sleeper
 import json
 import os
 import glob
+import hashlib
+import math
 import sqlite3
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 import config
+from draft_value import build_draft_value
+from json_stream import load_shell, iter_members
+from migrations import ensure_schema
+from normalization import normalize_season, iter_normalized_weeks
+from player_directory import PlayerDirectory
+from ratings import update_ratings, invalidate_ratings
+from rescoring import invalidate_rescored_weeks
 
-def init_enhanced_database(db_path):
-    """Create enhanced database schema with roster storage"""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Enhanced matchups table with additional fields
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS matchups (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            league_id TEXT,
-            season_year INTEGER,
-            week INTEGER,
-            matchup_id TEXT,
-            home_team TEXT,
-            home_score REAL,
-            home_projected REAL,
-            away_team TEXT,
-            away_score REAL,
-            away_projected REAL,
-            bracket_type TEXT,
-            round TEXT,
-            is_two_week_playoff BOOLEAN,
-            home_total_score REAL,
-            away_total_score REAL,
-            data_source TEXT,
-            scraped_at TIMESTAMP,
-            UNIQUE(league_id, season_year, week, matchup_id, home_team, away_team)
-        )
-    """)
-    
-    # Matchup rosters table (stores all players in each matchup)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS matchup_rosters (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            league_id TEXT,
-            season_year INTEGER,
-            week INTEGER,
-            matchup_id TEXT,
-            team_name TEXT,
-            player_name TEXT,
-            position TEXT,
-            nfl_team TEXT,
-            points REAL,
-            projected REAL,
-            started BOOLEAN,
-            UNIQUE(league_id, season_year, week, matchup_id, team_name, player_name)
-        )
-    """)
-    
-    # Teams/Standings table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS teams (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            league_id TEXT,
-            season_year INTEGER,
-            team_name TEXT,
-            owner TEXT,
-            rank INTEGER,
-            wins INTEGER,
-            losses INTEGER,
-            ties INTEGER,
-            points_for REAL,
-            points_against REAL,
-            data_source TEXT,
-            UNIQUE(league_id, season_year, team_name)
-        )
-    """)
-    
-    # Draft picks table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS draft_picks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            league_id TEXT,
-            season_year INTEGER,
-            round INTEGER,
-            pick INTEGER,
-            overall_pick INTEGER,
-            team TEXT,
-            player_name TEXT,
-            position TEXT,
-            nfl_team TEXT,
-            data_source TEXT,
-            UNIQUE(league_id, season_year, overall_pick)
-        )
-    """)
-    
-    conn.commit()
-    conn.close()
-    print(f"✓ Enhanced database initialized: {db_path}")
+# Load-time pragmas: the database is rebuilt from source files, so durability
+# is traded for speed while loading. WAL keeps API readers unblocked.
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
 
+TEAM_INSERT = """
+    INSERT OR REPLACE INTO teams 
+    (league_id, season_year, team_name, owner, rank, wins, losses, ties, 
+     points_for, points_against, data_source)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
-def populate_from_json(json_file, data_source, db_path):
-    """Populate database from a single JSON file"""
-    print(f"\nProcessing: {os.path.basename(json_file)} ({data_source})")
-    
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    
-    # Normalize data (using app's normalize_data function for both ESPN and Sleeper)
-    import sys
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-    from app import normalize_data
-    data = normalize_data(data, data_source)
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+MATCHUP_INSERT = """
+    INSERT OR REPLACE INTO matchups
+    (league_id, season_year, week, matchup_id, home_team, home_score, 
+     home_projected, away_team, away_score, away_projected, bracket_type,
+     round, is_two_week_playoff, home_total_score, away_total_score,
+     data_source, scraped_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ROSTER_INSERT = """
+    INSERT OR REPLACE INTO matchup_rosters
+    (league_id, season_year, week, matchup_id, team_name,
+     player_name, position, nfl_team, points, projected, started, player_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+PICK_INSERT = """
+    INSERT OR REPLACE INTO draft_picks
+    (league_id, season_year, round, pick, overall_pick, team,
+     player_name, position, nfl_team, data_source, player_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Sleeper transactions carry their own ID, so re-syncing a week updates in place
+TRANSACTION_UPSERT = """
+    INSERT INTO transactions
+    (league_id, season_year, week, transaction_id, date, type, status, team,
+     players_added, players_dropped, description, data_source, scraped_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(league_id, transaction_id) DO UPDATE SET
+        season_year = excluded.season_year, week = excluded.week, date = excluded.date,
+        type = excluded.type, status = excluded.status, team = excluded.team,
+        players_added = excluded.players_added, players_dropped = excluded.players_dropped,
+        description = excluded.description, scraped_at = excluded.scraped_at
+"""
+
+# One row per player / pick / FAAB moved; replaced per transaction
+ASSET_INSERT = """
+    INSERT INTO transaction_assets
+    (league_id, season_year, week, transaction_id, date, type, asset_type, player_id,
+     player_name, position, from_team, to_team, pick_season, pick_round, pick_original_team, amount)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+TRADED_PICK_INSERT = """
+    INSERT OR REPLACE INTO traded_picks
+    (league_id, season_year, pick_season, round, roster_id, original_team, owner_team, previous_owner_team)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# One row per league-season; previous_league_id chains a Sleeper league's seasons
+LEAGUE_UPSERT = """
+    INSERT OR REPLACE INTO leagues (league_id, season_year, previous_league_id)
+    VALUES (?, ?, ?)
+"""
+
+# Overlay for build_load_batches input that leaves out the season-level slice
+# (standings, draft, Sleeper transactions and traded picks)
+NO_SEASON_SLICE = {'standings': [], 'draft': {}, 'transactions': [], 'transaction_assets': [],
+                   'traded_picks': None}
+
+
+def open_load_connection(db_path):
+    """Open a connection configured for bulk loading"""
+    conn = sqlite3.connect(db_path, isolation_level=None)  # explicit BEGIN/COMMIT
+    for pragma in LOAD_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class BadValue(ValueError):
+    """A field value that can't be stored in its column"""
+
+
+def as_number(value, field, integer=False):
+    """
+    A numeric column value: None/'' -> None, bools and numeric strings converted
+
+    Raises:
+        BadValue: If the value is not a finite number (or not whole, for integer)
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise BadValue(f"non-numeric {field} {value!r:.40}") from None
+    if not math.isfinite(number) or (integer and not number.is_integer()):
+        raise BadValue(f"invalid {field} {value!r:.40}")
+    return int(number) if integer else (value if isinstance(value, (int, float)) else number)
+
+
+def as_text(value, field):
+    """
+    A text column value: strings as they are, numbers as strings
+
+    Raises:
+        BadValue: For lists, dicts and other values SQLite can't bind
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    raise BadValue(f"{field} is a {type(value).__name__}")
+
+
+def _report_bad(bad_rows, kind, error, context):
+    """Collect a row that failed conversion, or raise when the caller keeps no bad_rows"""
+    if bad_rows is None:
+        raise error
+    bad_rows.append((kind, str(error), context))
+
+
+def transaction_batch(league_id, season_year, rows, scraped_at, bad_rows=None):
+    """TRANSACTION_UPSERT tuples for normalize_sleeper_transactions rows"""
+    batch = []
+    for row in rows:
+        try:
+            batch.append((
+                league_id, season_year, as_number(row['week'], 'week', integer=True),
+                as_text(row['transaction_id'], 'transaction_id'), as_text(row['date'], 'date'),
+                as_text(row['type'], 'type'), as_text(row['status'], 'status'), as_text(row['team'], 'team'),
+                as_text(row['players_added'], 'players_added'), as_text(row['players_dropped'], 'players_dropped'),
+                as_text(row['description'], 'description'), 'sleeper', scraped_at
+            ))
+        except BadValue as e:
+            _report_bad(bad_rows, 'transaction', e, row.get('transaction_id'))
+    return batch
+
+
+def asset_batch(league_id, season_year, rows, bad_rows=None):
+    """ASSET_INSERT tuples for sleeper_transaction_assets rows"""
+    batch = []
+    for row in rows:
+        try:
+            batch.append((
+                league_id, season_year, as_number(row['week'], 'week', integer=True),
+                as_text(row['transaction_id'], 'transaction_id'), as_text(row['date'], 'date'),
+                as_text(row['type'], 'type'), as_text(row['asset_type'], 'asset_type'),
+                as_text(row.get('player_id'), 'player_id'), as_text(row.get('player_name'), 'player_name'),
+                as_text(row.get('position'), 'position'), as_text(row['from_team'], 'from_team'),
+                as_text(row['to_team'], 'to_team'), as_text(row.get('pick_season'), 'pick_season'),
+                as_number(row.get('pick_round'), 'pick_round', integer=True),
+                as_text(row.get('pick_original_team'), 'pick_original_team'),
+                as_number(row.get('amount'), 'amount', integer=True)
+            ))
+        except BadValue as e:
+            _report_bad(bad_rows, 'transaction asset', e, row.get('transaction_id'))
+    return batch
+
+
+def build_load_batches(data, data_source):
+    """
+    Turn normalized league data into ready-to-insert tuple batches
+    
+    Values are converted to their column's type here, so one bad value can't
+    fail the whole load: rows that can't be stored are collected in
+    'bad_rows' as (kind, reason, context) instead of raising per row.
+    
+    Args:
+        data: Normalized league data (output of normalize_data)
+        data_source: 'espn' or 'sleeper'
+        
+    Returns:
+        Dict with 'teams', 'matchups', 'rosters', 'picks' tuple lists, 'bad_rows',
+        the 'league_id' / 'season_year' the rows were keyed on and the
+        'league' row (LEAGUE_UPSERT tuple)
+    """
     # Extract metadata
     if data_source == 'espn':
         league_id = str(data.get('league_id', config.LEAGUE_ID))
         season_year = data.get('season', 0) or data.get('season_year', 0)
-    else:  # sleeper
-        league_id = data.get('league', {}).get('league_id', '')
-        season_year = data.get('season', 2025)
+    else:  # sleeper (normalize_season output; raw files keep them under league/season)
+        league_id = data.get('league_id') or data.get('league', {}).get('league_id', '')
+        season_year = data.get('season_year') or data.get('season', 2025)
     
     scraped_at = data.get('scraped_at', datetime.now().isoformat())
     
-    # Insert standings
-    standings = data.get('standings', [])
-    for team in standings:
+    batches = {'teams': [], 'matchups': [], 'rosters': [], 'picks': [], 'bad_rows': [],
+               'league_id': league_id, 'season_year': season_year,
+               'league': (league_id, season_year, data.get('previous_league_id')
+                          or data.get('league', {}).get('previous_league_id'))}
+    bad_rows = batches['bad_rows']
+    
+    # Standings
+    for team in data.get('standings', []):
+        if not team.get('team_name'):
+            bad_rows.append(('team', 'missing team_name', team.get('owner')))
+            continue
         try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO teams 
-                (league_id, season_year, team_name, owner, rank, wins, losses, ties, 
-                 points_for, points_against, data_source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            batches['teams'].append((
                 league_id, season_year,
-                team.get('team_name'),
-                team.get('owner'),
-                team.get('rank'),
-                team.get('wins'),
-                team.get('losses'),
-                team.get('ties', 0),
-                team.get('points_for'),
-                team.get('points_against'),
+                as_text(team.get('team_name'), 'team_name'),
+                as_text(team.get('owner'), 'owner'),
+                as_number(team.get('rank'), 'rank', integer=True),
+                as_number(team.get('wins'), 'wins', integer=True),
+                as_number(team.get('losses'), 'losses', integer=True),
+                as_number(team.get('ties', 0), 'ties', integer=True),
+                as_number(team.get('points_for'), 'points_for'),
+                as_number(team.get('points_against'), 'points_against'),
                 data_source
             ))
-        except Exception as e:
-            print(f"  Error inserting team: {e}")
+        except BadValue as e:
+            bad_rows.append(('team', str(e), team.get('team_name')))
     
-    print(f"  ✓ Inserted {len(standings)} teams")
-    
-    # Insert matchups and rosters
-    matchups = data.get('matchups', {})
-    matchup_count = 0
-    roster_count = 0
-    
-    for week, week_matchups in matchups.items():
+    # Matchups and rosters
+    for week, week_matchups in data.get('matchups', {}).items():
+        try:
+            week_num = int(week)
+        except (TypeError, ValueError):
+            bad_rows.append(('week', 'non-numeric week', week))
+            continue
+        
         for matchup in week_matchups:
+            home_team = matchup.get('home_team')
+            away_team = matchup.get('away_team')
+            matchup_id = str(matchup.get('matchup_id', ''))
+            context = f"week {week_num} #{matchup_id}"
+            if not home_team or not away_team:
+                bad_rows.append(('matchup', 'missing home/away team', context))
+                continue
+            
             try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO matchups
-                    (league_id, season_year, week, matchup_id, home_team, home_score, 
-                     home_projected, away_team, away_score, away_projected, bracket_type,
-                     round, is_two_week_playoff, home_total_score, away_total_score,
-                     data_source, scraped_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    league_id, season_year, int(week),
-                    str(matchup.get('matchup_id', '')),
-                    matchup.get('home_team'),
-                    matchup.get('home_score'),
-                    matchup.get('home_projected'),
-                    matchup.get('away_team'),
-                    matchup.get('away_score'),
-                    matchup.get('away_projected'),
-                    matchup.get('bracket_type'),
-                    matchup.get('round'),
-                    matchup.get('is_two_week_playoff'),
-                    matchup.get('home_total_score'),
-                    matchup.get('away_total_score'),
+                home_team = as_text(home_team, 'home_team')
+                away_team = as_text(away_team, 'away_team')
+                batches['matchups'].append((
+                    league_id, season_year, week_num, matchup_id,
+                    home_team,
+                    as_number(matchup.get('home_score'), 'home_score'),
+                    as_number(matchup.get('home_projected'), 'home_projected'),
+                    away_team,
+                    as_number(matchup.get('away_score'), 'away_score'),
+                    as_number(matchup.get('away_projected'), 'away_projected'),
+                    as_text(matchup.get('bracket_type'), 'bracket_type'),
+                    as_text(matchup.get('round'), 'round'),
+                    as_number(matchup.get('is_two_week_playoff'), 'is_two_week_playoff', integer=True),
+                    as_number(matchup.get('home_total_score'), 'home_total_score'),
+                    as_number(matchup.get('away_total_score'), 'away_total_score'),
                     data_source,
                     scraped_at
                 ))
-                matchup_count += 1
-                
-                # Insert home roster
-                for player in matchup.get('home_roster', []):
+            except BadValue as e:
+                bad_rows.append(('matchup', str(e), context))
+                continue
+            
+            for team_name, roster in ((home_team, matchup.get('home_roster') or []),
+                                      (away_team, matchup.get('away_roster') or [])):
+                for player in roster:
+                    if not isinstance(player, dict) or not player.get('player_name'):
+                        bad_rows.append(('roster', 'missing player_name', f"week {week_num} {team_name}"))
+                        continue
                     try:
-                        cursor.execute("""
-                            INSERT OR REPLACE INTO matchup_rosters
-                            (league_id, season_year, week, matchup_id, team_name,
-                             player_name, position, nfl_team, points, projected, started)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            league_id, season_year, int(week),
-                            str(matchup.get('matchup_id', '')),
-                            matchup.get('home_team'),
-                            player.get('player_name'),
-                            player.get('position'),
-                            player.get('nfl_team'),
-                            player.get('points'),
-                            player.get('projected'),
-                            player.get('started')
+                        batches['rosters'].append((
+                            league_id, season_year, week_num, matchup_id,
+                            team_name,
+                            as_text(player.get('player_name'), 'player_name'),
+                            as_text(player.get('position'), 'position'),
+                            as_text(player.get('nfl_team'), 'nfl_team'),
+                            as_number(player.get('points'), 'points'),
+                            as_number(player.get('projected'), 'projected'),
+                            as_number(player.get('started'), 'started', integer=True),
+                            as_text(player.get('player_id'), 'player_id')
                         ))
-                        roster_count += 1
-                    except Exception as e:
-                        print(f"  Error inserting home player: {e}")
-                
-                # Insert away roster
-                for player in matchup.get('away_roster', []):
-                    try:
-                        cursor.execute("""
-                            INSERT OR REPLACE INTO matchup_rosters
-                            (league_id, season_year, week, matchup_id, team_name,
-                             player_name, position, nfl_team, points, projected, started)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            league_id, season_year, int(week),
-                            str(matchup.get('matchup_id', '')),
-                            matchup.get('away_team'),
-                            player.get('player_name'),
-                            player.get('position'),
-                            player.get('nfl_team'),
-                            player.get('points'),
-                            player.get('projected'),
-                            player.get('started')
-                        ))
-                        roster_count += 1
-                    except Exception as e:
-                        print(f"  Error inserting away player: {e}")
-                        
-            except Exception as e:
-                print(f"  Error inserting matchup: {e}")
-    
-    print(f"  ✓ Inserted {matchup_count} matchups with {roster_count} player entries")
-    
-    # Insert draft picks
-    draft = data.get('draft', {})
-    picks = draft.get('picks', [])
-    pick_count = 0
-    
-    for pick in picks:
+                    except BadValue as e:
+                        bad_rows.append(('roster', str(e), f"week {week_num} {team_name}"))
+    
+    # Sleeper transactions (one row each, plus one per asset moved) and traded picks
+    if data_source == 'sleeper':
+        batches['transactions'] = transaction_batch(league_id, season_year, data.get('transactions') or [],
+                                                    scraped_at, bad_rows)
+        batches['transaction_assets'] = asset_batch(league_id, season_year,
+                                                    data.get('transaction_assets') or [], bad_rows)
+        if data.get('traded_picks') is not None:
+            batches['traded_picks'] = []
+            for pick in data['traded_picks']:
+                try:
+                    batches['traded_picks'].append((
+                        league_id, season_year, as_text(pick['pick_season'], 'pick_season'),
+                        as_number(pick['round'], 'round', integer=True),
+                        as_number(pick['roster_id'], 'roster_id', integer=True),
+                        as_text(pick['original_team'], 'original_team'),
+                        as_text(pick['owner_team'], 'owner_team'),
+                        as_text(pick['previous_owner_team'], 'previous_owner_team')
+                    ))
+                except BadValue as e:
+                    bad_rows.append(('traded pick', str(e), f"{pick.get('pick_season')} round {pick.get('round')}"))
+    
+    # Draft picks
+    for pick in data.get('draft', {}).get('picks', []):
+        if pick.get('overall_pick') is None:
+            bad_rows.append(('pick', 'missing overall_pick', pick.get('player_name')))
+            continue
         try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO draft_picks
-                (league_id, season_year, round, pick, overall_pick, team,
-                 player_name, position, nfl_team, data_source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            batches['picks'].append((
                 league_id, season_year,
-                pick.get('round'),
-                pick.get('pick'),
-                pick.get('overall_pick'),
-                pick.get('team'),
-                pick.get('player_name'),
-                pick.get('position'),
-                pick.get('nfl_team'),
-                data_source
+                as_number(pick.get('round'), 'round', integer=True),
+                as_number(pick.get('pick'), 'pick', integer=True),
+                as_number(pick.get('overall_pick'), 'overall_pick', integer=True),
+                as_text(pick.get('team'), 'team'),
+                as_text(pick.get('player_name'), 'player_name'),
+                as_text(pick.get('position'), 'position'),
+                as_text(pick.get('nfl_team'), 'nfl_team'),
+                data_source,
+                as_text(pick.get('player_id'), 'player_id')
             ))
-            pick_count += 1
-        except Exception as e:
-            print(f"  Error inserting pick: {e}")
+        except BadValue as e:
+            bad_rows.append(('pick', str(e), pick.get('player_name')))
     
-    print(f"  ✓ Inserted {pick_count} draft picks")
-    
-    conn.commit()
-    conn.close()
+    return batches
+
+
+def load_batches(conn, batches):
+    """
+    Insert prebuilt batches with executemany inside one transaction
+    
+    Optional keys make the load incremental: 'replace_weeks' and
+    'replace_season' delete the matching slices first, 'transactions' rows
+    (TRANSACTION_UPSERT tuples) are upserted with their 'transaction_assets'
+    replaced, 'traded_picks' replaces the league's traded picks, and 'hashes'
+    rows are written to scrape_metadata in the same transaction.
+    
+    Args:
+        conn: Connection from open_load_connection (autocommit mode)
+        batches: Output of build_load_batches
+    """
+    slice_key = (batches.get('league_id'), batches.get('season_year'))
+    
+    conn.execute("BEGIN")
+    try:
+        for week in batches.get('replace_weeks', ()):
+            conn.execute("DELETE FROM matchups WHERE league_id = ? AND season_year = ? AND week = ?",
+                         (*slice_key, week))
+            conn.execute("DELETE FROM matchup_rosters WHERE league_id = ? AND season_year = ? AND week = ?",
+                         (*slice_key, week))
+        if batches.get('replace_season'):
+            conn.execute("DELETE FROM teams WHERE league_id = ? AND season_year = ?", slice_key)
+            conn.execute("DELETE FROM draft_picks WHERE league_id = ? AND season_year = ?", slice_key)
+        
+        if batches.get('league') and batches['league'][0]:
+            conn.execute(LEAGUE_UPSERT, batches['league'])
+        conn.executemany(TEAM_INSERT, batches['teams'])
+        conn.executemany(MATCHUP_INSERT, batches['matchups'])
+        conn.executemany(ROSTER_INSERT, batches['rosters'])
+        conn.executemany(PICK_INSERT, batches['picks'])
+        conn.executemany(TRANSACTION_UPSERT, batches.get('transactions', ()))
+        conn.executemany("DELETE FROM transaction_assets WHERE league_id = ? AND transaction_id = ?",
+                         {(row[0], row[3]) for row in batches.get('transactions', ())})
+        conn.executemany(ASSET_INSERT, batches.get('transaction_assets', ()))
+        if batches.get('traded_picks') is not None:
+            conn.execute("DELETE FROM traded_picks WHERE league_id = ?", (batches['league_id'],))
+            conn.executemany(TRADED_PICK_INSERT, batches['traded_picks'])
+        
+        if batches.get('hashes'):
+            record_hashes(conn, batches['hashes'])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def report_bad_rows(bad_rows, limit=5):
+    """Print a summary of rows skipped during batch building"""
+    if not bad_rows:
+        return
+    print(f"  ⚠ Skipped {len(bad_rows)} bad rows:")
+    for kind, reason, context in bad_rows[:limit]:
+        print(f"     - {kind}: {reason} ({context})")
+    if len(bad_rows) > limit:
+        print(f"     ... and {len(bad_rows) - limit} more")
+
+
+# scrape_metadata.week for the non-weekly parts of a file
+FILE_HASH_WEEK = None      # whole file (raw bytes)
+SEASON_HASH_WEEK = 0       # standings + draft
+
+
+def _sha256_json(value):
+    """sha256 of a JSON value in canonical form"""
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """sha256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_sleeper_players = None
+
+
+def sleeper_player_lookup():
+    """The Sleeper player directory, opened once per process (lookups are lazy)"""
+    global _sleeper_players
+    if _sleeper_players is None:
+        _sleeper_players = PlayerDirectory(config.DB_FILE)
+    return _sleeper_players
+
+
+def iter_normalized(json_file, data_source):
+    """
+    Yield a season file as normalized slices, one week in memory at a time
+    
+    Yields (SEASON_HASH_WEEK, season) first, where season is the normalized
+    data with empty matchups, then (week, normalized week matchups).
+    """
+    players = sleeper_player_lookup() if data_source == 'sleeper' else None
+    season = normalize_season(load_shell(json_file, streamed=('matchups',)), data_source, players)
+    yield SEASON_HASH_WEEK, season
+    
+    yield from iter_normalized_weeks(iter_members(json_file, 'matchups'), data_source, season, players)
+
+
+def stored_hashes(conn, source_file):
+    """Hashes recorded by the last successful load of a file, keyed by week"""
+    cursor = conn.execute("""
+        SELECT week, content_hash FROM scrape_metadata
+        WHERE source_file = ? AND content_hash IS NOT NULL
+    """, (source_file,))
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def record_hashes(conn, rows):
+    """
+    Replace the scrape_metadata hash rows for a file
+    
+    Args:
+        conn: Open connection (called inside the load transaction)
+        rows: (league_id, season_year, source_file, week, content_hash) tuples
+    """
+    scraped_at = datetime.now().isoformat()
+    for source_file in {row[2] for row in rows}:
+        conn.execute("DELETE FROM scrape_metadata WHERE source_file = ?", (source_file,))
+    conn.executemany("""
+        INSERT INTO scrape_metadata
+        (league_id, season_year, scraped_at, data_types, success, notes,
+         source_file, week, content_hash)
+        VALUES (?, ?, ?, ?, 1, NULL, ?, ?, ?)
+    """, [
+        (league_id, season_year, scraped_at,
+         'file' if week is FILE_HASH_WEEK else 'season' if week == SEASON_HASH_WEEK else 'week',
+         source_file, week, content_hash)
+        for league_id, season_year, source_file, week, content_hash in rows
+    ])
+
+
+def prepare_file(json_file, data_source, previous_hashes):
+    """
+    Parse, normalize and batch one file (no database access; runs in worker processes)
+    
+    Weeks are streamed through iter_normalized, so only the batches for
+    changed weeks are held in memory, never the whole parsed file.
+    
+    The file's sha256 is compared with the one stored in scrape_metadata; an
+    unchanged file is skipped without parsing. Otherwise each week (and the
+    standings/draft block) is hashed and only slices whose hash changed are
+    batched for delete-then-insert.
+    
+    Args:
+        json_file: Path to an ESPN or Sleeper season file
+        data_source: 'espn' or 'sleeper'
+        previous_hashes: stored_hashes() for the file ({} to reload everything)
+        
+    Returns:
+        build_load_batches output plus load_batches' replace/hash keys, or a
+        dict with 'skipped' set when the file is unchanged
+    """
+    source_file = os.path.basename(json_file)
+    file_hash = file_sha256(json_file)
+    if previous_hashes.get(FILE_HASH_WEEK) == file_hash:
+        return {'source_file': source_file, 'data_source': data_source,
+                'file_hash': file_hash, 'skipped': True}
+    
+    hashes = {}
+    changed = set()
+    batches = None
+    for week, value in iter_normalized(json_file, data_source):
+        if week == SEASON_HASH_WEEK:
+            season = value
+            season_slice = [season.get('standings', []), season.get('draft', {})]
+            if data_source == 'sleeper':
+                season_slice += [season['transactions'], season['transaction_assets'], season['traded_picks']]
+            hashes[SEASON_HASH_WEEK] = _sha256_json(season_slice)
+            if previous_hashes.get(SEASON_HASH_WEEK) != hashes[SEASON_HASH_WEEK]:
+                changed.add(SEASON_HASH_WEEK)
+                batches = build_load_batches(season, data_source)
+            else:
+                batches = build_load_batches({**season, **NO_SEASON_SLICE}, data_source)
+            continue
+        
+        if str(week).isdigit():
+            hashes[int(week)] = _sha256_json(value)
+            if previous_hashes.get(int(week)) == hashes[int(week)]:
+                continue
+            changed.add(int(week))
+        
+        # Only changed weeks reach the batch builder (non-numeric ones become bad rows)
+        week_batches = build_load_batches({**season, **NO_SEASON_SLICE, 'matchups': {week: value}}, data_source)
+        for key in ('matchups', 'rosters', 'bad_rows'):
+            batches[key].extend(week_batches[key])
+    
+    removed = {week for week in previous_hashes if week is not FILE_HASH_WEEK and week not in hashes}
+    league_id, season_year = batches['league_id'], batches['season_year']
+    batches.update({
+        'source_file': source_file,
+        'data_source': data_source,
+        'file_hash': file_hash,
+        'skipped': False,
+        'unchanged_slices': len(hashes) - len(changed),
+        'replace_weeks': sorted((changed | removed) - {SEASON_HASH_WEEK}),
+        'replace_season': SEASON_HASH_WEEK in changed,
+        'hashes': [(league_id, season_year, source_file, FILE_HASH_WEEK, file_hash)] + [
+            (league_id, season_year, source_file, week, digest) for week, digest in hashes.items()
+        ],
+    })
+    return batches
+
+
+def write_prepared(conn, batches):
+    """
+    Load one prepare_file() result and report it (the single writer)
+    
+    Returns:
+        (reloaded (season_year, week) slices, whether the standings/draft
+        slice changed)
+    """
+    print(f"\nProcessing: {batches['source_file']} ({batches['data_source']})")
+    if batches['skipped']:
+        print(f"  ✓ Unchanged (sha256 {batches['file_hash'][:12]}), skipped")
+        return [], False
+    
+    load_batches(conn, batches)
+    
+    print(f"  ✓ Reloaded {len(batches['replace_weeks'])} weeks"
+          f"{' + standings/draft' if batches['replace_season'] else ''}"
+          f" ({batches['unchanged_slices']} slices unchanged)")
+    print(f"  ✓ Inserted {len(batches['teams'])} teams")
+    print(f"  ✓ Inserted {len(batches['matchups'])} matchups with {len(batches['rosters'])} player entries")
+    print(f"  ✓ Inserted {len(batches['picks'])} draft picks")
+    if batches.get('transactions'):
+        print(f"  ✓ Upserted {len(batches['transactions'])} transactions "
+              f"({len(batches['transaction_assets'])} assets moved)")
+    report_bad_rows(batches['bad_rows'])
+    
+    return [(int(batches['season_year']), week) for week in batches['replace_weeks']], batches['replace_season']
+
+
+def populate_from_json(json_file, data_source, conn, force=False):
+    """
+    Populate database from a single JSON file, reloading only what changed
+    
+    Args:
+        json_file: Path to an ESPN or Sleeper season file
+        data_source: 'espn' or 'sleeper'
+        conn: Connection from open_load_connection
+        force: Ignore stored hashes and reload every slice
+        
+    Returns:
+        (reloaded (season_year, week) slices, whether the standings/draft
+        slice changed)
+    """
+    previous = {} if force else stored_hashes(conn, os.path.basename(json_file))
+    return write_prepared(conn, prepare_file(json_file, data_source, previous))
+
+
+def iter_prepared(jobs, workers=None, max_pending=None):
+    """
+    Run prepare_file over jobs in a process pool, yielding results in job order
+    
+    At most max_pending files are parsed or waiting for the writer at once,
+    which bounds memory to a few seasons regardless of how many files there are.
+    
+    Args:
+        jobs: (json_file, data_source, previous_hashes) tuples
+        workers: Worker processes (default: CPU count; 1 parses inline)
+        max_pending: Bound on in-flight results (default: 2 per worker)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield prepare_file(*job)
+        return
+    
+    max_pending = max_pending or workers * 2
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(prepare_file, *job) for job in islice(jobs, max_pending))
+        while pending:
+            batches = pending.popleft().result()
+            for job in islice(jobs, 1):
+                pending.append(pool.submit(prepare_file, *job))
+            yield batches
+
+
+def populate_files(conn, files, force=False, workers=None):
+    """
+    Parse files concurrently and load them through one writer connection
+    
+    Args:
+        conn: Connection from open_load_connection (the only writer)
+        files: (json_file, data_source) tuples, loaded in this order
+        force: Ignore stored hashes and reload every slice
+        workers: Parser processes (default: CPU count)
+        
+    Returns:
+        (reloaded (season_year, week) slices, whether any file's
+        standings/draft slice changed)
+    """
+    jobs = [
+        (json_file, data_source, {} if force else stored_hashes(conn, os.path.basename(json_file)))
+        for json_file, data_source in files
+    ]
+    
+    reloaded, season_changed = [], False
+    for batches in iter_prepared(jobs, workers):
+        slices, changed = write_prepared(conn, batches)
+        reloaded += slices
+        season_changed = season_changed or changed
+    return reloaded, season_changed
 
 
 def main():
     db_path = config.DB_FILE
+    force = '--force' in sys.argv
+    workers = next((int(arg.split('=', 1)[1]) for arg in sys.argv if arg.startswith('--workers=')), None)
     
     print("="*80)
     print("POPULATING DATABASE WITH ALL FANTASY DATA")
     print("="*80)
     
-    # Initialize enhanced database
-    init_enhanced_database(db_path)
+    # Create or upgrade the schema
+    applied = ensure_schema(db_path)
+    print(f"✓ Database ready: {db_path}" + (f" ({applied} migrations applied)" if applied else ""))
+    
+    # Position/team lookups for Sleeper rosters come from the player directory
+    players = PlayerDirectory(db_path)
+    imported = players.import_players_file(os.path.join(config.DATA_DIR, 'sleeper_players.json'))
+    players.close()
+    if imported:
+        print(f"✓ Imported {imported} Sleeper players into the player directory")
     
     # Process ESPN files (2019-2024)
     espn_files = sorted(glob.glob(os.path.join(config.DATA_DIR, "espn_league_*_historical.json")))
     print(f"\nFound {len(espn_files)} ESPN data files")
     
-    for espn_file in espn_files:
-        populate_from_json(espn_file, 'espn', db_path)
-    
     # Process Sleeper files (2025)
     sleeper_files = sorted(glob.glob(os.path.join(config.DATA_DIR, "sleeper_*.json")))
     # Filter out sleeper_players.json
     sleeper_files = [f for f in sleeper_files if 'players.json' not in f]
-    print(f"\nFound {len(sleeper_files)} Sleeper data files")
+    print(f"Found {len(sleeper_files)} Sleeper data files")
+    
+    # Files are parsed in parallel; one connection (one transaction per file) writes
+    conn = open_load_connection(db_path)
+    reloaded, season_changed = populate_files(
+        conn,
+        [(f, 'espn') for f in espn_files] + [(f, 'sleeper') for f in sleeper_files],
+        force=force,
+        workers=workers
+    )
+    
+    conn.close()
     
-    for sleeper_file in sleeper_files:
-        populate_from_json(sleeper_file, 'sleeper', db_path)
+    # Rebuild derived draft value table (VOR over replacement and slot average) and extend power ratings,
+    # dropping anything derived from weeks that were just reloaded. A changed
+    # standings/draft slice (picks, owners, transactions) alone also rebuilds them
+    if reloaded or season_changed:
+        conn = sqlite3.connect(db_path)
+        if reloaded:
+            invalidate_rescored_weeks(conn, reloaded)
+            invalidate_ratings(conn, *min(reloaded))
+        valued_count = build_draft_value(conn)
+        rating_count = update_ratings(conn)
+        conn.close()
+        print(f"\n✓ Reloaded {len(reloaded)} season-weeks"
+              f"{' and standings/draft' if season_changed else ''}")
+        print(f"✓ Valued {valued_count} draft picks")
+        print(f"✓ Updated {rating_count} manager-week power ratings")
+    else:
+        print("\n✓ No source data changed")
     
     print("\n" + "="*80)
     print("✓ DATABASE POPULATION COMPLETE")
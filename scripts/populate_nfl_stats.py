@@ -13,12 +13,15 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import config
 from scrapers.nfl_stats_fetcher import NFLStatsFetcher
+from scrapers.nfl_data_cache import NFLDataCache
+from draft_value import build_draft_value
+from migrations import ensure_schema
+from player_crosswalk import refresh_crosswalk, crosswalk_ids
 
 try:
-    import nflreadpy as nfl
+    import polars as pl
 except ImportError:
-    print("⚠ nflreadpy not installed. Run: pip install nflreadpy polars")
-    nfl = None
+    pl = None
 
 
 def get_fantasy_player_names():
@@ -131,83 +134,25 @@ def check_existing_data(db_path):
     }
 
 
-def migrate_database_for_kickers(db_path):
+def load_crosswalk():
     """
-    Add kicker stat columns to existing nfl_weekly_stats table
-    
-    Args:
-        db_path: Path to database
+    Refresh the Sleeper -> nflverse ID crosswalk from the player directory
+    and return the league players it resolves, keyed by Sleeper ID
     """
-    if not os.path.exists(db_path):
-        print("⚠  Database does not exist, skipping migration")
-        return
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    if not os.path.exists(config.DB_FILE):
+        return {}
     
-    # Check if table exists
-    cursor.execute("""
-        SELECT name FROM sqlite_master 
-        WHERE type='table' AND name='nfl_weekly_stats'
-    """)
-    
-    if not cursor.fetchone():
-        print("✓ nfl_weekly_stats table doesn't exist yet, no migration needed")
+    conn = sqlite3.connect(config.DB_FILE)
+    try:
+        count = refresh_crosswalk(conn)
+        if count:
+            print(f"✓ Crosswalked {count} Sleeper players to nflverse IDs")
+        return crosswalk_ids(conn)
+    except sqlite3.Error as e:
+        print(f"⚠ Could not load player ID crosswalk: {e}")
+        return {}
+    finally:
         conn.close()
-        return
-    
-    print("\n🔄 Migrating database schema for kicker stats...")
-    
-    # List of kicker columns to add
-    kicker_columns = [
-        ('fg_made', 'INTEGER DEFAULT 0'),
-        ('fg_att', 'INTEGER DEFAULT 0'),
-        ('fg_missed', 'INTEGER DEFAULT 0'),
-        ('fg_blocked', 'INTEGER DEFAULT 0'),
-        ('fg_long', 'INTEGER DEFAULT 0'),
-        ('fg_pct', 'REAL DEFAULT 0.0'),
-        ('fg_made_0_19', 'INTEGER DEFAULT 0'),
-        ('fg_made_20_29', 'INTEGER DEFAULT 0'),
-        ('fg_made_30_39', 'INTEGER DEFAULT 0'),
-        ('fg_made_40_49', 'INTEGER DEFAULT 0'),
-        ('fg_made_50_59', 'INTEGER DEFAULT 0'),
-        ('fg_made_60_', 'INTEGER DEFAULT 0'),
-        ('fg_missed_0_19', 'INTEGER DEFAULT 0'),
-        ('fg_missed_20_29', 'INTEGER DEFAULT 0'),
-        ('fg_missed_30_39', 'INTEGER DEFAULT 0'),
-        ('fg_missed_40_49', 'INTEGER DEFAULT 0'),
-        ('fg_missed_50_59', 'INTEGER DEFAULT 0'),
-        ('fg_missed_60_', 'INTEGER DEFAULT 0'),
-        ('pat_made', 'INTEGER DEFAULT 0'),
-        ('pat_att', 'INTEGER DEFAULT 0'),
-        ('pat_missed', 'INTEGER DEFAULT 0'),
-        ('pat_blocked', 'INTEGER DEFAULT 0'),
-        ('pat_pct', 'REAL DEFAULT 0.0'),
-        ('gwfg_att', 'INTEGER DEFAULT 0'),
-        ('gwfg_made', 'INTEGER DEFAULT 0'),
-    ]
-    
-    # Check which columns already exist
-    cursor.execute("PRAGMA table_info(nfl_weekly_stats)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
-    
-    columns_added = 0
-    for col_name, col_type in kicker_columns:
-        if col_name not in existing_columns:
-            try:
-                cursor.execute(f"ALTER TABLE nfl_weekly_stats ADD COLUMN {col_name} {col_type}")
-                columns_added += 1
-                print(f"  ✓ Added column: {col_name}")
-            except Exception as e:
-                print(f"  ⚠ Error adding column {col_name}: {e}")
-    
-    conn.commit()
-    conn.close()
-    
-    if columns_added > 0:
-        print(f"\n✓ Migration complete: Added {columns_added} kicker stat columns")
-    else:
-        print("\n✓ All kicker columns already exist, no migration needed")
 
 
 def main():
@@ -218,8 +163,10 @@ def main():
     print("NFL STATS DATABASE POPULATION")
     print("="*60 + "\n")
     
-    # Run database migration for kicker stats
-    migrate_database_for_kickers(config.DB_FILE)
+    # Create or upgrade the schema (kicker columns, crosswalk, ...)
+    applied = ensure_schema(config.DB_FILE)
+    if applied:
+        print(f"✓ Applied {applied} schema migrations")
     
     # Check existing data
     print("📊 Checking existing data...")
@@ -241,76 +188,29 @@ def main():
             player_names = get_fantasy_player_names()
             
             if player_names:
-                # Get all weekly stats for mapping
+                # Index the stored weekly stats once and map every name against it
                 conn = sqlite3.connect(config.DB_FILE)
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT DISTINCT player_id, player_display_name, position, recent_team
+                    SELECT player_id, player_name, player_display_name, position, recent_team,
+                           MAX(season) AS season
                     FROM nfl_weekly_stats
+                    GROUP BY player_id
                 """)
-                
-                # Create a simple DataFrame-like structure for matching
-                class SimpleDF:
-                    def __init__(self, data):
-                        self.data = data
-                    
-                    def __getitem__(self, mask):
-                        return SimpleDF([d for d, m in zip(self.data, mask) if m])
-                    
-                    @property
-                    def empty(self):
-                        return len(self.data) == 0
-                    
-                    def iloc(self, idx):
-                        return self.data[idx]
-                
-                weekly_data = [dict(zip(['player_id', 'player_display_name', 'position', 'recent_team'], row)) 
-                              for row in cursor.fetchall()]
+                columns = ['player_id', 'player_name', 'player_display_name', 'position', 'team', 'season']
+                weekly_data = pl.DataFrame(cursor.fetchall(), schema=columns, orient='row')
                 conn.close()
                 
-                # Map using a simpler approach
-                conn = sqlite3.connect(config.DB_FILE)
-                cursor = conn.cursor()
-                mapping_count = 0
-                
-                for fantasy_name in player_names:
-                    # Try to find exact match
-                    matches = [p for p in weekly_data 
-                              if p['player_display_name'].lower() == fantasy_name.lower()]
-                    
-                    if matches:
-                        match = matches[0]
-                        try:
-                            cursor.execute("""
-                                INSERT OR REPLACE INTO nfl_player_mapping (
-                                    fantasy_player_name, nfl_player_id, nfl_player_name,
-                                    nfl_player_display_name, position, team,
-                                    confidence_score, created_at
-                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                fantasy_name,
-                                match['player_id'],
-                                match['player_display_name'],
-                                match['player_display_name'],
-                                match['position'],
-                                match['recent_team'],
-                                1.0,
-                                datetime.now().isoformat()
-                            ))
-                            mapping_count += 1
-                        except Exception as e:
-                            print(f"⚠ Error mapping {fantasy_name}: {e}")
-                
-                conn.commit()
-                conn.close()
-                print(f"✓ Created {mapping_count} player mappings")
+                fetcher.create_player_mappings(player_names, weekly_data, load_crosswalk())
             
             return
     
     # Initialize fetcher
     print("\n🏈 Initializing NFL Stats Fetcher...")
+    # nflreadpy downloads are cached as Parquet; --offline reads only the cache
+    offline = '--offline' in sys.argv or os.environ.get('NFL_OFFLINE') == '1'
     try:
-        fetcher = NFLStatsFetcher()
+        fetcher = NFLStatsFetcher(cache=NFLDataCache(offline=offline))
     except ImportError as e:
         print(f"\n✗ Error: {e}")
         print("\nPlease install nflreadpy and polars:")
@@ -378,7 +278,6 @@ def main():
                     weekly_stats = season_stats
                 else:
                     # Polars DataFrames use vstack for vertical concatenation
-                    import polars as pl
                     weekly_stats = pl.concat([weekly_stats, season_stats], how="vertical")
                 successful_seasons.append(season)
         except Exception as e:
@@ -411,7 +310,6 @@ def main():
                 if team_defense_stats is None:
                     team_defense_stats = season_defense
                 else:
-                    import polars as pl
                     team_defense_stats = pl.concat([team_defense_stats, season_defense], how="vertical")
         except Exception as e:
             print(f"   ⚠ Could not fetch team defense for {season}: {e}")
@@ -428,12 +326,11 @@ def main():
     for season in successful_seasons:
         try:
             print(f"   Attempting to fetch schedule for {season}...")
-            season_schedule = nfl.load_schedules(seasons=[season])
+            season_schedule = fetcher.fetch_schedules([season])
             if season_schedule is not None and len(season_schedule) > 0:
                 if schedules is None:
                     schedules = season_schedule
                 else:
-                    import polars as pl
                     schedules = pl.concat([schedules, season_schedule], how="vertical")
         except Exception as e:
             print(f"   ⚠ Could not fetch schedule for {season}: {e}")
@@ -478,7 +375,7 @@ def main():
             print(f"⚠ Could not extract D/ST names: {e}")
     
     if player_names:
-        mapping_count = fetcher.create_player_mappings(player_names, weekly_stats)
+        mapping_count = fetcher.create_player_mappings(player_names, weekly_stats, load_crosswalk())
         print(f"✓ Created {mapping_count} player mappings")
     
     # Create D/ST mappings
@@ -487,6 +384,13 @@ def main():
         dst_mapping_count = fetcher.create_dst_mappings(dst_names, team_defense_stats)
         print(f"✓ Created {dst_mapping_count} D/ST mappings")
     
+    # Season production changed, so rebuild draft value (VOR over replacement and slot average)
+    print(f"\n📈 Rebuilding draft value table...")
+    conn = sqlite3.connect(config.DB_FILE)
+    valued_count = build_draft_value(conn)
+    conn.close()
+    print(f"✓ Valued {valued_count} draft picks")
+    
     # Summary
     print("\n" + "="*60)
     print("SUMMARY")
@@ -495,7 +399,10 @@ def main():
     print(f"✓ NFL Team Defense Records: {dst_stored_count}")
     print(f"✓ Player Mappings: {mapping_count if player_names else 0}")
     print(f"✓ D/ST Mappings: {dst_mapping_count}")
+    print(f"✓ Draft Picks Valued: {valued_count}")
     print(f"✓ Seasons: {seasons_to_fetch}")
+    print(f"✓ nflverse cache: {fetcher.cache.hits} hits, {fetcher.cache.misses} downloads"
+          f"{' (offline)' if fetcher.cache.offline else ''}")
     print(f"✓ Database: {config.DB_FILE}")
     print("\n✓ NFL stats population complete (including D/ST)!")
     print("="*60 + "\n")
@@ -0,0 +1,317 @@
+"""
+Elo-style power ratings for every manager
+Margin-aware Elo over all matchups from 2019 on, updated incrementally:
+new weeks continue from the last stored ratings instead of replaying history.
+Each league is rated separately; a manager's rating carries over between
+the seasons of one league (through the leagues table for Sleeper) and into
+the league that replaced it (e.g. an ESPN league moved to Sleeper).
+"""
+import math
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+
+FIRST_SEASON = 2019
+BASE_RATING = 1500.0
+K_FACTOR = 20.0
+# Fantasy margins run much larger than NFL ones; scale before taking the log
+MARGIN_SCALE = 10.0
+# Fraction of the distance to BASE_RATING each rating keeps between seasons
+SEASON_CARRYOVER = 2 / 3
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """Probability that `rating` beats `opponent_rating`"""
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def rating_change(rating: float, opponent_rating: float, margin: float) -> float:
+    """
+    Elo update for one game with a margin-of-victory multiplier
+
+    The multiplier shrinks when the favourite wins big so ratings don't
+    snowball (same autocorrelation correction as FiveThirtyEight's NFL Elo).
+    """
+    if margin > 0:
+        actual = 1.0
+    elif margin < 0:
+        actual = 0.0
+    else:
+        actual = 0.5
+
+    winner_diff = (rating - opponent_rating) if margin >= 0 else (opponent_rating - rating)
+    multiplier = math.log(abs(margin) / MARGIN_SCALE + 1) * (2.2 / (winner_diff * 0.001 + 2.2))
+    if margin == 0:
+        multiplier = 1.0
+
+    return K_FACTOR * multiplier * (actual - expected_score(rating, opponent_rating))
+
+
+def league_roots(conn: sqlite3.Connection) -> Dict[str, str]:
+    """
+    First league_id of every league's history
+
+    Sleeper gives each season of a league its own ID, linked through
+    previous_league_id. A history with no recorded predecessor continues the
+    one that ended most recently before it started (e.g. the ESPN league a
+    Sleeper league replaced). Only one history continues each predecessor:
+    the earliest to start after it, then the one sharing the most owners;
+    ties link nothing.
+    """
+    previous = {str(league_id): str(prev) if prev not in (None, '', '0', 0) else None
+                for league_id, prev in conn.execute("SELECT league_id, previous_league_id FROM leagues")}
+    seasons = {str(league_id): (first, last) for league_id, first, last in conn.execute("""
+        SELECT league_id, MIN(season_year), MAX(season_year) FROM teams GROUP BY league_id
+    """)}
+    owners = {}
+    for league_id, owner in conn.execute("SELECT DISTINCT league_id, owner FROM teams WHERE owner IS NOT NULL"):
+        owners.setdefault(str(league_id), set()).add(owner)
+    for league_id in seasons:
+        previous.setdefault(league_id, None)
+
+    def follow_chains() -> Dict[str, str]:
+        roots = {}
+        for league_id in previous:
+            root, seen = league_id, {league_id}
+            while previous.get(root) and previous[root] not in seen:
+                root = previous[root]
+                seen.add(root)
+            roots[league_id] = root
+        return roots
+
+    roots = follow_chains()
+
+    # (first season, last season, latest league_id) of every history
+    spans = {}
+    for league_id, root in roots.items():
+        if league_id not in seasons:
+            continue
+        first, last = seasons[league_id]
+        if root in spans:
+            span_first, span_last, latest = spans[root]
+            if last > span_last:
+                span_last, latest = last, league_id
+            first = min(first, span_first)
+            last, league_id = span_last, latest
+        spans[root] = (first, last, league_id)
+
+    successors = {}
+    for root, (first, _, _) in spans.items():
+        if previous.get(root):
+            continue
+        ended = [other for other, span in spans.items() if span[1] < first]
+        if not ended:
+            continue
+        last_ended = max(spans[other][1] for other in ended)
+        ended = [other for other in ended if spans[other][1] == last_ended]
+        if len(ended) == 1:
+            successors.setdefault(ended[0], []).append(root)
+
+    def history_owners(root: str) -> set:
+        return set().union(*(owners.get(league_id, set())
+                             for league_id, league_root in roots.items() if league_root == root))
+
+    for predecessor, candidates in successors.items():
+        first_start = min(spans[root][0] for root in candidates)
+        candidates = [root for root in candidates if spans[root][0] == first_start]
+        if len(candidates) > 1:
+            carried = history_owners(predecessor)
+            shared = {root: len(history_owners(root) & carried) for root in candidates}
+            candidates = [root for root in candidates if shared[root] == max(shared.values()) > 0]
+        if len(candidates) == 1:
+            previous[candidates[0]] = spans[predecessor][2]
+
+    return follow_chains() if successors else roots
+
+
+def _load_state(conn: sqlite3.Connection,
+                roots: Dict[str, str]) -> Dict[Tuple[str, str], Tuple[float, int]]:
+    """Latest stored (rating, season_year) for every (league root, owner)"""
+    cursor = conn.execute("""
+        SELECT league_id, owner, rating, season_year
+        FROM (
+            SELECT league_id, owner, rating, season_year,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY league_id, owner ORDER BY season_year DESC, week DESC
+                   ) AS rn
+            FROM ratings
+        )
+        WHERE rn = 1
+    """)
+    state = {}
+    for league_id, owner, rating, season in cursor.fetchall():
+        key = (roots.get(str(league_id), str(league_id)), owner)
+        if key not in state or state[key][1] < season:
+            state[key] = (rating, season)
+    return state
+
+
+def invalidate_ratings(conn: sqlite3.Connection, season_year: int, week: int):
+    """
+    Drop stored ratings from (season_year, week) on so the next
+    update_ratings() replays from there (used when an old week is reloaded)
+    """
+    conn.execute("""
+        DELETE FROM ratings
+        WHERE season_year > ? OR (season_year = ? AND week >= ?)
+    """, (season_year, season_year, week))
+    conn.commit()
+
+
+def update_ratings(conn: sqlite3.Connection, rebuild: bool = False) -> int:
+    """
+    Bring the ratings table up to date with the matchups table
+
+    The most recent stored week is always re-rated (it may have been rated
+    mid-week), then every newer week is applied on top of the stored state.
+
+    Args:
+        conn: Open database connection
+        rebuild: Drop all stored ratings and replay history from FIRST_SEASON
+
+    Returns:
+        Number of owner-week ratings written
+    """
+    if rebuild:
+        conn.execute("DELETE FROM ratings")
+
+    resume_season, resume_week = FIRST_SEASON, 0
+    last = conn.execute("""
+        SELECT season_year, week FROM ratings
+        ORDER BY season_year DESC, week DESC
+        LIMIT 1
+    """).fetchone()
+    if last:
+        resume_season, resume_week = last
+        conn.execute("DELETE FROM ratings WHERE season_year = ? AND week = ?", last)
+
+    roots = league_roots(conn)
+    state = _load_state(conn, roots)
+
+    cursor = conn.execute("""
+        SELECT m.league_id, m.season_year, m.week, m.home_score, m.away_score,
+               t1.owner AS home_owner, t2.owner AS away_owner
+        FROM matchups m
+        JOIN teams t1 ON t1.league_id = m.league_id AND m.home_team = t1.team_name
+                     AND m.season_year = t1.season_year
+        JOIN teams t2 ON t2.league_id = m.league_id AND m.away_team = t2.team_name
+                     AND m.season_year = t2.season_year
+        WHERE m.season_year >= ?
+          AND (m.season_year > ? OR (m.season_year = ? AND m.week >= ?))
+          AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+        ORDER BY m.season_year, m.week
+    """, (FIRST_SEASON, resume_season, resume_season, resume_week))
+
+    def current_rating(key: Tuple[str, str], season: int) -> float:
+        rating, rated_season = state.get(key, (BASE_RATING, season))
+        if rated_season < season:
+            # New season: regress toward the mean
+            rating = BASE_RATING + (rating - BASE_RATING) * SEASON_CARRYOVER
+        return rating
+
+    rows = []
+    for league_id, season, week, home_score, away_score, home_owner, away_owner in cursor.fetchall():
+        if not home_owner or not away_owner:
+            continue
+
+        # Ratings carry over along a league's history, never between concurrent leagues
+        root = roots.get(str(league_id), str(league_id))
+        home_key, away_key = (root, home_owner), (root, away_owner)
+        home_rating = current_rating(home_key, season)
+        away_rating = current_rating(away_key, season)
+        margin = home_score - away_score
+
+        change = rating_change(home_rating, away_rating, margin)
+        home_rating += change
+        away_rating -= change
+
+        state[home_key] = (home_rating, season)
+        state[away_key] = (away_rating, season)
+        # Ratings are stored unrounded so incremental updates match a full replay
+        rows.append((league_id, home_owner, season, week, home_rating, change, away_owner, round(margin, 2)))
+        rows.append((league_id, away_owner, season, week, away_rating, -change, home_owner, round(-margin, 2)))
+
+    conn.executemany("""
+        INSERT OR REPLACE INTO ratings
+        (league_id, owner, season_year, week, rating, rating_change, opponent, margin)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+
+    return len(rows)
+
+
+def ratings_series(conn: sqlite3.Connection, league_id: Optional[str] = None) -> Dict:
+    """
+    Ratings as compact, chart-ready arrays
+
+    Args:
+        conn: Open database connection
+        league_id: Any season's league ID (default: the most recently rated
+            league); every season of that league's history is included,
+            including the league it replaced
+
+    Returns:
+        Dict with parallel `seasons`/`weeks` arrays, `owners`, and `ratings`
+        (one list per owner aligned to the weeks; ratings carry forward
+        through byes and are null before an owner's first game)
+    """
+    if league_id is None:
+        latest = conn.execute("""
+            SELECT league_id FROM ratings ORDER BY season_year DESC, week DESC LIMIT 1
+        """).fetchone()
+        league_id = latest[0] if latest else ''
+    roots = league_roots(conn)
+    root = roots.get(str(league_id), str(league_id))
+    league_ids = sorted({str(league_id)} | {lid for lid, lroot in roots.items() if lroot == root})
+    league_filter = f"CAST(league_id AS TEXT) IN ({', '.join('?' * len(league_ids))})"
+
+    cursor = conn.execute(f"""
+        SELECT DISTINCT season_year, week FROM ratings
+        WHERE {league_filter}
+        ORDER BY season_year, week
+    """, league_ids)
+    week_keys = [tuple(row) for row in cursor.fetchall()]
+    week_index = {key: i for i, key in enumerate(week_keys)}
+
+    cursor = conn.execute(f"""
+        SELECT owner, season_year, week, rating FROM ratings
+        WHERE {league_filter}
+        ORDER BY owner, season_year, week
+    """, league_ids)
+
+    series = {}
+    for owner, season, week, rating in cursor.fetchall():
+        values = series.setdefault(owner, [None] * len(week_keys))
+        values[week_index[(season, week)]] = round(rating, 1)
+
+    # Carry ratings forward through weeks an owner didn't play
+    for values in series.values():
+        last = None
+        for i, value in enumerate(values):
+            if value is None:
+                values[i] = last
+            else:
+                last = value
+
+    owners = sorted(series, key=lambda o: series[o][-1] or 0, reverse=True)
+    return {
+        'league_id': str(league_id),
+        'seasons': [key[0] for key in week_keys],
+        'weeks': [key[1] for key in week_keys],
+        'owners': owners,
+        'ratings': [series[o] for o in owners],
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from migrations import migrate
+
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    db_path = args[0] if args else '../data/espn_fantasy.db'
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    written = update_ratings(conn, rebuild='--rebuild' in sys.argv)
+    print(f"✓ Wrote {written} manager-week ratings")
+    conn.close()
@@ -0,0 +1,286 @@
+"""
+Alternate scoring rulesets ("what if we'd been full PPR?")
+Rescores nfl_weekly_stats and every started matchup_rosters slot with set-based SQL
+and caches the results per ruleset hash so repeat queries are instant
+"""
+import hashlib
+import json
+import math
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+# nfl_weekly_stats columns a ruleset may assign points to
+SCORABLE_STATS = (
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions',
+    'sacks', 'sack_fumbles_lost', 'passing_first_downs', 'passing_2pt_conversions',
+    'carries', 'rushing_yards', 'rushing_tds', 'rushing_fumbles_lost',
+    'rushing_first_downs', 'rushing_2pt_conversions',
+    'receptions', 'targets', 'receiving_yards', 'receiving_tds', 'receiving_fumbles_lost',
+    'receiving_first_downs', 'receiving_2pt_conversions',
+    'special_teams_tds',
+    'fg_made_0_19', 'fg_made_20_29', 'fg_made_30_39', 'fg_made_40_49',
+    'fg_made_50_59', 'fg_made_60_', 'fg_missed', 'pat_made', 'pat_missed',
+)
+
+_STANDARD = {
+    'passing_yards': 0.04,
+    'passing_tds': 4,
+    'interceptions': -2,
+    'passing_2pt_conversions': 2,
+    'rushing_yards': 0.1,
+    'rushing_tds': 6,
+    'rushing_2pt_conversions': 2,
+    'receiving_yards': 0.1,
+    'receiving_tds': 6,
+    'receiving_2pt_conversions': 2,
+    'sack_fumbles_lost': -2,
+    'rushing_fumbles_lost': -2,
+    'receiving_fumbles_lost': -2,
+    'special_teams_tds': 6,
+    # Kicking (matches calculate_kicker_fantasy_points in backend/main.py)
+    'fg_made_0_19': 3,
+    'fg_made_20_29': 3,
+    'fg_made_30_39': 3,
+    'fg_made_40_49': 4,
+    'fg_made_50_59': 5,
+    'fg_made_60_': 5,
+    'pat_made': 1,
+}
+
+SCORING_PRESETS = {
+    'standard': dict(_STANDARD),
+    'half_ppr': {**_STANDARD, 'receptions': 0.5},
+    'ppr': {**_STANDARD, 'receptions': 1},
+    'ppr_6pt_pass_td': {**_STANDARD, 'receptions': 1, 'passing_tds': 6},
+}
+
+
+def normalize_ruleset(rules: Dict[str, float]) -> Dict[str, float]:
+    """
+    Validate a ruleset and put it in canonical form
+
+    Args:
+        rules: Mapping of nfl_weekly_stats column -> points per unit
+
+    Returns:
+        Sorted dict of non-zero float weights
+
+    Raises:
+        ValueError: If a stat is not scorable or a weight is not a finite number
+    """
+    unknown = sorted(set(rules) - set(SCORABLE_STATS))
+    if unknown:
+        raise ValueError(f"Unknown scoring stats: {', '.join(unknown)}")
+
+    normalized = {}
+    for stat in sorted(rules):
+        try:
+            weight = float(rules[stat])
+        except (TypeError, ValueError):
+            raise ValueError(f"Weight for {stat} must be a number")
+        if not math.isfinite(weight):
+            raise ValueError(f"Weight for {stat} must be a finite number")
+        if weight != 0:
+            normalized[stat] = weight
+
+    if not normalized:
+        raise ValueError("Ruleset must score at least one stat")
+    return normalized
+
+
+def ruleset_hash(rules: Dict[str, float]) -> str:
+    """Stable short hash of a normalized ruleset (cache key)"""
+    canonical = json.dumps(normalize_ruleset(rules), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def _points_expression(rules: Dict[str, float], existing_columns) -> Tuple[str, List[float]]:
+    """
+    Build the SQL SUM-of-products expression for a ruleset
+
+    Returns:
+        (expression, weights bound to its placeholders in order)
+    """
+    terms, weights = [], []
+    for stat, weight in rules.items():
+        # Older databases may not have the kicker columns yet
+        if stat in existing_columns:
+            terms.append(f"COALESCE(n.{stat}, 0) * ?")
+            weights.append(weight)
+    return (" + ".join(terms) if terms else "0"), weights
+
+
+def rescore(conn: sqlite3.Connection, rules: Dict[str, float]) -> Dict:
+    """
+    Rescore all history under a ruleset, reusing anything already cached
+
+    Only (season, week) slices that have no cached rows for this ruleset are
+    computed, so a new week of data costs one week of work.
+
+    Args:
+        conn: Open database connection
+        rules: Scoring ruleset (see SCORABLE_STATS)
+
+    Returns:
+        Dict with the ruleset hash and how many rows were computed
+    """
+    rules = normalize_ruleset(rules)
+    key = ruleset_hash(rules)
+
+    conn.execute("""
+        INSERT OR IGNORE INTO scoring_rulesets (ruleset_hash, rules, created_at)
+        VALUES (?, ?, ?)
+    """, (key, json.dumps(rules, sort_keys=True), datetime.now().isoformat()))
+
+    existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(nfl_weekly_stats)")}
+    points_sql, weights = _points_expression(rules, existing_columns)
+
+    # Player-weeks: one INSERT ... SELECT over every uncached week
+    cursor = conn.execute(f"""
+        INSERT OR REPLACE INTO rescored_player_weeks
+            (ruleset_hash, player_id, season, week, season_type, points)
+        SELECT ?, n.player_id, n.season, n.week, n.season_type, ROUND({points_sql}, 2)
+        FROM nfl_weekly_stats n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM rescored_player_weeks r
+            WHERE r.ruleset_hash = ? AND r.season = n.season AND r.week = n.week
+        )
+    """, (key, *weights, key))
+    player_weeks = cursor.rowcount
+
+    # Lineups: starters resolved through the ID crosswalk (Sleeper rosters) or
+    # the best name mapping; anything we can't rescore (D/ST, unmapped players)
+    # keeps its original league points. Weeks without NFL stats yet are left uncached so they get
+    # picked up later
+    cursor = conn.execute("""
+        INSERT OR REPLACE INTO rescored_lineups
+            (ruleset_hash, league_id, season_year, week, team_name, points, starters, rescored_starters)
+        WITH best_mapping AS (
+            SELECT fantasy_player_name, nfl_player_id
+            FROM (
+                SELECT fantasy_player_name, nfl_player_id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY fantasy_player_name ORDER BY confidence_score DESC
+                       ) AS rn
+                FROM nfl_player_mapping
+            )
+            WHERE rn = 1
+        )
+        SELECT ?, r.league_id, r.season_year, r.week, r.team_name,
+               ROUND(SUM(COALESCE(p.points, r.points, 0)), 2),
+               COUNT(*),
+               COUNT(p.points)
+        FROM matchup_rosters r
+        LEFT JOIN best_mapping bm ON bm.fantasy_player_name = r.player_name
+        LEFT JOIN player_id_crosswalk cw ON cw.sleeper_id = r.player_id
+        LEFT JOIN rescored_player_weeks p
+            ON p.ruleset_hash = ? AND p.player_id = COALESCE(cw.gsis_id, bm.nfl_player_id)
+           AND p.season = r.season_year AND p.week = r.week AND p.season_type = 'REG'
+        WHERE r.started = 1
+          AND EXISTS (
+              SELECT 1 FROM rescored_player_weeks pw
+              WHERE pw.ruleset_hash = ? AND pw.season = r.season_year AND pw.week = r.week
+          )
+          AND NOT EXISTS (
+              SELECT 1 FROM rescored_lineups l
+              WHERE l.ruleset_hash = ? AND l.league_id = r.league_id
+                AND l.season_year = r.season_year AND l.week = r.week
+          )
+        GROUP BY r.league_id, r.season_year, r.week, r.team_name
+    """, (key, key, key, key))
+    lineups = cursor.rowcount
+
+    conn.commit()
+
+    return {
+        'ruleset_hash': key,
+        'rules': rules,
+        'player_weeks_rescored': player_weeks,
+        'lineups_rescored': lineups,
+    }
+
+
+def invalidate_rescored_weeks(conn: sqlite3.Connection, weeks: List[Tuple[int, int]]):
+    """
+    Drop cached lineups for reloaded (season_year, week) slices under every
+    ruleset and league; rescore() recomputes them on the next request
+    """
+    conn.executemany("DELETE FROM rescored_lineups WHERE season_year = ? AND week = ?", weeks)
+    conn.commit()
+
+
+def what_if_standings(conn: sqlite3.Connection, key: str, year: Optional[int] = None) -> List[Dict]:
+    """
+    Regular-season standings under a cached ruleset, next to the real ones
+
+    Args:
+        conn: Open database connection (row_factory = sqlite3.Row)
+        key: Ruleset hash returned by rescore()
+        year: Optional season filter
+
+    Returns:
+        List of team-season dicts (with their league_id) sorted by season, then what-if wins
+    """
+    cursor = conn.execute("""
+        WITH games AS (
+            SELECT league_id, season_year, week, home_team AS team, away_team AS opponent,
+                   home_score AS score, away_score AS opponent_score
+            FROM matchups
+            WHERE COALESCE(bracket_type, '') = ''
+            UNION ALL
+            SELECT league_id, season_year, week, away_team, home_team, away_score, home_score
+            FROM matchups
+            WHERE COALESCE(bracket_type, '') = ''
+        ),
+        rescored AS (
+            SELECT g.league_id, g.season_year, g.team,
+                   g.score, g.opponent_score,
+                   COALESCE(l.points, g.score) AS new_score,
+                   COALESCE(lo.points, g.opponent_score) AS new_opponent_score
+            FROM games g
+            LEFT JOIN rescored_lineups l
+                ON l.ruleset_hash = ? AND l.league_id = g.league_id AND l.season_year = g.season_year
+               AND l.week = g.week AND l.team_name = g.team
+            LEFT JOIN rescored_lineups lo
+                ON lo.ruleset_hash = ? AND lo.league_id = g.league_id AND lo.season_year = g.season_year
+               AND lo.week = g.week AND lo.team_name = g.opponent
+            WHERE ? IS NULL OR g.season_year = ?
+        )
+        SELECT r.league_id, r.season_year, r.team AS team_name, t.owner,
+               SUM(r.score > r.opponent_score) AS actual_wins,
+               SUM(r.score < r.opponent_score) AS actual_losses,
+               ROUND(SUM(r.score), 2) AS actual_points_for,
+               SUM(r.new_score > r.new_opponent_score) AS wins,
+               SUM(r.new_score < r.new_opponent_score) AS losses,
+               ROUND(SUM(r.new_score), 2) AS points_for,
+               ROUND(SUM(r.new_opponent_score), 2) AS points_against
+        FROM rescored r
+        LEFT JOIN teams t
+            ON t.league_id = r.league_id AND t.team_name = r.team AND t.season_year = r.season_year
+        GROUP BY r.league_id, r.season_year, r.team
+        ORDER BY r.season_year DESC, wins DESC, points_for DESC
+    """, (key, key, year, year))
+
+    standings = [dict(row) for row in cursor.fetchall()]
+    for team in standings:
+        team['win_delta'] = team['wins'] - team['actual_wins']
+        team['points_delta'] = round(team['points_for'] - team['actual_points_for'], 2)
+    return standings
+
+
+if __name__ == "__main__":
+    import sys
+    from migrations import migrate
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else '../data/espn_fantasy.db'
+    preset = sys.argv[2] if len(sys.argv) > 2 else 'ppr'
+
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    conn.row_factory = sqlite3.Row
+    result = rescore(conn, SCORING_PRESETS[preset])
+    print(f"✓ Ruleset {preset} ({result['ruleset_hash']}): "
+          f"{result['player_weeks_rescored']} player-weeks, {result['lineups_rescored']} lineups rescored")
+    conn.close()